@@ -1,21 +1,26 @@
+import socket
 import unittest
-from asyncio import gather
+from asyncio import gather, sleep
 
 from pulsar import (send, new_event_loop, get_application,
                     run_in_loop, get_event_loop)
 from pulsar.apps.test import dont_run_with_thread
+from pulsar.utils.metrics import exposition
 
 from examples.echo.manage import server, Echo, EchoServerProtocol
 
 
 class TestEchoServerThread(unittest.TestCase):
     concurrency = 'thread'
+    reuse_port = False
+    cork = False
     server_cfg = None
 
     @classmethod
     async def setUpClass(cls):
         s = server(name=cls.__name__.lower(), bind='127.0.0.1:0',
-                   backlog=1024, concurrency=cls.concurrency)
+                   backlog=1024, concurrency=cls.concurrency,
+                   reuse_port=cls.reuse_port, cork=cls.cork)
         cls.server_cfg = await send('arbiter', 'run', s)
         cls.client = Echo(cls.server_cfg.addresses[0])
 
@@ -43,6 +48,24 @@ class TestEchoServerThread(unittest.TestCase):
         result = await self.client(b'ciao luca')
         self.assertEqual(result, b'ciao luca')
 
+    async def test_metrics(self):
+        self.assertEqual(await self.client(b'ciao luca'), b'ciao luca')
+        # workers send their metrics with the periodic notify
+        loop = get_event_loop()
+        start = loop.time()
+        name = 'server="%s"' % self.server_cfg.name
+        lines = []
+        while loop.time() - start < 20:
+            text = exposition(await send('arbiter', 'metrics'))
+            lines = [line for line in text.split('\n') if name in line]
+            if lines:
+                break
+            await sleep(0.5)
+        metrics = set(line.split('{')[0] for line in lines)
+        self.assertEqual(metrics, {'pulsar_server_connections',
+                                   'pulsar_server_connections_total',
+                                   'pulsar_server_requests_total'})
+
     async def test_large(self):
         '''Echo a 3MB message'''
         msg = b''.join((b'a' for x in range(2**13)))
@@ -175,3 +198,29 @@ class TestEchoServerProcess(TestEchoServerThread):
         self.assertEqual(echo.sessions, 1)
         # self.assertEqual(echo(b'ciao!'), b'ciao!')
         # self.assertEqual(echo.sessions, 2)
+
+
+def monitor_servers(arbiter, name):
+    return list(arbiter.get_actor(name).servers)
+
+
+@dont_run_with_thread
+@unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'),
+                     'Requires SO_REUSEPORT')
+class TestEchoServerReusePort(TestEchoServerProcess):
+    reuse_port = True
+
+    async def test_monitor_servers(self):
+        # the monitor stops serving once a worker has notified its server
+        loop = get_event_loop()
+        start = loop.time()
+        servers = True
+        while servers and loop.time() - start < 20:
+            await sleep(0.5)
+            servers = await send('arbiter', 'run', monitor_servers,
+                                 self.server_cfg.name)
+        self.assertEqual(servers, [])
+
+
+class TestEchoServerCork(TestEchoServerThread):
+    cork = True
@@ -8,7 +8,7 @@ from pulsar.apps.test import dont_run_with_thread
 from examples.echoudp.manage import server, Echo, EchoUdpServerProtocol
 
 
-@unittest.skipIf(get_actor().cfg.event_loop == 'uv',
+@unittest.skipIf(get_actor().cfg.event_loop == 'uvloop',
                  "uvloop does not work with udp servers")
 class TestEchoUdpServerThread(unittest.TestCase):
     concurrency = 'thread'
@@ -53,7 +53,7 @@ class TestEchoUdpServerThread(unittest.TestCase):
 
 
 @dont_run_with_thread
-@unittest.skipIf(get_actor().cfg.event_loop == 'uv',
+@unittest.skipIf(get_actor().cfg.event_loop == 'uvloop',
                  "uvloop does not work with udp servers")
 class TestEchoUdpServerProcess(TestEchoUdpServerThread):
     concurrency = 'process'
@@ -39,7 +39,7 @@ class RedisStore(RemoteStore):
     supported_queries = frozenset(('filter', 'exclude'))
 
     def _init(self, namespace=None, parser_class=None, pool_size=50,
-              decode_responses=False, **kwargs):
+              decode_responses=False, pool_options=None, **kwargs):
         self._decode_responses = decode_responses
         if not parser_class:
             actor = get_actor()
@@ -48,7 +48,8 @@ class RedisStore(RemoteStore):
         self._parser_class = parser_class
         if namespace:
             self._urlparams['namespace'] = namespace
-        self._pool = Pool(self.connect, pool_size=pool_size, loop=self._loop)
+        self._pool = Pool(self.connect, pool_size=pool_size, loop=self._loop,
+                          **(pool_options or {}))
         if self._database is None:
             self._database = 0
         self._database = int(self._database)
@@ -198,7 +198,7 @@ class PulsarStoreClient(pulsar.Protocol, ClientMixin):
         if self.transaction is not None:
             self.transaction.append(response)
         elif not self._transport._closing:
-            self._transport.write(response)
+            self.write(response)
 
 
 class Blocked:
@@ -746,6 +746,7 @@ class HttpClient(AbstractClient):
     It handles pool of asynchronous connections.
 
     :param pool_size: set the :attr:`pool_size` attribute.
+    :param pool_options: set the :attr:`pool_options` attribute.
     :param store_cookies: set the :attr:`store_cookies` attribute
 
     .. attribute:: headers
@@ -777,6 +778,12 @@ class HttpClient(AbstractClient):
 
         The size of a pool of connection for a given host.
 
+    .. attribute:: pool_options
+
+        Dictionary of additional parameters for the :attr:`connection_pool`
+        factory, such as ``idle_timeout``, ``max_lifetime`` and
+        ``min_size`` of a :class:`.Pool`.
+
     .. attribute:: connection_pools
 
         Dictionary of connection pools for different hosts
@@ -826,12 +833,14 @@ class HttpClient(AbstractClient):
                  websocket_handler=None, parser=None, trust_env=True,
                  loop=None, client_version=None, timeout=None, stream=False,
                  pool_size=10, frame_parser=None, logger=None,
-                 close_connections=False, keep_alive=None):
+                 close_connections=False, keep_alive=None,
+                 pool_options=None):
         super().__init__(loop)
         self._logger = logger or LOGGER
         self.client_version = client_version or self.client_version
         self.connection_pools = {}
         self.pool_size = pool_size
+        self.pool_options = dict(pool_options or ())
         self.trust_env = trust_env
         self.timeout = timeout
         self.store_cookies = store_cookies
@@ -990,7 +999,7 @@ class HttpClient(AbstractClient):
                                 (host, port),
                                 ssl=request.ssl)
             pool = self.connection_pool(connector, pool_size=self.pool_size,
-                                        loop=self._loop)
+                                        loop=self._loop, **self.pool_options)
             self.connection_pools[request.key] = pool
         try:
             conn = await pool.connect()
@@ -70,6 +70,16 @@ last read from the remote client, one can use the
 
 will close client connections which have been idle for 10 seconds.
 
+cork
+---------------
+With the :ref:`cork <setting-cork>` setting::
+
+    python script.py --cork
+
+the writes of a server :class:`.Connection` during one iteration of the
+event loop are sent to the transport in one call, rather than one call
+per write.
+
 .. _socket-server-ssl:
 
 TLS/SSL support
@@ -92,6 +102,15 @@ and then spawn several process-based actors which listen on the
 same shared socket.
 This is how pre-forking servers operate.
 
+With the :ref:`reuse-port <setting-reuse_port>` setting::
+
+    python script.py --reuse-port
+
+each worker binds its own ``SO_REUSEPORT`` socket to the same address and
+the kernel distributes new connections evenly across workers, avoiding
+the thundering herd of workers woken up by every connection on a shared
+socket.
+
 When running a :class:`SocketServer` in threading mode::
 
     python script.py --concurrency thread
@@ -123,7 +142,7 @@ except ImportError:     # pragma    nocover
 
 import pulsar
 from pulsar import TcpServer, DatagramServer, Connection, ImproperlyConfigured
-from pulsar import as_coroutine
+from pulsar import as_coroutine, ensure_future
 from pulsar.utils.internet import parse_address
 from pulsar.utils.config import pass_through
 
@@ -176,6 +195,41 @@ class Backlog(SocketSetting):
         """
 
 
+class ReusePort(SocketSetting):
+    name = "reuse_port"
+    flags = ["--reuse-port"]
+    validator = pulsar.validate_bool
+    action = "store_true"
+    default = False
+    desc = """\
+        Each worker listens on its own ``SO_REUSEPORT`` socket.
+
+        By default the monitor binds one socket shared by all workers,
+        which compete to accept from the same queue. With this option the
+        monitor serves the address only until the first worker is ready
+        and the kernel distributes new connections across the sockets of
+        the workers. Connections queued on a worker socket are reset when
+        that worker stops.
+        Ignored for unix sockets and on platforms without ``SO_REUSEPORT``.
+        """
+
+
+class Cork(SocketSetting):
+    name = "cork"
+    flags = ["--cork"]
+    validator = pulsar.validate_bool
+    action = "store_true"
+    default = False
+    desc = """\
+        Gather the writes of a connection and send them together.
+
+        Data written by a connection while it handles a read, or during
+        one iteration of the event loop, is sent with one call to the
+        transport. Useful for pipelined protocols which write many small
+        replies.
+        """
+
+
 class KeyFile(SocketSetting):
     name = "key_file"
     flags = ["--key-file"]
@@ -240,8 +294,9 @@ class SocketServer(pulsar.Application):
                 raise ImproperlyConfigured('key_file "%s" does not exist' %
                                            cfg.key_file)
         # First create the sockets
+        reuse_port = self.reuse_port()
         try:
-            server = await self.create_server(monitor, address)
+            server = await self.create_server(monitor, address, reuse_port)
         except socket.error as e:
             raise ImproperlyConfigured(e) from None
         else:
@@ -249,7 +304,30 @@ class SocketServer(pulsar.Application):
             self.cfg.addresses = server.addresses
 
     def actorparams(self, monitor, params):
-        params['sockets'] = monitor.servers[self.name].sockets
+        server = monitor.servers.get(self.name)
+        params['sockets'] = server.sockets if server else None
+
+    def monitor_task(self, monitor):
+        '''With :meth:`reuse_port`, stop serving from the monitor once a
+        worker serves the address with its own socket.
+        '''
+        server = monitor.servers.get(self.name)
+        if server and self.reuse_port():
+            key = '%sserver' % self.name
+            for worker in monitor.managed_actors.values():
+                if worker.info and worker.info.get(key):
+                    monitor.servers.pop(self.name)
+                    ensure_future(server.close(), loop=monitor._loop)
+                    break
+
+    def reuse_port(self):
+        '''``True`` when workers listen on their own ``SO_REUSEPORT``
+        socket rather than on the socket bound by the monitor.
+        '''
+        cfg = self.cfg
+        return bool(cfg.reuse_port and cfg.workers and
+                    hasattr(socket, 'SO_REUSEPORT') and
+                    isinstance(parse_address(cfg.address), tuple))
 
     async def worker_start(self, worker, exc=None):
         '''Start the worker by invoking the :meth:`create_server` method.
@@ -282,13 +360,27 @@ class SocketServer(pulsar.Application):
         return TcpServer(*args, **kw)
 
     #   INTERNALS
-    async def create_server(self, worker, address=None):
+    async def create_server(self, worker, address=None, reuse_port=False):
         '''Create the Server which will listen for requests.
 
         :return: a :class:`.TcpServer`.
         '''
-        sockets = worker.sockets if not address else None
         cfg = self.cfg
+        sockets = None
+        if not address:
+            if self.reuse_port():
+                # the kernel would queue connections on the listening
+                # sockets a worker process inherited from the monitor,
+                # close them. Workers on threads share the monitor sockets
+                if worker.is_process():
+                    for sock in worker.sockets or ():
+                        sock.close()
+                # same host as bind, with the port obtained by the monitor
+                reuse_port = True
+                address = (parse_address(cfg.address)[0],
+                           cfg.addresses[0][1])
+            else:
+                sockets = worker.sockets
         max_requests = cfg.max_requests
         if max_requests:
             max_requests = int(lognormvariate(log(max_requests), 0.2))
@@ -300,7 +392,11 @@ class SocketServer(pulsar.Application):
             max_requests=max_requests,
             keep_alive=cfg.keep_alive,
             name=self.name,
-            logger=self.logger
+            logger=self.logger,
+            reuse_port=reuse_port,
+            cork=cfg.cork,
+            drain_timeout=cfg.drain_timeout,
+            tracer=worker.tracer
         )
         for event in ('connection_made', 'pre_request', 'post_request',
                       'connection_lost'):
@@ -70,8 +70,8 @@ from .wrappers import EnvironMixin, WsgiResponse, WsgiRequest, cached_property
 from .server import HttpServerResponse, test_wsgi_environ, AbortWsgi
 from .route import route, Route
 from .handlers import WsgiHandler, LazyWsgi
-from .routers import (Router, MediaRouter, MediaMixin, RouterParam,
-                      file_response)
+from .routers import (Router, MediaRouter, MediaMixin, MetricsRouter,
+                      RouterParam, StaticCache, file_response)
 from .auth import HttpAuthenticate, parse_authorization_header
 from .formdata import parse_form_data
 from .utils import (handle_wsgi_error, render_error_debug, wsgi_request,
@@ -121,6 +121,8 @@ __all__ = [
     'Router',
     'MediaRouter',
     'MediaMixin',
+    'StaticCache',
+    'MetricsRouter',
     'RouterParam',
     'file_response',
     #
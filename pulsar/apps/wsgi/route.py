@@ -255,6 +255,11 @@ class Route:
         a set of  variable names for this route. If the route has no
         variables, the set is empty.
 
+    .. attribute:: head
+
+        The first url bit when it is a plain string, otherwise ``None``.
+        Paths matched by this route always start with it.
+
     .. _werkzeug: https://github.com/mitsuhiko/werkzeug
     '''
     def __init__(self, rule, defaults=None, is_re=False):
@@ -266,6 +271,7 @@ class Route:
         breadcrumbs = []
         self._converters = {}
         regex_parts = []
+        literals = []
         if self.rule:
             for bit in self.rule.split('/'):
                 if not bit:
@@ -285,11 +291,13 @@ class Route:
                     regex_parts.append('(?P<%s>%s)' % (variable,
                                                        convobj.regex))
                     breadcrumbs.append((True, variable))
+                    literals.append(False)
                     self._converters[variable] = convobj
                     self.variables.add(str(variable))
                 else:
-                    variable = bit if is_re else re.escape(bit)
-                    regex_parts.append(variable)
+                    variable = re.escape(bit)
+                    literals.append(variable == bit or not is_re)
+                    regex_parts.append(bit if is_re else variable)
                     breadcrumbs.append((False, bit))
 
         self.breadcrumbs = tuple(breadcrumbs)
@@ -297,6 +305,9 @@ class Route:
         if self._regex_string and not self.is_leaf:
             self._regex_string += '/'
         self._regex = re.compile(self.regex, re.UNICODE)
+        self.head = breadcrumbs[0][1] if literals and literals[0] else None
+        # rules without variables are matched without the regex
+        self._literal = all(literals)
 
     @property
     def level(self):
@@ -383,6 +394,14 @@ class Route:
         a dictionary of matched variables with values. If there is more
         to be match in the path, the remaining string is placed in the
         ``__remaining__`` key of the dictionary.'''
+        if self._literal:
+            rule = self.rule
+            if self.is_leaf:
+                return {} if path == rule else None
+            elif path.startswith(rule):
+                remaining = path[len(rule):]
+                return {'__remaining__': remaining} if remaining else {}
+            return
         match = self._regex.search(path)
         if match is not None:
             remaining = path[match.end():]
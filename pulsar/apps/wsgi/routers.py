@@ -63,6 +63,21 @@ files such ass ``css``, ``javascript``, images and so forth.
    :members:
    :member-order: bysource
 
+.. autoclass:: StaticCache
+   :members:
+   :member-order: bysource
+
+
+Metrics Router
+=====================
+
+The :class:`MetricsRouter` exposes the :class:`.Metrics` of all actors
+in the prometheus text format.
+
+.. autoclass:: MetricsRouter
+   :members:
+   :member-order: bysource
+
 
 File Response
 =====================
@@ -86,14 +101,22 @@ RouterParam
 import os
 import re
 import stat
+import time
+import zlib
 import mimetypes
 from email.utils import parsedate_tz, mktime_tz
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 from pulsar.utils.httpurl import http_date, CacheControl
 from pulsar.utils.structures import OrderedDict
 from pulsar.utils.slugify import slugify
 from pulsar.utils.security import digest
-from pulsar import Http404, MethodNotAllowed
+from pulsar.utils.metrics import exposition, CONTENT_TYPE
+from pulsar import Http404, MethodNotAllowed, send
 
 from .route import Route
 from .utils import wsgi_request
@@ -131,6 +154,41 @@ class SkipRoute(Exception):
     pass
 
 
+class RouterTree:
+    '''The compiled children of a :class:`Router`.
+
+    Children with a route starting with a plain string are indexed by it,
+    so that only children which can match the first bit of a path are
+    tried, in the order they were added.
+    '''
+    __slots__ = ('route', 'static', 'dynamic', 'cache')
+    cache_size = 1000
+
+    def __init__(self, router):
+        self.route = router.route
+        self.static = {}
+        self.cache = {}
+        dynamic = []
+        for child in router.routes:
+            head = child.route.head
+            if head is None:
+                dynamic.append(child)
+                for children in self.static.values():
+                    children.append(child)
+            else:
+                self.static.setdefault(head, list(dynamic)).append(child)
+        self.dynamic = tuple(dynamic)
+        for head, children in self.static.items():
+            self.static[head] = tuple(children)
+
+    def children(self, path):
+        return self.static.get(path.partition('/')[0], self.dynamic)
+
+    def cache_handler(self, path, handler):
+        if len(self.cache) < self.cache_size:
+            self.cache[path] = handler
+
+
 class RouterParam:
     '''A :class:`RouterParam` is a way to flag a :class:`Router` parameter
     so that children can inherit the value if they don't define their own.
@@ -238,6 +296,7 @@ class Router(metaclass=RouterType):
     '''
     _creation_count = 0
     _parent = None
+    _tree = None
     name = None
     SkipRoute = SkipRoute
 
@@ -377,22 +436,19 @@ class Router(metaclass=RouterType):
     def resolve(self, path, urlargs=None):
         '''Resolve a path and return a ``(handler, urlargs)`` tuple or
         ``None`` if the path could not be resolved.
+
+        Handlers of paths resolved without url arguments are cached.
         '''
-        match = self.route.match(path)
-        if match is None:
-            if not self.route.is_leaf:  # no match
-                return
-        elif '__remaining__' in match:
-            path = match.pop('__remaining__')
-            urlargs = update_args(urlargs, match)
-        else:
-            return self, update_args(urlargs, match)
-        #
-        for handler in self.routes:
-            view_args = handler.resolve(path, urlargs)
-            if view_args is None:
-                continue
-            return view_args
+        tree = self._tree or self._compile()
+        if urlargs is not None:
+            return self._resolve(tree, path, urlargs)
+        handler = tree.cache.get(path)
+        if handler is not None:
+            return handler, {}
+        view_args = self._resolve(tree, path, urlargs)
+        if view_args and not view_args[1]:
+            tree.cache_handler(path, view_args[0])
+        return view_args
 
     def response(self, environ, args):
         '''Once the :meth:`resolve` method has matched the correct
@@ -433,6 +489,8 @@ class Router(metaclass=RouterType):
             self.routes.append(router)
         else:
             self.routes.insert(index, router)
+        router._reset()
+        self._invalidate()
         return router
 
     def remove_child(self, router):
@@ -440,6 +498,8 @@ class Router(metaclass=RouterType):
         if router in self.routes:
             self.routes.remove(router)
             router._parent = None
+            router._reset()
+            self._invalidate()
 
     def get_route(self, name):
         '''Get a child :class:`Router` by its :attr:`name`.
@@ -498,6 +558,40 @@ class Router(metaclass=RouterType):
         return router
 
     # INTERNALS
+    def _resolve(self, tree, path, urlargs):
+        match = tree.route.match(path)
+        if match is None:
+            if not tree.route.is_leaf:  # no match
+                return
+        elif '__remaining__' in match:
+            path = match.pop('__remaining__')
+            urlargs = update_args(urlargs, match)
+        else:
+            return self, update_args(urlargs, match)
+        #
+        for handler in tree.children(path):
+            view_args = handler.resolve(path, urlargs)
+            if view_args is None:
+                continue
+            return view_args
+
+    def _compile(self):
+        self._tree = RouterTree(self)
+        return self._tree
+
+    def _invalidate(self):
+        # The tree of parent routers depends on their children
+        router = self
+        while router is not None:
+            router._tree = None
+            router = router._parent
+
+    def _reset(self):
+        # The route of children depends on the parent when it is a leaf
+        self._tree = None
+        for child in self.routes:
+            child._reset()
+
     def _set_params(self, parameters):
         for name, value in parameters.items():
             if name not in self.defaults:
@@ -505,10 +599,166 @@ class Router(metaclass=RouterType):
             setattr(self, name, value)
 
 
+class StaticFile:
+    '''A file held in memory by a :class:`StaticCache`
+    '''
+    __slots__ = ('path', 'stamp', 'size', 'mtime', 'etag', 'content_type',
+                 'encoding', 'content', 'variants', 'checked', 'aliases')
+
+    def __init__(self, path, info, content, checked):
+        self.path = path
+        self.stamp = (info.st_mtime_ns, info.st_size)
+        self.size = info[stat.ST_SIZE]
+        self.mtime = info[stat.ST_MTIME]
+        self.etag = digest('modified: %d - size: %d' % (self.mtime,
+                                                        self.size))
+        self.content_type, self.encoding = mimetypes.guess_type(path)
+        self.content = content
+        self.variants = {}
+        self.checked = checked
+        self.aliases = set()
+
+    @property
+    def memory(self):
+        return len(self.content) + sum(map(len, self.variants.values()))
+
+
+class StaticCache:
+    '''A least recently used cache of small static files.
+
+    Cached files are served from memory together with their stat
+    information, ``ETag`` and content type. The modification time of a
+    file is checked at most once every :attr:`check_interval` seconds,
+    between checks a file is served without filesystem calls.
+
+    A cached file can also be found by the keys :meth:`link` associates
+    with it, for example the url a :class:`MediaRouter` resolved to the
+    file, until the file is removed from the cache.
+
+    :param max_size: maximum number of bytes held by the cache, including
+        the compressed variants.
+    :param max_file_size: files larger than this are not cached.
+    :param check_interval: seconds between checks of the modification
+        time of a cached file.
+    :param compress: when ``True`` gzip (and brotli when the ``brotli``
+        package is installed) variants are precompressed and served to
+        clients accepting them.
+    '''
+    def __init__(self, max_size=2**24, max_file_size=2**18,
+                 check_interval=1, compress=True):
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self.check_interval = check_interval
+        self.compress = compress
+        self.size = 0
+        self._files = OrderedDict()
+        self._aliases = {}
+
+    def __len__(self):
+        return len(self._files)
+
+    def link(self, key, entry):
+        '''Associate ``key`` with the cached :class:`StaticFile` ``entry``
+        '''
+        if self._files.get(entry.path) is entry:
+            self._aliases[key] = entry.path
+            entry.aliases.add(key)
+
+    def lookup(self, key):
+        '''The :class:`StaticFile` associated with ``key`` by :meth:`link`,
+        ``None`` if there is none or it is no longer cached.
+        '''
+        path = self._aliases.get(key)
+        if path is not None:
+            return self.get(path)
+
+    def get(self, path):
+        '''The :class:`StaticFile` at ``path``, ``None`` if ``path`` is not
+        a regular file small enough for this cache.
+        '''
+        now = time.monotonic()
+        entry = self._files.get(path)
+        if entry is not None:
+            if now - entry.checked < self.check_interval:
+                self._files.move_to_end(path)
+                return entry
+            info = _stat(path)
+            if info and entry.stamp == (info.st_mtime_ns, info.st_size):
+                entry.checked = now
+                self._files.move_to_end(path)
+                return entry
+            self.remove(path)
+        else:
+            info = _stat(path)
+        if (info and stat.S_ISREG(info.st_mode) and
+                info.st_size <= self.max_file_size):
+            with open(path, 'rb') as f:
+                content = f.read()
+            entry = StaticFile(path, info, content, now)
+            if self.compress:
+                self._compress(entry)
+            self._add(entry)
+            return entry
+
+    def remove(self, path):
+        '''Remove ``path`` from the cache
+        '''
+        entry = self._files.pop(path, None)
+        if entry is not None:
+            self._unlink(entry)
+
+    def clear(self):
+        self._files.clear()
+        self._aliases.clear()
+        self.size = 0
+
+    def _add(self, entry):
+        size = entry.memory
+        if size > self.max_size:
+            return
+        self._files[entry.path] = entry
+        self.size += size
+        while self.size > self.max_size:
+            _, old = self._files.popitem(last=False)
+            self._unlink(old)
+
+    def _unlink(self, entry):
+        self.size -= entry.memory
+        for key in entry.aliases:
+            self._aliases.pop(key, None)
+        entry.aliases.clear()
+
+    def _compress(self, entry):
+        content = entry.content
+        if brotli is not None:
+            variant = brotli.compress(content)
+            if len(variant) < 0.9*len(content):
+                entry.variants['br'] = variant
+        # gzip format without timestamp
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+        variant = compressor.compress(content) + compressor.flush()
+        if len(variant) < 0.9*len(content):
+            entry.variants['gzip'] = variant
+
+
 class MediaMixin:
     cache_control = CacheControl(maxage=86400)
+    static_cache = None
+
+    def serve_file(self, request, fullpath, status_code=None, key=None):
+        '''Serve the file at ``fullpath``.
 
-    def serve_file(self, request, fullpath, status_code=None):
+        When the file is held by the :attr:`static_cache`, ``key`` is
+        linked to it so that it can be found without resolving the path.
+        '''
+        cache = self.static_cache
+        if cache is not None:
+            entry = cache.get(fullpath)
+            if entry is not None:
+                if key is not None:
+                    cache.link(key, entry)
+                return static_response(request, entry, status_code,
+                                       self.cache_control)
         return file_response(request, fullpath, status_code=status_code,
                              cache_control=self.cache_control)
 
@@ -561,11 +811,16 @@ class MediaRouter(Router, MediaMixin):
     .. attribute:: default_file
 
         The default file to serve when a directory is requested.
+
+    .. attribute:: static_cache
+
+        Optional :class:`StaticCache` serving small files from memory.
     '''
     def __init__(self, rule, path=None, show_indexes=False,
                  default_suffix=None, default_file='index.html',
-                 serve_only=None, **params):
+                 serve_only=None, static_cache=None, **params):
         super().__init__('%s/<path:path>' % rule, **params)
+        self.static_cache = static_cache
         self._serve_only = set(serve_only or ())
         self._default_suffix = default_suffix
         self._default_file = default_file
@@ -586,6 +841,14 @@ class MediaRouter(Router, MediaMixin):
                 raise self.SkipRoute
 
         fullpath = self.filesystem_path(request)
+        key = None
+        if self.static_cache is not None:
+            # a url already resolved to a cached file is served from memory
+            key = (fullpath, request.path.endswith('/'))
+            entry = self.static_cache.lookup(key)
+            if entry is not None:
+                return static_response(request, entry, None,
+                                       self.cache_control)
 
         if not self._serve_only:
 
@@ -611,7 +874,7 @@ class MediaRouter(Router, MediaMixin):
                     raise Http404
         #
         try:
-            return self.serve_file(request, fullpath)
+            return self.serve_file(request, fullpath, key=key)
         except Http404:
             file404 = self.get_full_path('404.html')
             if os.path.isfile(file404):
@@ -620,6 +883,24 @@ class MediaRouter(Router, MediaMixin):
                 raise
 
 
+class MetricsRouter(Router):
+    '''A :class:`Router` serving the :class:`.Metrics` of all actors in
+    the prometheus text exposition format.
+
+    The merged metrics are obtained from the arbiter ``metrics`` command,
+    which answers with the metrics workers sent with their last
+    ``notify``: serving a scrape never waits for other workers.
+
+    :param rule: The url for this router, for example ``/metrics``.
+    '''
+    async def get(self, request):
+        metrics = await send('arbiter', 'metrics')
+        response = request.response
+        response.content_type = CONTENT_TYPE
+        response.content = exposition(metrics).encode('utf-8')
+        return response
+
+
 def modified_since(header, size=0):
     try:
         if header is None:
@@ -650,6 +931,55 @@ def was_modified_since(header=None, mtime=0, size=0):
     return True
 
 
+def byte_range(header, size):
+    '''Parse a ``Range`` header for a resource of ``size`` bytes.
+
+    Return a ``(start, end)`` tuple of inclusive positions, ``None`` if
+    the header is not a single valid byte range and an empty tuple if the
+    range cannot be satisfied.
+    '''
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return
+    first, sep, last = spec.strip().partition('-')
+    if not sep:
+        return
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and end < start:
+                return
+        elif last:
+            length = int(last)
+            if not length:
+                return ()
+            start, end = max(size - length, 0), size - 1
+        else:
+            return
+    except ValueError:
+        return
+    if start >= size:
+        return ()
+    return start, min(end, size - 1)
+
+
+def request_range(request, response, size):
+    '''The byte range requested by a client, see :func:`byte_range`.
+
+    The ``Range`` header is ignored if the ``If-Range`` header does not
+    match the ``Last-Modified`` or ``ETag`` headers of the ``response``.
+    '''
+    header = request.get('HTTP_RANGE')
+    if not header:
+        return
+    if_range = request.get('HTTP_IF_RANGE')
+    if if_range and if_range not in (response.headers.get('Last-Modified'),
+                                     response.headers.get('ETag')):
+        return
+    return byte_range(header, size)
+
+
 def file_response(request, filepath, block=None, status_code=None,
                   content_type=None, encoding=None, cache_control=None):
     """Utility for serving a local file
@@ -668,30 +998,111 @@ def file_response(request, filepath, block=None, status_code=None,
     :param block: Optional block size (default 1MB)
     :param status_code: Optional status code (default 200)
     :return: a :class:`~.WsgiResponse` object
+
+    When no ``status_code`` is given, a single byte range of the
+    ``Range`` header is served with a ``206`` partial content response.
     """
     file_wrapper = request.get('wsgi.file_wrapper')
     if os.path.isfile(filepath):
-        response = request.response
         info = os.stat(filepath)
         size = info[stat.ST_SIZE]
         modified = info[stat.ST_MTIME]
-        header = request.get('HTTP_IF_MODIFIED_SINCE')
-        if not was_modified_since(header, modified, size):
-            response.status_code = 304
-        else:
-            if not content_type:
-                content_type, encoding = mimetypes.guess_type(filepath)
+        if not content_type:
+            content_type, encoding = mimetypes.guess_type(filepath)
+        etag = None
+        if cache_control:
+            etag = digest('modified: %d - size: %d' % (modified, size))
+        response, brange = _file_response(request, size, modified,
+                                          content_type, encoding,
+                                          status_code, cache_control, etag)
+        if brange is not False:
             file = open(filepath, 'rb')
-            response.headers['content-length'] = str(size)
-            response.content = file_wrapper(file, block)
-            response.content_type = content_type
-            response.encoding = encoding
-            if status_code:
-                response.status_code = status_code
+            if brange:
+                start, end = brange
+                size = end - start + 1
+                response.content = file_wrapper(file, block, offset=start,
+                                                count=size)
             else:
-                response.headers["Last-Modified"] = http_date(modified)
-            if cache_control:
-                etag = digest('modified: %d - size: %d' % (modified, size))
-                cache_control(response.headers, etag=etag)
+                response.content = file_wrapper(file, block)
+            response.headers['content-length'] = str(size)
         return response
     raise Http404
+
+
+def static_response(request, entry, status_code=None, cache_control=None):
+    '''Serve a :class:`StaticFile` from memory.
+
+    Like :func:`file_response` but the whole content is served with the
+    best precompressed variant accepted by the client.
+    '''
+    response, brange = _file_response(request, entry.size, entry.mtime,
+                                      entry.content_type, entry.encoding,
+                                      status_code, cache_control, entry.etag)
+    if brange is not False:
+        if brange:
+            start, end = brange
+            response.content = entry.content[start:end+1]
+        else:
+            content = entry.content
+            if entry.variants:
+                response.headers.add_header('Vary', 'Accept-Encoding')
+                encoding = accepted_encoding(request, entry.variants)
+                if encoding:
+                    response.headers['Content-Encoding'] = encoding
+                    content = entry.variants[encoding]
+            response.content = content
+    return response
+
+
+def accepted_encoding(request, encodings):
+    '''The first of ``encodings`` accepted by the client
+    '''
+    header = request.get('HTTP_ACCEPT_ENCODING')
+    if header:
+        accepted = set()
+        for value in header.split(','):
+            value, _, q = value.partition(';')
+            if q.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00'):
+                accepted.add(value.strip())
+        for encoding in encodings:
+            if encoding in accepted:
+                return encoding
+
+
+def _file_response(request, size, modified, content_type, encoding,
+                   status_code, cache_control, etag):
+    # Set the headers of a file response and return it with the byte
+    # range to serve: None for the whole file, False for no content
+    response = request.response
+    header = request.get('HTTP_IF_MODIFIED_SINCE')
+    if not was_modified_since(header, modified, size):
+        response.status_code = 304
+        return response, False
+    response.content_type = content_type
+    response.encoding = encoding
+    if status_code:
+        response.status_code = status_code
+    else:
+        response.headers["Last-Modified"] = http_date(modified)
+    if cache_control:
+        cache_control(response.headers, etag=etag)
+    brange = None
+    if not status_code:
+        response.headers['Accept-Ranges'] = 'bytes'
+        brange = request_range(request, response, size)
+        if brange == ():
+            response.status_code = 416
+            response.headers['Content-Range'] = 'bytes */%d' % size
+            return response, False
+        elif brange:
+            response.status_code = 206
+            response.headers['Content-Range'] = 'bytes %d-%d/%d' % (
+                brange + (size,))
+    return response, brange
+
+
+def _stat(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
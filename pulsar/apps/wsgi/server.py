@@ -17,16 +17,19 @@ import time
 import os
 import socket
 import io
-from asyncio import wait_for, ensure_future, sleep
+from asyncio import wait_for, ensure_future, sleep, TimeoutError
+from asyncio.selector_events import BaseSelectorEventLoop
+from functools import lru_cache
 from wsgiref.handlers import format_date_time
 from urllib.parse import urlparse, unquote
 
 import pulsar
 from pulsar import (reraise, HttpException, ProtocolError, isawaitable,
-                    BadRequest)
+                    BadRequest, create_future)
 from pulsar.utils.pep import native_str
 from pulsar.utils.httpurl import (Headers, has_empty_content, http_parser,
-                                  iri_to_uri, http_chunks, tls_schemes)
+                                  iri_to_uri, http_chunks, tls_schemes,
+                                  DEFAULT_CHARSET)
 
 from pulsar.async.protocols import ProtocolConsumer
 
@@ -38,6 +41,18 @@ from .wrappers import FileWrapper, close_object
 
 MAX_TIME_IN_LOOP = 0.2
 HTTP_1_1 = (1, 1)
+HAS_SENDFILE = hasattr(os, 'sendfile')
+# second and encoded Date header line of the last response
+_date_header = (0, b'')
+# request headers which are not simply copied into the environ
+ENVIRON_HEADERS = HOP_HEADERS.union(('x-forwarded-for',
+                                     'x-forwarded-protocol',
+                                     'x-forwarded-proto',
+                                     'x-forwarded-ssl',
+                                     'host',
+                                     'script_name',
+                                     'content-type',
+                                     'content-length'))
 
 
 class AbortWsgi(Exception):
@@ -81,6 +96,21 @@ def test_wsgi_environ(path=None, method=None, headers=None, extra=None,
                         Headers(), https=https, extra=params)
 
 
+@lru_cache(maxsize=512)
+def environ_key(header):
+    '''The lower case ``header`` name and its ``HTTP_`` environ key
+    '''
+    header = header.lower()
+    return header, 'HTTP_' + header.upper().replace('-', '_')
+
+
+@lru_cache(maxsize=64)
+def server_name(host):
+    '''The fully qualified domain name of the server address ``host``
+    '''
+    return socket.getfqdn(host)
+
+
 def wsgi_environ(stream, parser, request_headers, address, client_address,
                  headers, server_software=None, https=False, extra=None):
     '''Build the WSGI Environment dictionary
@@ -123,28 +153,28 @@ def wsgi_environ(stream, parser, request_headers, address, client_address,
     forward = client_address
     script_name = os.environ.get("SCRIPT_NAME", "")
     for header, value in request_headers:
-        header = header.lower()
-        if header in HOP_HEADERS:
-            headers[header] = value
-        if header == 'x-forwarded-for':
-            forward = value
-        elif header == "x-forwarded-protocol" and value == "ssl":
-            url_scheme = "https"
-        elif header == "x-forwarded-proto" and value in tls_schemes:
-            url_scheme = "https"
-        elif header == "x-forwarded-ssl" and value == "on":
-            url_scheme = "https"
-        elif header == "host" and not host:
-            host = value
-        elif header == "script_name":
-            script_name = value
-        elif header == "content-type":
-            environ['CONTENT_TYPE'] = value
-            continue
-        elif header == "content-length":
-            environ['CONTENT_LENGTH'] = value
-            continue
-        key = 'HTTP_' + header.upper().replace('-', '_')
+        header, key = environ_key(header)
+        if header in ENVIRON_HEADERS:
+            if header in HOP_HEADERS:
+                headers[header] = value
+            if header == 'x-forwarded-for':
+                forward = value
+            elif header == "x-forwarded-protocol" and value == "ssl":
+                url_scheme = "https"
+            elif header == "x-forwarded-proto" and value in tls_schemes:
+                url_scheme = "https"
+            elif header == "x-forwarded-ssl" and value == "on":
+                url_scheme = "https"
+            elif header == "host" and not host:
+                host = value
+            elif header == "script_name":
+                script_name = value
+            elif header == "content-type":
+                environ['CONTENT_TYPE'] = value
+                continue
+            elif header == "content-length":
+                environ['CONTENT_LENGTH'] = value
+                continue
         environ[key] = value
     environ['wsgi.url_scheme'] = url_scheme
     if url_scheme == 'https':
@@ -161,7 +191,7 @@ def wsgi_environ(stream, parser, request_headers, address, client_address,
         remote = forward
     environ['REMOTE_ADDR'] = remote[0]
     environ['REMOTE_PORT'] = str(remote[1])
-    environ['SERVER_NAME'] = socket.getfqdn(address[0])
+    environ['SERVER_NAME'] = server_name(address[0])
     environ['SERVER_PORT'] = address[1]
     path_info = request_uri.path
     if path_info is not None:
@@ -194,6 +224,30 @@ def keep_alive(headers, version, method):
         return False
 
 
+def date_header():
+    '''The encoded ``Date`` header line, formatted once per second
+    '''
+    global _date_header
+    now = int(time.time())
+    if _date_header[0] != now:
+        _date_header = (now, ('Date: %s\r\n' % format_date_time(now)
+                              ).encode(DEFAULT_CHARSET))
+    return _date_header[1]
+
+
+@lru_cache(maxsize=256)
+def response_prefix(version, status, server_software):
+    '''The encoded status line and ``Server`` header line
+    '''
+    return ('HTTP/%s.%s %s\r\nServer: %s\r\n' %
+            (version + (status, server_software))).encode(DEFAULT_CHARSET)
+
+
+def _wakeup(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
 def keep_alive_with_status(status, headers):
     code = int(status.split()[0])
     if code >= 400:
@@ -212,6 +266,7 @@ class HttpServerResponse(ProtocolConsumer):
     _headers_sent = None
     _body_reader = None
     _buffer = None
+    _send_waiter = None
     _logger = LOGGER
     SERVER_SOFTWARE = pulsar.SERVER_SOFTWARE
     ONE_TIME_EVENTS = ProtocolConsumer.ONE_TIME_EVENTS + ('on_headers',)
@@ -244,7 +299,11 @@ class HttpServerResponse(ProtocolConsumer):
         processed = parser.execute(data, len(data))
         if parser.is_headers_complete():
             if not self._body_reader:
-                headers = Headers(parser.get_headers())
+                if self.trace is not None:
+                    self.trace.mark('headers')
+                headers = parser.get_headers()
+                if not isinstance(headers, Headers):
+                    headers = Headers(headers)
                 self._body_reader = HttpBodyReader(headers,
                                                    parser,
                                                    self.transport,
@@ -319,20 +378,7 @@ class HttpServerResponse(ProtocolConsumer):
         .. _pep3333: http://www.python.org/dev/peps/pep-3333/
         .. _2616: http://www.faqs.org/rfcs/rfc2616.html
         '''
-        if exc_info:
-            try:
-                if self._headers_sent:
-                    # if exc_info is provided, and the HTTP headers have
-                    # already been sent, start_response must raise an error,
-                    # and should re-raise using the exc_info tuple
-                    reraise(*exc_info)
-            finally:
-                # Avoid circular reference
-                exc_info = None
-        elif self._status:
-            # Headers already set. Raise error
-            raise HttpException("Response headers already set!")
-        self._status = status
+        self._set_status(status, exc_info)
         if type(response_headers) is not list:
             raise TypeError("Headers must be a list of name/value tuples")
         for header, value in response_headers:
@@ -359,8 +405,7 @@ class HttpServerResponse(ProtocolConsumer):
         write = super().write
         chunks = []
         if not self._headers_sent:
-            tosend = self.get_headers()
-            self._headers_sent = tosend.flat(self.version, self.status)
+            self._headers_sent = self._flat_headers()
             self.fire_event('on_headers')
             chunks.append(self._headers_sent)
         if data:
@@ -375,6 +420,35 @@ class HttpServerResponse(ProtocolConsumer):
 
     ########################################################################
     #    INTERNALS
+    def _set_status(self, status, exc_info):
+        if exc_info:
+            try:
+                if self._headers_sent:
+                    # if exc_info is provided, and the HTTP headers have
+                    # already been sent, start_response must raise an error,
+                    # and should re-raise using the exc_info tuple
+                    reraise(*exc_info)
+            finally:
+                # Avoid circular reference
+                exc_info = None
+        elif self._status:
+            # Headers already set. Raise error
+            raise HttpException("Response headers already set!")
+        self._status = status
+
+    def _flat_headers(self):
+        headers = self.get_headers()
+        if 'Server' in headers or 'Date' in headers:
+            # the application headers are appended to the server ones
+            tosend = Headers([('Server', self.SERVER_SOFTWARE),
+                              ('Date', format_date_time(time.time()))])
+            tosend.update(headers)
+            return tosend.flat(self.version, self.status)
+        return b''.join((response_prefix(self.version, self.status,
+                                         self.SERVER_SOFTWARE),
+                         date_header(),
+                         bytes(headers)))
+
     async def _response(self, environ):
         exc_info = None
         response = None
@@ -387,37 +461,29 @@ class HttpServerResponse(ProtocolConsumer):
                     if (not environ.get('HTTP_HOST') and
                             environ['SERVER_PROTOCOL'] != 'HTTP/1.0'):
                         raise BadRequest
+                    if self.trace is not None:
+                        self.trace.mark('app_start')
                     response = self.wsgi_callable(environ, self.start_response)
                     if isawaitable(response):
                         response = await wait_for(response, alive)
+                    if self.trace is not None:
+                        self.trace.mark('app_end')
                 else:
                     response = handle_wsgi_error(environ, exc_info)
                     if isawaitable(response):
                         response = await wait_for(response, alive)
                 #
                 if exc_info:
-                    self.start_response(response.status,
-                                        response.get_headers(), exc_info)
+                    # internal response, no need to check for hop headers
+                    self._set_status(response.status, exc_info)
+                    self.headers.update(response.get_headers())
                 #
                 # Do the actual writing
-                loop = self._loop
-                start = loop.time()
-                for chunk in response:
-                    if isawaitable(chunk):
-                        chunk = await wait_for(chunk, alive)
-                        start = loop.time()
-                    result = self.write(chunk)
-                    if isawaitable(result):
-                        await wait_for(result, alive)
-                        start = loop.time()
-                    else:
-                        time_in_loop = loop.time() - start
-                        if time_in_loop > MAX_TIME_IN_LOOP:
-                            get_logger(environ).debug(
-                                'Released the event loop after %.3f seconds',
-                                time_in_loop)
-                            await sleep(0.1, loop=self._loop)
-                            start = loop.time()
+                wrapper = self._file_wrapper(response)
+                if wrapper is not None:
+                    await self._sendfile(wrapper, alive)
+                else:
+                    await self._write_response(response, environ, alive)
                 #
                 # make sure we write headers and last chunk if needed
                 self.write(b'', True)
@@ -445,6 +511,121 @@ class HttpServerResponse(ProtocolConsumer):
             finally:
                 close_object(response)
 
+    async def _write_response(self, response, environ, alive):
+        loop = self._loop
+        start = loop.time()
+        for chunk in response:
+            if isawaitable(chunk):
+                chunk = await wait_for(chunk, alive)
+                start = loop.time()
+            result = self.write(chunk)
+            if isawaitable(result):
+                await wait_for(result, alive)
+                start = loop.time()
+            else:
+                time_in_loop = loop.time() - start
+                if time_in_loop > MAX_TIME_IN_LOOP:
+                    get_logger(environ).debug(
+                        'Released the event loop after %.3f seconds',
+                        time_in_loop)
+                    await sleep(0.1, loop=self._loop)
+                    start = loop.time()
+
+    def _file_wrapper(self, response):
+        # The FileWrapper of the response if it can be sent with sendfile
+        if not HAS_SENDFILE:
+            return
+        wrapper = getattr(response, 'content', response)
+        if not isinstance(wrapper, FileWrapper) or self.is_chunked():
+            return
+        transport = self.transport
+        if (transport.get_extra_info('sslcontext') or
+                not transport.get_extra_info('socket')):
+            return
+        loop = self._loop
+        if not (hasattr(loop, 'sendfile') or
+                isinstance(loop, BaseSelectorEventLoop)):
+            return
+        try:
+            wrapper.file.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            return
+        return wrapper
+
+    def connection_lost(self, exc):
+        # wake up a sendfile waiting for the socket to be writable
+        self._stop_writable(exc or ConnectionResetError('connection lost'))
+        return super().connection_lost(exc)
+
+    async def _sendfile(self, wrapper, alive):
+        # Send the file of a FileWrapper directly to the socket, each wait
+        # for the client is bounded by the keep alive timeout
+        connection = self.connection
+        loop = self._loop
+        file = wrapper.file
+        offset = wrapper.offset
+        end = os.fstat(file.fileno()).st_size
+        if wrapper.count is not None:
+            end = min(end, offset + wrapper.count)
+        self.write(b'')
+        try:
+            await wait_for(connection.flush(), alive)
+            if hasattr(loop, 'sendfile'):
+                transport = self.transport
+                while offset < end:
+                    sent = await wait_for(
+                        loop.sendfile(transport, file, offset,
+                                      min(wrapper.block, end - offset)),
+                        alive)
+                    if not sent:
+                        break
+                    offset += sent
+                    connection.fire_event('after_write')
+            else:
+                transport = self.transport
+                sock = transport.get_extra_info('socket').fileno()
+                fileno = file.fileno()
+                while offset < end:
+                    if transport.is_closing():
+                        raise ConnectionResetError('connection lost')
+                    try:
+                        sent = os.sendfile(sock, fileno, offset, end - offset)
+                    except (BlockingIOError, InterruptedError):
+                        try:
+                            await wait_for(self._writable(sock), alive)
+                        finally:
+                            self._stop_writable()
+                        continue
+                    if not sent:
+                        break
+                    offset += sent
+                    connection.fire_event('after_write')
+        except TimeoutError:
+            # the client stopped reading, drop the connection
+            connection.close()
+            raise ConnectionAbortedError('sendfile timed out') from None
+        if offset < end:
+            # the file was truncated, the content length is wrong
+            self.keep_alive = False
+
+    def _writable(self, fd):
+        # Uses the private selector methods, the public ones refuse
+        # file descriptors of transports
+        loop = self._loop
+        waiter = create_future(loop)
+        loop._add_writer(fd, _wakeup, waiter)
+        self._send_waiter = fd, waiter
+        return waiter
+
+    def _stop_writable(self, exc=None):
+        # Remove the writer added by _writable and fail its waiter with exc
+        if self._send_waiter is not None:
+            fd, waiter = self._send_waiter
+            self._send_waiter = None
+            self._loop._remove_writer(fd)
+            if exc is not None and not waiter.done():
+                waiter.set_exception(exc)
+
     def is_chunked(self):
         '''Check if the response uses chunked transfer encoding.
 
@@ -483,7 +664,7 @@ class HttpServerResponse(ProtocolConsumer):
         # return a the WSGI environ dictionary
         transport = self.transport
         https = True if transport.get_extra_info('sslcontext') else False
-        multiprocess = (self.cfg.concurrency == 'process')
+        multiprocess = self.cfg.concurrency in ('process', 'forkserver')
         environ = wsgi_environ(self._body_reader,
                                self.parser,
                                self._body_reader.headers,
@@ -495,10 +676,10 @@ class HttpServerResponse(ProtocolConsumer):
                                extra={'pulsar.connection': self.connection,
                                       'pulsar.cfg': self.cfg,
                                       'wsgi.multiprocess': multiprocess})
+        if self.trace is not None:
+            environ['pulsar.request_id'] = self.trace.id
         self.keep_alive = keep_alive(self.headers, self.parser.get_version(),
                                      environ['REQUEST_METHOD'])
-        self.headers.update([('Server', self.SERVER_SOFTWARE),
-                             ('Date', format_date_time(time.time()))])
         return environ
 
     def _new_request(self, _, exc=None):
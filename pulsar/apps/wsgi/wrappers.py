@@ -694,16 +694,36 @@ class FileWrapper:
     Available directly from the ``wsgi.file_wrapper`` key in the WSGI environ
     dictionary. Alternatively one can use the :func:`~.file_response`
     high level function for serving local files.
+
+    On plain TCP connections, the server sends files with a ``fileno``
+    using :func:`os.sendfile` rather than iterating over the wrapper.
+
+    .. attribute:: offset
+
+        Position of the first byte to send.
+
+    .. attribute:: count
+
+        Number of bytes to send, ``None`` to send up to the end of file.
     """
-    def __init__(self, file, block=None):
+    def __init__(self, file, block=None, offset=0, count=None):
         self.file = file
         self.block = max(block or ONEMB, MAX_BUFFER_SIZE)
+        self.offset = offset
+        self.count = count
 
     def __iter__(self):
-        while True:
-            data = self.file.read(self.block)
+        if self.offset:
+            self.file.seek(self.offset)
+        remaining = self.count
+        while remaining is None or remaining > 0:
+            block = self.block if remaining is None else min(self.block,
+                                                             remaining)
+            data = self.file.read(block)
             if not data:
                 break
+            if remaining is not None:
+                remaining -= len(data)
             future = create_future()
             future.set_result(data)
             yield future
@@ -8,4 +8,5 @@ from .clients import *          # noqa
 from .actor import *            # noqa
 from .concurrency import *      # noqa
 from .lock import LockBase, Lock    # noqa
+from .channel import Channel        # noqa
 from . import commands              # noqa
@@ -11,6 +11,10 @@ if __name__ == '__main__':
     import_main_path(data['main'])
     impl = pickle.loads(data['impl'])
 
+    import asyncio
+    from pulsar.async.access import event_loop_policy
     from pulsar.async.concurrency import run_actor
 
+    asyncio.set_event_loop_policy(event_loop_policy(impl.cfg))
+
     run_actor(impl)
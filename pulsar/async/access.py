@@ -9,8 +9,9 @@ from threading import current_thread
 
 from asyncio import Future
 
-from pulsar.utils.config import Global
+from pulsar.utils.config import Global, validate_string
 from pulsar.utils.system import current_process, platform
+from pulsar.utils.importer import module_attribute
 
 from asyncio import ensure_future
 from inspect import isawaitable
@@ -85,13 +86,19 @@ else:
             EVENT_LOOPS[selector.lower()] = make_loop_factory(selector_class)
 
 
+EVENT_LOOPS['asyncio'] = DefaultLoopClass
+
+
 try:    # add uvloop if available
     import uvloop
-    EVENT_LOOPS['uv'] = uvloop.Loop
+    EVENT_LOOPS['uvloop'] = uvloop.Loop
 except Exception:     # pragma    nocover
     pass
 
 
+EVENT_LOOP_ALIASES = {'uv': 'uvloop'}
+
+
 if os.environ.get('BUILDING-PULSAR-DOCS') == 'yes':     # pragma nocover
     default_loop = (
         'uvloop if available, epoll on linux, '
@@ -103,15 +110,46 @@ else:
     default_loop = None
 
 
+def validate_event_loop(val):
+    val = validate_string(val)
+    return EVENT_LOOP_ALIASES.get(val, val)
+
+
+def event_loop_factory(name):
+    '''The callable creating a new event loop for the
+    :ref:`event loop <setting-event_loop>` ``name``.
+
+    ``name`` is either a key of :data:`EVENT_LOOPS` or the dotted path
+    to a callable returning an event loop. If the loop is not available
+    a warning is logged and the default loop is used instead.
+    '''
+    name = validate_event_loop(name)
+    factory = EVENT_LOOPS.get(name)
+    if factory is None and name and '.' in name:
+        try:
+            factory = module_attribute(name)
+        except Exception as exc:
+            LOGGER.warning('Could not import event loop "%s": %s', name, exc)
+    elif factory is None:
+        LOGGER.warning('Event loop "%s" not available', name)
+    return factory or EVENT_LOOPS[default_loop]
+
+
 if default_loop:
     class EventLoopSetting(Global):
         name = "event_loop"
-        flags = ["--io"]
-        choices = tuple(EVENT_LOOPS)
+        flags = ["--io", "--event-loop"]
+        validator = validate_event_loop
         default = default_loop
         desc = """\
             Specify the event loop used for I/O event polling.
 
+            One of ``asyncio``, ``uvloop``, a selector (``epoll``,
+            ``kqueue``, ``poll``, ``select``) or the dotted path to a
+            callable returning a new event loop. When the event loop is
+            not available, a warning is logged and the default is used.
+            Every actor, including thread actors, runs on this loop.
+
             The default value is the best possible for the system running the
             application.
             """
@@ -191,6 +229,11 @@ def cfg_value(setting, value=None):
     return value
 
 
+def event_loop_policy(cfg):
+    '''The :class:`EventLoopPolicy` for a :class:`.Config`'''
+    return EventLoopPolicy(cfg.event_loop, cfg.thread_workers, cfg.debug)
+
+
 class EventLoopPolicy(asyncio.DefaultEventLoopPolicy):
 
     def __init__(self, name, workers, debug):
@@ -198,6 +241,7 @@ class EventLoopPolicy(asyncio.DefaultEventLoopPolicy):
         self.name = name
         self.workers = workers
         self.debug = debug
+        self.factory = event_loop_factory(name)
 
     @property
     def _local(self):
@@ -211,7 +255,7 @@ class EventLoopPolicy(asyncio.DefaultEventLoopPolicy):
         current_process()._event_loop_policy = v
 
     def _loop_factory(self):
-        loop = EVENT_LOOPS[self.name]()
+        loop = self.factory()
         loop.set_default_executor(ThreadPoolExecutor(self.workers))
         if self.debug:
             loop.set_debug(True)
@@ -6,12 +6,15 @@ from threading import current_thread
 
 from pulsar import HaltServer, CommandError, MonitorStarted, system
 from pulsar.utils.log import WritelnDecorator
+from pulsar.utils.metrics import Metrics
 
 from .events import EventHandler
 from .proxy import ActorProxy, ActorProxyMonitor, actor_identity
-from .mailbox import command_in_context
+from .mailbox import command_in_context, MailboxClient
 from .access import get_actor
 from .cov import Coverage
+from .executors import actor_executor
+from .tracing import Tracer
 from .consts import ACTOR_STATES
 
 
@@ -148,6 +151,18 @@ class Actor(EventHandler, Coverage):
 
         The socket address for this :attr:`Actor.mailbox`.
 
+    .. attribute:: loop_monitor
+
+        The :class:`.LoopMonitor` of this actor when the
+        :ref:`loop monitor <setting-loop_monitor>` is enabled,
+        otherwise ``None``.
+
+    .. attribute:: direct_mailbox
+
+        The :class:`.DirectMailbox` of this actor when the
+        :ref:`direct mailbox <setting-direct_mailbox>` is enabled,
+        otherwise ``None``.
+
     .. attribute:: proxy
 
         Instance of a :class:`.ActorProxy` holding a reference
@@ -167,6 +182,21 @@ class Actor(EventHandler, Coverage):
         Check the :ref:`info command <actor_info_command>` for how to obtain
         information about an actor.
 
+    .. attribute:: metrics
+
+        The :class:`.Metrics` registry of this actor. Metrics are sent to
+        the arbiter with the :meth:`info` dictionary and exposed by the
+        :class:`.MetricsRouter`.
+
+    .. attribute:: executors
+
+        Dictionary of :class:`.ActorExecutor` created by :meth:`executor`.
+
+    .. attribute:: tracer
+
+        The :class:`.Tracer` of the requests served by this actor, when
+        :ref:`tracing <setting-trace_requests>` is enabled.
+
     .. attribute:: info_state
 
         Current state description string. One of ``initial``, ``running``,
@@ -186,14 +216,21 @@ class Actor(EventHandler, Coverage):
     MANY_TIMES_EVENTS = ('on_info', 'on_params', 'periodic_task')
     exit_code = None
     mailbox = None
+    direct_mailbox = None
+    loop_monitor = None
+    tracer = None
     monitor = None
     next_periodic_task = None
+    # number of actors removed, it invalidates cached actor proxies
+    removed_actors = 0
 
     def __init__(self, impl):
         self.state = ACTOR_STATES.INITIAL
         self.__impl = impl
         self.servers = {}
         self.extra = {}
+        self.metrics = Metrics()
+        self.executors = {}
         self.stream = get_stream(self.cfg)
         self.tid = current_thread().ident
         self.pid = os.getpid()
@@ -206,6 +243,8 @@ class Actor(EventHandler, Coverage):
             setattr(self, name, value)
         del impl.params
         super().__init__(impl.setup_event_loop(self))
+        if self.cfg.trace_requests:
+            self.tracer = Tracer(self._loop, self.cfg.trace_requests)
         for name, hook in hooks:
             self.bind_event(name, hook)
         try:
@@ -297,6 +336,8 @@ class Actor(EventHandler, Coverage):
                 return command_in_context(action, self, actor, args, kwargs)
             elif isinstance(actor, ActorProxyMonitor):
                 mailbox = actor.mailbox
+            elif actor is None and self.direct_mailbox is not None:
+                mailbox = self.direct_mailbox
         if hasattr(mailbox, 'request'):
             # if not mailbox.closed:
             return mailbox.request(action, self, target, args, kwargs)
@@ -316,6 +357,24 @@ class Actor(EventHandler, Coverage):
         attribute.'''
         return self.__impl.stop(self, exc, exit_code)
 
+    def executor(self, name='io'):
+        '''The :class:`.ActorExecutor` called ``name``.
+
+        ``io`` runs blocking calls in threads, ``cpu`` runs CPU bound
+        calls in a pool of processes. Other executors are configured via
+        the :ref:`executors <setting-executors>` setting. Executors are
+        created the first time they are requested and shut down when the
+        actor stops::
+
+            result = await actor.executor('cpu').run(func, *args)
+        '''
+        executor = self.executors.get(name)
+        if executor is None:
+            executor = actor_executor(self, name)
+            self.executors[name] = executor
+            self.bind_event('stopping', executor.shutdown)
+        return executor
+
     def add_monitor(self, monitor_name, **params):
         return self.__impl.add_monitor(self, monitor_name, **params)
 
@@ -389,6 +448,39 @@ class Actor(EventHandler, Coverage):
         aid = actor_identity(aid)
         return self.__impl.get_actor(self, aid, check_monitor=check_monitor)
 
+    def update_metrics(self):
+        '''Update the :attr:`metrics` with the uptime of the actor, the
+        number of actors it manages and the connection and request
+        counters of its :attr:`servers`.
+
+        Counters are read from the servers when the metrics are dumped,
+        serving requests does not touch the registry.
+        '''
+        metrics = self.metrics
+        if self.started():
+            metrics.gauge('pulsar_actor_uptime_seconds',
+                          'Seconds since the actor started').set(
+                self._loop.time() - self._started)
+        managed = self.managed_actors
+        if managed is not None:
+            metrics.gauge('pulsar_actors',
+                          'Number of actors managed').set(len(managed))
+        if self.servers:
+            connected = metrics.gauge('pulsar_server_connections',
+                                      'Connected clients of servers')
+            connections = metrics.counter('pulsar_server_connections_total',
+                                          'Connections accepted by servers')
+            requests = metrics.counter('pulsar_server_requests_total',
+                                       'Requests processed by servers')
+            for name, server in self.servers.items():
+                clients = server.info().get('clients') or {}
+                connected.set(clients.get('connected_clients', 0),
+                              server=name)
+                connections.set(clients.get('processed_clients', 0),
+                                server=name)
+                requests.set(clients.get('requests_processed', 0),
+                             server=name)
+
     def info(self):
         '''Return a nested dictionary of information related to the actor
         status and performance. The dictionary contains the following entries:
@@ -398,6 +490,16 @@ class Actor(EventHandler, Coverage):
         * ``events`` a dictionary of information about the
           :ref:`event loop <asyncio-event-loop>` running the actor.
         * ``extra`` the :attr:`extra` attribute (you can use it to add stuff).
+        * ``executors`` queue depth, counters and latency percentiles of
+          the :attr:`executors`, when any was used.
+        * ``loop`` event loop lag percentiles and slow callbacks from the
+          :attr:`loop_monitor`, when enabled.
+        * ``metrics`` the :meth:`~.Metrics.dump` of :attr:`metrics`
+          after :meth:`update_metrics`.
+        * ``mailbox`` flow control information about the connection with
+          the arbiter: the ``window``, the number of requests ``in_flight``
+          and ``queued`` and the number of frames in the ``outbox``.
+          Not available for the arbiter and monitors.
         * ``system`` system info.
 
         This method is invoked when you run the
@@ -414,8 +516,19 @@ class Actor(EventHandler, Coverage):
                  'process_id': self.pid,
                  'is_process': isp,
                  'age': self.impl.age}
+        if self.direct_mailbox is not None:
+            actor['mailbox'] = self.direct_mailbox.address
         data = {'actor': actor,
                 'extra': self.extra}
+        if isinstance(self.mailbox, MailboxClient):
+            data['mailbox'] = self.mailbox.info()
+        if self.loop_monitor is not None:
+            data['loop'] = self.loop_monitor.info()
+        if self.executors:
+            data['executors'] = {name: executor.info() for name, executor
+                                 in self.executors.items()}
+        self.update_metrics()
+        data['metrics'] = self.metrics.dump()
         if isp:
             data['system'] = system.process_info(self.pid)
         self.fire_event('on_info', info=data)
@@ -439,4 +552,5 @@ class Actor(EventHandler, Coverage):
         return self.stop()
 
     def _remove_actor(self, actor, log=True):
+        self.removed_actors += 1
         return self.__impl._remove_actor(self, actor, log=log)
@@ -0,0 +1,103 @@
+from .consts import AUTOSCALE_HYSTERESIS
+
+
+class Autoscaler:
+    '''Adjust the number of workers of a monitor to their load.
+
+    The number of workers stays between the ``min_workers`` (or
+    ``workers``) and ``max_workers`` settings. The load of each worker is
+    obtained from the info dictionary sent with its ``notify`` command,
+    as a fraction of the targets: ``autoscale_clients`` connected
+    clients, ``autoscale_requests`` requests per second and
+    ``autoscale_lag`` seconds of event loop lag. The busiest signal is
+    the load of the worker, one means a worker is on target.
+
+    A worker is added when the average load exceeds one and removed when
+    the load would be below :data:`AUTOSCALE_HYSTERESIS` with one worker
+    less. After a change, no other change happens for
+    ``autoscale_cooldown`` seconds.
+    '''
+    def __init__(self, monitor):
+        self.workers = monitor.cfg.workers
+        self.load = 0
+        self._changed = monitor._loop.time()
+        self._samples = {}
+
+    def bounds(self, cfg):
+        '''Minimum and maximum number of workers'''
+        low = cfg.min_workers or cfg.workers
+        return low, max(low, cfg.max_workers)
+
+    def __call__(self, monitor, actors):
+        '''Return the number of workers for ``monitor``.
+
+        :param actors: the :class:`.ActorProxyMonitor` of workers.
+        '''
+        cfg = monitor.cfg
+        low, high = self.bounds(cfg)
+        workers = min(max(self.workers, low), high)
+        now = monitor._loop.time()
+        loads = [self.worker_load(a.info, cfg, a.aid)
+                 for a in actors if a.info]
+        self._samples = {a.aid: self._samples[a.aid] for a in actors
+                         if a.aid in self._samples}
+        self.load = sum(loads)
+        if loads and now - self._changed >= cfg.autoscale_cooldown:
+            if self.load > len(loads):
+                workers = min(workers + 1, high)
+            elif (self.load < (workers - 1) * AUTOSCALE_HYSTERESIS
+                    and len(loads) >= workers):
+                workers = max(workers - 1, low)
+        if workers != self.workers:
+            monitor.logger.info('Autoscaling from %d to %d workers, load %s',
+                                self.workers, workers, round(self.load, 3))
+            self.workers = workers
+            self._changed = now
+        return workers
+
+    def worker_load(self, info, cfg, aid=None):
+        '''The load of a worker from its ``info`` dictionary.
+
+        The largest of the connected clients, the requests per second
+        and the mean event loop lag as a fraction of their target. Rates
+        are measured between two notifications of worker ``aid``.
+        '''
+        clients = requests = 0
+        for value in info.values():
+            if isinstance(value, dict):
+                stats = value.get('clients')
+                if isinstance(stats, dict):
+                    clients += stats.get('connected_clients', 0)
+                    requests += stats.get('requests_processed', 0)
+        lag = (info.get('loop') or {}).get('lag') or {}
+        lag_count = lag.get('count', 0)
+        lag_sum = lag.get('mean', 0)*lag_count
+        #
+        notified = info.get('last_notified')
+        rate = mean_lag = 0
+        sample = self._samples.get(aid)
+        if sample:
+            rate, mean_lag = sample[4:]
+            last, last_requests, last_count, last_sum = sample[:4]
+            if notified and notified > last:
+                rate = max(requests - last_requests, 0)/(notified - last)
+                if lag_count > last_count:
+                    mean_lag = (lag_sum - last_sum)/(lag_count - last_count)
+                sample = None
+        if not sample and aid is not None and notified:
+            self._samples[aid] = (notified, requests, lag_count, lag_sum,
+                                  rate, mean_lag)
+        #
+        load = clients/cfg.autoscale_clients if cfg.autoscale_clients else 0
+        if cfg.autoscale_requests:
+            load = max(load, rate/cfg.autoscale_requests)
+        if cfg.autoscale_lag:
+            load = max(load, mean_lag/cfg.autoscale_lag)
+        return load
+
+    def info(self, cfg):
+        low, high = self.bounds(cfg)
+        return {'min_workers': low,
+                'max_workers': high,
+                'workers': self.workers,
+                'load': round(self.load, 3)}
@@ -0,0 +1,276 @@
+'''Shared memory channels move bulk data between two actors on the same
+host without going through the :ref:`mailbox <tutorials-messages>`.
+
+A :class:`Channel` is a single producer, single consumer ring buffer
+in a memory mapped file. Payloads are copied into the ring by the producer
+and out of it by the consumer, no pickling, framing or socket copies are
+involved. Only tiny doorbell messages travel via the mailbox, and only
+when the other end is waiting for data or for space::
+
+    from pulsar import send
+    from pulsar.async.channel import Channel
+
+    # in the producer actor
+    async def produce(consumer, payloads):
+        channel = Channel.create(size=2**26)
+        done = send(consumer, 'run', consume, channel.name)
+        for payload in payloads:
+            await channel.put(payload)
+        await done
+        channel.close()
+
+    # executed in the consumer actor
+    async def consume(actor, name):
+        channel = Channel.attach(name)
+        data = await channel.get()
+        ...
+
+Payloads can be any object supporting the buffer protocol, for example
+``bytes`` or a contiguous ``numpy`` array.
+
+.. autoclass:: Channel
+  :members:
+  :member-order: bysource
+'''
+import os
+import mmap
+import tempfile
+from struct import Struct
+
+from pulsar.utils.string import gen_unique_id
+
+from .access import get_actor, create_future, ensure_future
+from .proxy import command
+
+
+__all__ = ['Channel']
+
+
+# header layout
+CAPACITY = 0
+WRITE = 8
+READ = 16
+READER_WAITING = 24
+WRITER_WAITING = 25
+# actor ids of the two ends, prefixed by their length
+AID_SIZE = 256
+PRODUCER = 64
+CONSUMER = PRODUCER + AID_SIZE
+HEADER_SIZE = CONSUMER + AID_SIZE
+#
+DEFAULT_SIZE = 2**24
+# Interval for checking the ring when waiting for a doorbell which may
+# have been missed
+POLL_INTERVAL = 0.05
+
+uint64 = Struct('=Q')
+length = Struct('=I')
+aid_length = Struct('=H')
+_channels = {}
+
+
+@command(ack=False)
+def channel_doorbell(request, name, end):
+    '''Wake up the ``end`` of channel ``name`` waiting for the other end
+    '''
+    channel = _channels.get((name, end))
+    if channel is not None:
+        channel._ring()
+
+
+class Channel:
+    '''One end of a shared memory channel between two actors.
+
+    Create the producer end with :meth:`create`, pass its :attr:`name` to
+    another actor which obtains the consumer end via :meth:`attach`.
+    The ring buffer has space for :attr:`size` bytes, each payload takes
+    its length plus four bytes.
+
+    .. attribute:: name
+
+        The path of the memory mapped file, it identifies the channel.
+    '''
+    _waiter = None
+
+    def __init__(self, name, buffer, end, actor=None):
+        self.name = name
+        self.end = end
+        self._buffer = buffer
+        self._actor = actor or get_actor()
+        self._loop = self._actor._loop
+        self._capacity = self._get(CAPACITY)
+        _channels[(name, end)] = self
+
+    def __repr__(self):
+        return '%s %s' % (self.end, self.name)
+    __str__ = __repr__
+
+    @classmethod
+    def create(cls, size=DEFAULT_SIZE, actor=None):
+        '''Create the producer end of a new channel of ``size`` bytes
+        '''
+        actor = actor or get_actor()
+        aid = _aid(actor)
+        directory = '/dev/shm'
+        if not os.path.isdir(directory):
+            directory = tempfile.gettempdir()
+        name = os.path.join(directory, 'pulsar-channel-%s' % gen_unique_id())
+        fd = os.open(name, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            os.ftruncate(fd, HEADER_SIZE + size)
+            buffer = mmap.mmap(fd, HEADER_SIZE + size)
+        finally:
+            os.close(fd)
+        uint64.pack_into(buffer, CAPACITY, size)
+        _set_aid(buffer, PRODUCER, aid)
+        return cls(name, buffer, 'producer', actor)
+
+    @classmethod
+    def attach(cls, name, actor=None):
+        '''Attach to channel ``name`` as its consumer.
+
+        Once attached, the file backing the channel is removed.
+        '''
+        actor = actor or get_actor()
+        aid = _aid(actor)
+        fd = os.open(name, os.O_RDWR)
+        try:
+            buffer = mmap.mmap(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
+        if _get_aid(buffer, CONSUMER):
+            buffer.close()
+            raise ValueError('Channel %s has already a consumer' % name)
+        _set_aid(buffer, CONSUMER, aid)
+        os.unlink(name)
+        return cls(name, buffer, 'consumer', actor)
+
+    @property
+    def size(self):
+        '''Capacity of the ring buffer in bytes'''
+        return self._capacity
+
+    def __len__(self):
+        '''Number of bytes written and not yet read'''
+        return self._get(WRITE) - self._get(READ)
+
+    async def put(self, data):
+        '''Write ``data``, waiting for space in the ring if needed
+        '''
+        assert self.end == 'producer', 'Only producers can put data'
+        data = memoryview(data).cast('B')
+        size = len(data) + length.size
+        if size > self._capacity:
+            raise ValueError('Payload of %d bytes too large for channel of '
+                             '%d bytes' % (len(data), self._capacity))
+        if self._capacity - len(self) < size:
+            await self._wait(
+                WRITER_WAITING,
+                lambda: self._capacity - len(self) >= size)
+        position = self._get(WRITE)
+        self._copy_in(position, length.pack(len(data)))
+        self._copy_in(position + length.size, data)
+        uint64.pack_into(self._buffer, WRITE, position + size)
+        self._notify(READER_WAITING, CONSUMER, 'consumer')
+
+    async def get(self):
+        '''Read the next payload as ``bytes``, waiting for it if needed
+        '''
+        assert self.end == 'consumer', 'Only consumers can get data'
+        if not len(self):
+            await self._wait(READER_WAITING, self.__len__)
+        position = self._get(READ)
+        size = length.unpack(self._copy_out(position, length.size))[0]
+        data = self._copy_out(position + length.size, size)
+        uint64.pack_into(self._buffer, READ, position + length.size + size)
+        self._notify(WRITER_WAITING, PRODUCER, 'producer')
+        return data
+
+    def close(self):
+        '''Close this end of the channel
+        '''
+        if _channels.pop((self.name, self.end), None) is None:
+            return
+        if self._waiter and not self._waiter.done():
+            self._waiter.cancel()
+        if (self.end == 'producer' and
+                not _get_aid(self._buffer, CONSUMER)):
+            try:
+                os.unlink(self.name)
+            except FileNotFoundError:
+                pass
+        self._buffer.close()
+
+    # INTERNALS
+    def _get(self, offset):
+        return uint64.unpack_from(self._buffer, offset)[0]
+
+    def _copy_in(self, position, data):
+        start = HEADER_SIZE + position % self._capacity
+        end = start + len(data)
+        top = HEADER_SIZE + self._capacity
+        if end <= top:
+            self._buffer[start:end] = data
+        else:
+            split = top - start
+            self._buffer[start:top] = data[:split]
+            self._buffer[HEADER_SIZE:end - self._capacity] = data[split:]
+
+    def _copy_out(self, position, size):
+        start = HEADER_SIZE + position % self._capacity
+        end = start + size
+        top = HEADER_SIZE + self._capacity
+        if end <= top:
+            return self._buffer[start:end]
+        return (self._buffer[start:top] +
+                self._buffer[HEADER_SIZE:end - self._capacity])
+
+    async def _wait(self, flag, ready):
+        # Wait for the doorbell of the other end until ``ready`` is true.
+        # The flag is set before checking ``ready`` again so that the other
+        # end rings after its update. The poll guards against doorbells
+        # missed because of memory reordering between processes.
+        while not ready():
+            self._waiter = waiter = create_future(self._loop)
+            self._buffer[flag] = 1
+            if ready():
+                break
+            handle = self._loop.call_later(POLL_INTERVAL, self._ring)
+            try:
+                await waiter
+            finally:
+                handle.cancel()
+        self._buffer[flag] = 0
+        self._waiter = None
+
+    def _notify(self, flag, peer, end):
+        if self._buffer[flag]:
+            self._buffer[flag] = 0
+            aid = _get_aid(self._buffer, peer)
+            ensure_future(
+                self._actor.send(aid, 'channel_doorbell', self.name, end),
+                loop=self._loop)
+
+    def _ring(self):
+        if self._waiter and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+def _aid(actor):
+    # monitor ids are their names, they can be long
+    aid = actor.aid.encode('utf-8')
+    if len(aid) > AID_SIZE - aid_length.size:
+        raise ValueError('Actor id %s too long for a channel' % actor.aid)
+    return aid
+
+
+def _set_aid(buffer, offset, aid):
+    aid_length.pack_into(buffer, offset, len(aid))
+    start = offset + aid_length.size
+    buffer[start:start+len(aid)] = aid
+
+
+def _get_aid(buffer, offset):
+    start = offset + aid_length.size
+    size = aid_length.unpack_from(buffer, offset)[0]
+    return buffer[start:start+size].decode('utf-8')
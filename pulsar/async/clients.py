@@ -1,10 +1,14 @@
 import logging
 from functools import reduce
+from collections import deque
 
 from pulsar.utils.internet import is_socket_closed
+from pulsar.utils.structures import Histogram
 
 import asyncio
 
+from .access import ensure_future, create_future
+from .consts import POOL_MAINTENANCE_PERIOD
 from .futures import AsyncObject
 from .protocols import Producer
 
@@ -20,10 +24,17 @@ class Pool(AsyncObject):
 
     Open connections are either :attr:`in_use` or :attr:`available`
     to be used. Available connection are placed in an :class:`asyncio.Queue`.
+    When all connections are in use, requests for a connection wait in
+    first-in first-out order.
+
+    The :attr:`wait_time` and :attr:`checkout_time` histograms measure
+    the seconds spent waiting for a connection and the seconds a
+    connection stays in use.
 
     This class is not thread safe.
     '''
-    def __init__(self, creator, pool_size=10, loop=None, timeout=None, **kw):
+    def __init__(self, creator, pool_size=10, loop=None, timeout=None,
+                 idle_timeout=None, max_lifetime=None, min_size=0, **kw):
         '''
         Construct an asynchronous Pool.
 
@@ -37,15 +48,38 @@ class Pool(AsyncObject):
 
         :param timeout: The number of seconds to wait before giving up
           on returning a connection. Defaults to 30.
+
+        :param idle_timeout: Optional number of seconds after which an
+          available connection is closed.
+
+        :param max_lifetime: Optional number of seconds after which a
+          connection is closed, once released to the pool.
+
+        :param min_size: Number of connections created in the background
+          and kept open regardless of the ``idle_timeout``.
         '''
         self._creator = creator
         self._closed = False
         self._timeout = timeout
+        self._idle_timeout = idle_timeout
+        self._max_lifetime = max_lifetime
+        self._min_size = min(min_size, pool_size)
         self._queue = asyncio.Queue(maxsize=pool_size, loop=loop)
         self._connecting = 0
         self._loop = self._queue._loop
         self._logger = logger
-        self._in_use_connections = set()
+        # connection -> checkout time
+        self._in_use_connections = {}
+        # connection -> creation time
+        self._created = {}
+        # connection -> time released to the pool
+        self._released = {}
+        self._waiters = deque()
+        self._maintenance = None
+        self.wait_time = Histogram()
+        self.checkout_time = Histogram()
+        if idle_timeout or max_lifetime or self._min_size:
+            self._maintenance = self._loop.call_soon(self._maintain)
 
     @property
     def pool_size(self):
@@ -72,6 +106,12 @@ class Pool(AsyncObject):
         '''
         return reduce(self._count_connections, self._queue._queue, 0)
 
+    @property
+    def waiting(self):
+        '''Number of requests waiting for a connection.
+        '''
+        return len(self._waiters)
+
     @property
     def closed(self):
         """True when this pool is closed
@@ -102,6 +142,11 @@ class Pool(AsyncObject):
         have closed
         '''
         if not self.closed:
+            if self._maintenance:
+                self._maintenance.cancel()
+                self._maintenance = None
+            while self._waiters:
+                self._waiters.popleft().cancel()
             waiters = []
             queue = self._queue
             while queue.qsize():
@@ -109,49 +154,168 @@ class Pool(AsyncObject):
                 if connection:
                     waiters.append(connection.close())
             in_use = self._in_use_connections
-            self._in_use_connections = set()
+            self._in_use_connections = {}
             for connection in in_use:
                 if connection:
                     waiters.append(connection.close())
+            self._created.clear()
+            self._released.clear()
             self._closed = asyncio.gather(*waiters, loop=self._loop)
         return self._closed
 
+    def info(self):
+        '''Dictionary of information about this pool'''
+        return {'pool_size': self.pool_size,
+                'available': self.available,
+                'in_use': self.in_use,
+                'connecting': self._connecting,
+                'waiting': self.waiting,
+                'wait_time': self.wait_time.info(),
+                'checkout_time': self.checkout_time.info()}
+
     async def _get(self):
+        loop = self._loop
         queue = self._queue
-        # grab the connection without waiting, important!
-        if queue.qsize():
-            connection = queue.get_nowait()
-        # wait for one to be available
-        elif self.in_use + self._connecting >= queue._maxsize:
-            connection = await asyncio.wait_for(queue.get(), self._timeout,
-                                                loop=self._loop)
-        else:   # must create a new connection
-            self._connecting += 1
-            try:
-                connection = await self._creator()
-            finally:
-                self._connecting -= 1
-        # None signal that a connection was removed form the queue
-        # Go again
-        if connection is None:
-            connection = await self._get()
-        else:
-            if self.is_connection_closed(connection):
-                connection = await self._get()
+        start = loop.time()
+        while True:
+            # grab the connection without waiting, important!
+            if queue.qsize():
+                connection = queue.get_nowait()
+            elif self.in_use + self._connecting < queue._maxsize:
+                connection = await self._create()
+            else:
+                # wait for one to be released, None signals that a
+                # connection was discarded and we can create a new one
+                connection = await self._wait()
+                if connection is None:
+                    connection = await self._create(reserved=True)
+            if (self.is_connection_closed(connection) or
+                    self._expired(connection, loop.time())):
+                connection.close()
+                self._in_use_connections.pop(connection, None)
+                self._forget(connection)
             else:
-                self._in_use_connections.add(connection)
+                break
+        now = loop.time()
+        self._in_use_connections[connection] = now
+        self._released.pop(connection, None)
+        self.wait_time.add(now - start)
+        return connection
+
+    async def _wait(self):
+        waiter = create_future(self._loop)
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, self._timeout,
+                                          loop=self._loop)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                # got a connection or a slot while timing out, give it back
+                connection = waiter.result()
+                if connection is None:
+                    self._connecting -= 1
+                self._put(connection, connection is None)
+            raise
+
+    async def _create(self, reserved=False):
+        if not reserved:
+            self._connecting += 1
+        try:
+            connection = await self._creator()
+        except Exception:
+            self._connecting -= 1
+            # the slot is free again, a waiter can try to connect
+            self._free_slot()
+            raise
+        self._connecting -= 1
+        self._created[connection] = self._loop.time()
         return connection
 
     def _put(self, conn, discard=False):
-        if not self.closed:
+        now = self._loop.time()
+        checkout = self._in_use_connections.pop(conn, None)
+        if checkout is not None:
+            self.checkout_time.add(now - checkout)
+        if self.closed:
+            # a connection created or released after the pool closed
+            if conn is not None:
+                conn.close()
+            return
+        if conn is None:
+            discard = True
+        elif not discard and self._expired(conn, now):
+            conn.close()
+            discard = True
+        if discard:
+            self._forget(conn)
+            self._free_slot()
+            return
+        waiter = self._next_waiter()
+        if waiter:
+            self._in_use_connections[conn] = now
+            waiter.set_result(conn)
+        else:
             try:
-                # None signal that a connection was removed form the queue
-                self._queue.put_nowait(None if discard else conn)
+                self._queue.put_nowait(conn)
+                self._released[conn] = now
             except asyncio.QueueFull:
                 # The queue of available connection is already full
-                if conn:
-                    conn.close()
-        self._in_use_connections.discard(conn)
+                conn.close()
+                self._forget(conn)
+
+    def _free_slot(self):
+        # reserve a free slot for the next waiter, if any
+        waiter = self._next_waiter()
+        if waiter:
+            self._connecting += 1
+            waiter.set_result(None)
+
+    def _next_waiter(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                return waiter
+
+    def _forget(self, conn):
+        self._created.pop(conn, None)
+        self._released.pop(conn, None)
+
+    def _expired(self, conn, now):
+        return bool(self._max_lifetime and
+                    now - self._created.get(conn, now) > self._max_lifetime)
+
+    def _maintain(self):
+        # evict idle and expired connections and pre-warm to min_size
+        self._maintenance = None
+        if self.closed:
+            return
+        now = self._loop.time()
+        idle_timeout = self._idle_timeout
+        available = self._queue._queue
+        size = self.in_use + self._connecting + len(available)
+        for conn in list(available):
+            idle = now - self._released.get(conn, now)
+            if (self._expired(conn, now) or
+                    (idle_timeout and idle > idle_timeout and
+                     size > self._min_size)):
+                available.remove(conn)
+                conn.close()
+                self._forget(conn)
+                size -= 1
+        for _ in range(self._min_size - size):
+            ensure_future(self._prewarm(), loop=self._loop)
+        self._maintenance = self._loop.call_later(
+            POOL_MAINTENANCE_PERIOD, self._maintain)
+
+    async def _prewarm(self):
+        try:
+            connection = await self._create()
+        except Exception as exc:
+            self._logger.warning('Could not pre-warm %s: %s', self, exc)
+        else:
+            self._put(connection)
 
     def is_connection_closed(self, connection):
         is_closing = getattr(connection.transport, 'is_closing', None)
@@ -270,6 +434,12 @@ class AbstractClient(Producer, ClientMixin):
             _, protocol = await self._loop.create_connection(
                 protocol_factory, host, port, **kw)
             await protocol.event('connection_made')
+        elif isinstance(address, str):
+            if self.debug:
+                self.logger.debug('Create unix connection %s', address)
+            _, protocol = await self._loop.create_unix_connection(
+                protocol_factory, address, **kw)
+            await protocol.event('connection_made')
         else:
             raise NotImplementedError('Could not connect to %s' %
                                       str(address))
@@ -1,6 +1,7 @@
 from time import time
 
 from pulsar import CommandError
+from pulsar.utils.metrics import merge
 
 from .proxy import command, ActorProxyMonitor
 from .futures import async_while
@@ -78,6 +79,17 @@ def notify(request, info):
     return t
 
 
+@command()
+def mailbox_address(request, aid):
+    '''Return the address of the direct mailbox of actor ``aid``.
+
+    Return ``None`` if the actor does not serve a direct mailbox.
+    '''
+    proxy = request.actor.get_actor(aid)
+    if isinstance(proxy, ActorProxyMonitor) and proxy.info:
+        return proxy.info['actor'].get('mailbox')
+
+
 @command()
 def spawn(request, **kwargs):
     '''Spawn a new actor.'''
@@ -90,6 +102,66 @@ def info(request):
     return request.actor.info()
 
 
+@command()
+def metrics(request):
+    '''Return the :class:`.Metrics` of the actor merged with the metrics
+    of the actors it manages.
+
+    The metrics of workers are the ones received with their last
+    ``notify``, workers are not contacted. Samples are labelled with the
+    ``actor`` name and ``aid``.
+    '''
+    actor = request.actor
+    actor.update_metrics()
+    dumps = [(actor_labels(actor.name, actor.aid), actor.metrics.dump())]
+    monitors = list((actor.monitors or {}).values())
+    for monitor in monitors:
+        monitor.update_metrics()
+        dumps.append((actor_labels(monitor.name, monitor.aid),
+                      monitor.metrics.dump()))
+    for manager in [actor] + monitors:
+        for proxy in (manager.managed_actors or {}).values():
+            info = proxy.info
+            if info and info.get('metrics'):
+                dumps.append((actor_labels(info['actor']['name'],
+                                           info['actor']['actor_id']),
+                              info['metrics']))
+    return merge(dumps)
+
+
+@command()
+def trace(request):
+    '''Return the requests traced by the actor in the Chrome trace-event
+    format, or ``None`` when :ref:`tracing <setting-trace_requests>` is
+    not enabled.
+    '''
+    tracer = request.actor.tracer
+    if tracer is not None:
+        return tracer.chrome_trace()
+
+
+def actor_labels(name, aid):
+    return {'actor': name, 'aid': aid}
+
+
+@command()
+def restart(request, *names):
+    '''Restart the workers of the monitors ``names`` without downtime.
+
+    This command can only be executed by the arbiter::
+
+        send('arbiter', 'restart', 'wsgi')
+
+    Without ``names`` the workers of all monitors are restarted.
+    New workers are spawned first, the old ones are stopped once
+    the new ones are ready. Return a dictionary mapping monitor names
+    to the number of workers being replaced.
+    '''
+    arb = request.actor
+    if arb.is_arbiter():
+        return arb.impl.restart_monitors(arb, names)
+
+
 @command()
 async def kill_actor(request, aid, timeout=5):
     '''Kill an actor with id ``aid``.
@@ -5,7 +5,7 @@ import asyncio
 import pickle
 from time import time
 from collections import OrderedDict
-from multiprocessing import Process, current_process
+from multiprocessing import Process, current_process, get_context
 from multiprocessing.reduction import ForkingPickler
 
 import pulsar
@@ -15,15 +15,19 @@ from pulsar.utils.tools import Pidfile
 from pulsar.utils import autoreload
 
 from .proxy import ActorProxyMonitor, get_proxy, actor_proxy_future
-from .access import get_actor, set_actor, logger, EventLoopPolicy
+from .access import (get_actor, set_actor, logger, EventLoopPolicy,
+                     event_loop_policy)
 from .threads import Thread
-from .mailbox import MailboxClient, MailboxProtocol, ProxyMailbox, create_aid
+from .mailbox import (MailboxClient, MailboxProtocol, ProxyMailbox,
+                      DirectMailbox, mailbox_server_address, create_aid)
 from .futures import ensure_future, add_errback, chain_future, create_future
 from .protocols import TcpServer
 from .actor import Actor
 from .consts import (ACTOR_STATES, ACTOR_TIMEOUT_TOLE, MIN_NOTIFY, MAX_NOTIFY,
                      MONITOR_TASK_PERIOD)
 from .process import ProcessMixin
+from .autoscale import Autoscaler
+from .lag import LoopMonitor
 
 __all__ = ['arbiter']
 
@@ -133,7 +137,10 @@ class Concurrency:
             loop = asyncio.get_event_loop()
         except RuntimeError:
             if self.cfg and self.cfg.concurrency == 'thread':
-                loop = asyncio.new_event_loop()
+                policy = asyncio.get_event_loop_policy()
+                if not isinstance(policy, EventLoopPolicy):
+                    policy = event_loop_policy(self.cfg)
+                loop = policy.new_event_loop()
                 asyncio.set_event_loop(loop)
             else:
                 raise
@@ -150,6 +157,8 @@ class Concurrency:
 
         * set the ``actor`` as the actor of the current thread
         * bind two additional callbacks to the ``start`` event
+        * start the :class:`.LoopMonitor` if the
+          :ref:`loop monitor <setting-loop_monitor>` is enabled
         * fire the ``start`` event
 
         If the hand shake is successful, the actor will eventually
@@ -162,6 +171,15 @@ class Concurrency:
             actor.bind_event('start', self._switch_to_run)
             actor.bind_event('start', self.periodic_task)
             actor.bind_event('start', self._acknowledge_start)
+            if actor.cfg.loop_monitor and not actor.is_monitor():
+                # monitors share the event loop with the arbiter
+                lag = actor.metrics.histogram(
+                    'pulsar_loop_lag_seconds',
+                    'Scheduling lag of the actor event loop')
+                actor.loop_monitor = LoopMonitor(
+                    actor._loop, actor.cfg.loop_monitor,
+                    actor.cfg.slow_callback, lag.get()).start()
+                actor.bind_event('stopping', actor.loop_monitor.stop)
             actor.fire_event('start')
         except Exception as exc:
             actor.stop(exc)
@@ -174,9 +192,26 @@ class Concurrency:
     def create_mailbox(self, actor, loop):
         '''Create the mailbox for ``actor``.'''
         client = MailboxClient(actor.monitor.address, actor, loop)
-        loop.call_soon_threadsafe(self.hand_shake, actor)
+        if self.cfg.direct_mailbox:
+            # serve the direct mailbox before the first notification
+            # so that the arbiter knows its address
+            mailbox = DirectMailbox(actor, loop)
+            mailbox.server.bind_event(
+                'start', lambda _, **kw: self.hand_shake(actor))
+            actor.direct_mailbox = mailbox
+            add_errback(ensure_future(mailbox.start_serving(), loop=loop),
+                        lambda exc: self._direct_mailbox_failed(actor, exc))
+        else:
+            loop.call_soon_threadsafe(self.hand_shake, actor)
         return client
 
+    def _direct_mailbox_failed(self, actor, exc):
+        # messages go via the arbiter when the direct mailbox cannot serve
+        actor.logger.error('Could not serve the direct mailbox, messages '
+                           'are sent via the arbiter: %s', exc)
+        actor.direct_mailbox = None
+        self.hand_shake(actor)
+
     def periodic_task(self, actor, **kw):
         '''Implement the :ref:`actor period task <actor-periodic-task>`.
 
@@ -253,12 +288,16 @@ class Concurrency:
         #
         if actor._loop.is_running():
             actor.logger.debug('Closing mailbox')
+            if actor.direct_mailbox is not None:
+                actor.direct_mailbox.close()
             actor.mailbox.close()
         else:
             actor.state = ACTOR_STATES.CLOSE
             actor.logger.debug('Exiting actor with exit code 1')
             actor.exit_code = 1
             actor.mailbox.abort()
+            if actor.direct_mailbox is not None:
+                actor.direct_mailbox.close()
             return actor.stop()
 
     def _switch_to_run(self, actor, exc=None):
@@ -278,6 +317,8 @@ class Concurrency:
 
 
 class MonitorMixin:
+    autoscaler = None
+    retiring = None
 
     def identity(self, actor):
         return actor.name
@@ -375,27 +416,84 @@ class MonitorMixin:
                 actor.stop()
         return 1
 
-    def spawn_actors(self, monitor):
+    def num_workers(self, monitor):
+        '''The number of workers ``monitor`` should be running.
+
+        It is the ``workers`` setting unless autoscaling is enabled via
+        the ``max_workers`` setting, in which case the :attr:`autoscaler`
+        decides.
+        '''
+        cfg = monitor.cfg
+        if self.autoscaler is None:
+            if cfg.max_workers <= (cfg.min_workers or cfg.workers):
+                return cfg.workers
+            self.autoscaler = Autoscaler(monitor)
+        return self.autoscaler(monitor, self.managed_actors.values())
+
+    def spawn_actors(self, monitor, workers=None):
         '''Spawn new actors if needed.
         '''
-        to_spawn = monitor.cfg.workers - len(self.managed_actors)
-        if monitor.cfg.workers and to_spawn > 0:
+        if workers is None:
+            workers = self.num_workers(monitor)
+        to_spawn = workers - len(self._serving_actors())
+        if workers and to_spawn > 0:
             for _ in range(to_spawn):
                 monitor.spawn()
 
-    def stop_actors(self, monitor):
+    def stop_actors(self, monitor, workers=None):
         """Maintain the number of workers by spawning or killing as required
         """
-        if monitor.cfg.workers:
-            num_to_kill = len(self.managed_actors) - monitor.cfg.workers
+        if workers is None:
+            workers = self.num_workers(monitor)
+        if workers:
+            actors = self._serving_actors()
+            num_to_kill = len(actors) - workers
             for i in range(num_to_kill, 0, -1):
                 w, kage = 0, sys.maxsize
-                for worker in self.managed_actors.values():
+                for worker in actors:
                     age = worker.impl.age
                     if age < kage:
                         w, kage = worker, age
+                actors.remove(w)
                 self.manage_actor(monitor, w, True)
 
+    def restart_actors(self, monitor):
+        '''Replace the managed actors with new ones, without downtime.
+
+        The current actors are marked as retiring and new actors are
+        spawned. Retiring actors are stopped, oldest first, once new
+        actors have notified the monitor, so that the number of actors
+        ready to serve does not drop. Return the number of actors to
+        replace.
+        '''
+        retiring = set(self.managed_actors)
+        if retiring:
+            self.retiring = retiring | (self.retiring or set())
+            monitor.logger.warning('Restarting %d workers', len(retiring))
+        return len(retiring)
+
+    def retire_actors(self, monitor, workers):
+        '''Stop retiring actors replaced by new actors ready to serve.
+        '''
+        retiring = [a for a in self.managed_actors.values()
+                    if a.aid in self.retiring]
+        if not retiring:
+            self.retiring = None
+            monitor.logger.warning('Workers restarted')
+            return
+        self.retiring = set((a.aid for a in retiring))
+        ready = [a for a in self._serving_actors() if a.notified]
+        serving = [a for a in retiring if not a.stopping_start]
+        serving.sort(key=lambda a: a.impl.age)
+        for actor in serving[:max(len(ready) + len(serving) - workers, 0)]:
+            self.manage_actor(monitor, actor, True)
+
+    def _serving_actors(self):
+        # managed actors not replaced by a restart
+        retiring = self.retiring or ()
+        return [a for a in self.managed_actors.values()
+                if a.aid not in retiring]
+
     def _close_actors(self, monitor):
         #
         # Close all managed actors at once and wait for completion
@@ -431,6 +529,8 @@ class MonitorMixin:
         if actor.started():
             info['actor'].update({'concurrency': actor.cfg.concurrency,
                                   'workers': len(self.managed_actors)})
+            if self.autoscaler:
+                info['autoscale'] = self.autoscaler.info(actor.cfg)
             info['workers'] = [a.info for a in self.managed_actors.values()
                                if a.info]
         return info
@@ -474,8 +574,11 @@ class MonitorConcurrency(MonitorMixin, Concurrency):
             self.manage_actors(monitor)
             #
             if monitor.is_running():
-                self.spawn_actors(monitor)
-                self.stop_actors(monitor)
+                workers = self.num_workers(monitor)
+                self.spawn_actors(monitor, workers)
+                self.stop_actors(monitor, workers)
+                if self.retiring:
+                    self.retire_actors(monitor, workers)
             elif monitor.cfg.debug:
                 monitor.logger.debug('still stopping')
             #
@@ -512,9 +615,7 @@ class ArbiterConcurrency(MonitorMixin, ProcessMixin, Concurrency):
 
     def create_actor(self):
         cfg = self.cfg
-        policy = EventLoopPolicy(cfg.event_loop, cfg.thread_workers,
-                                 cfg.debug)
-        asyncio.set_event_loop_policy(policy)
+        asyncio.set_event_loop_policy(event_loop_policy(cfg))
         if cfg.daemon:     # pragma    nocover
             # Daemonize the system
             if not cfg.pid_file:
@@ -560,12 +661,28 @@ class ArbiterConcurrency(MonitorMixin, ProcessMixin, Concurrency):
         params['kind'] = 'monitor'
         return actor.spawn(**params)
 
+    def restart_monitors(self, actor, names=None):
+        '''Restart the workers of the monitors in ``names``, or of all
+        monitors if ``names`` is not given.
+
+        Return a dictionary mapping monitor names to the number of
+        workers to replace.
+        '''
+        return dict(((m.name, m.impl.restart_actors(m))
+                     for m in self.monitors.values()
+                     if not names or m.name in names))
+
+    def handle_hup(self, actor, sig):
+        actor.logger.warning("got %s - restarting workers",
+                             system.SIG_NAMES.get(sig))
+        self.restart_monitors(actor)
+
     def create_mailbox(self, actor, loop):
         '''Override :meth:`.Concurrency.create_mailbox` to create the
         mailbox server.
         '''
-        mailbox = TcpServer(MailboxProtocol, loop, ('127.0.0.1', 0),
-                            name='mailbox')
+        mailbox = TcpServer(MailboxProtocol, loop,
+                            mailbox_server_address(actor), name='mailbox')
         # when the mailbox stop, close the event loop too
         mailbox.bind_event('stop', lambda _, **kw: loop.stop())
         mailbox.bind_event(
@@ -752,12 +869,43 @@ class ActorMultiProcess(ProcessMixin, Concurrency, Process):
             _set_running_loop(None)
         except ImportError:
             pass
+        asyncio.set_event_loop_policy(event_loop_policy(self.cfg))
         run_actor(self)
 
     def kill(self, sig):
         system.kill(self.pid, sig)
 
 
+class ActorForkServer(ActorMultiProcess):
+    '''Actor on a Operative system process forked from a template process.
+
+    The template process is the :mod:`multiprocessing` fork server. It
+    imports the ``__main__`` module, pulsar and the
+    :ref:`preload <setting-preload>` modules once, so that new actors
+    do not pay for importing the application and share the memory of
+    the loaded modules. Unlike :class:`ActorMultiProcess`, actors do not
+    inherit the state of the arbiter process.
+    '''
+    def start(self):
+        modules = ['__main__', 'pulsar']
+        modules.extend((m for m in self.cfg.preload if m not in modules))
+        # only used when the fork server is started
+        get_context('forkserver').set_forkserver_preload(modules)
+        # the fork server environment is the one of when it started
+        self.environ = dict(os.environ)
+        super().start()
+
+    @staticmethod
+    def _Popen(process_obj):
+        return get_context('forkserver').Process._Popen(process_obj)
+
+    def run(self):  # pragma    nocover
+        os.environ.clear()
+        os.environ.update(self.environ)
+        asyncio.set_event_loop_policy(event_loop_policy(self.cfg))
+        run_actor(self)
+
+
 class ActorSubProcess(ProcessMixin, Concurrency):
     '''Actor on a Operative system process.
     '''
@@ -823,7 +971,8 @@ concurrency_models = {
     'coroutine': ActorCoroutine,
     'thread': ActorThread,
     'process': ActorMultiProcess,
-    'subprocess': ActorSubProcess
+    'subprocess': ActorSubProcess,
+    'forkserver': ActorForkServer
 }
 
 
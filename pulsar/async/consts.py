@@ -46,6 +46,9 @@ MIN_NOTIFY = 3     # DON'T NOTIFY BELOW THIS INTERVAL
 MAX_NOTIFY = 30    # NOTIFY AT LEAST AFTER THESE SECONDS
 ACTOR_TIMEOUT_TOLE = 0.3  # NOTIFY AFTER THIS TIMES THE TIMEOUT
 ACTOR_JOIN_THREAD_POOL_TIMEOUT = 5  # TIMEOUT WHEN JOINING THE THREAD POOL
+IDLE_TIMEOUT_RESOLUTION = 1  # GRANULARITY IN SECONDS OF IDLE TIMEOUTS
+AUTOSCALE_HYSTERESIS = 0.5  # SCALE DOWN BELOW THIS FRACTION OF THE TARGET
+POOL_MAINTENANCE_PERIOD = 1  # SECONDS BETWEEN CONNECTION POOL EVICTIONS
 MONITOR_TASK_PERIOD = 1
 '''Interval for :class:`pulsar.Monitor` and :class:`pulsar.Arbiter`
 periodic task.'''
@@ -30,7 +30,7 @@ class Coverage:
                     p._coverage.start()
                 config_file = self.coverage.config_file
                 os.environ['COVERAGE_PROCESS_START'] = config_file
-            elif self.cfg.concurrency == 'subprocess':
+            elif self.cfg.concurrency in ('subprocess', 'forkserver'):
                 coverage.process_startup()
 
     def stop_coverage(self):
@@ -60,7 +60,13 @@ class AbstractEvent(AsyncObject):
 
 class Event(AbstractEvent):
     '''The default implementation of :class:`AbstractEvent`.
+
+    Handlers are compiled every time a callback is bound or removed: when
+    only one handler is bound, :meth:`fire` invokes it directly rather than
+    looping through the list of handlers.
     '''
+    _handler = None
+
     def __init__(self, loop=None, name=None):
         self._loop = loop
         self._name = name or self.__class__.__name__.lower()
@@ -69,15 +75,41 @@ class Event(AbstractEvent):
         return '%s: %s' % (self._name, self._handlers)
     __str__ = __repr__
 
+    def bind(self, callback):
+        super().bind(callback)
+        self._compile()
+
+    def remove_callback(self, callback):
+        removed_count = super().remove_callback(callback)
+        self._compile()
+        return removed_count
+
+    def clear(self):
+        super().clear()
+        self._compile()
+
     def fire(self, arg, **kwargs):
-        self._fired += self._fired + 1
-        if self._handlers:
+        self._fired += 1
+        handler = self._handler
+        if handler is not None:
+            try:
+                handler(arg, **kwargs)
+            except Exception:
+                self.logger.exception('Exception while firing %s', self)
+        elif self._handlers:
             for hnd in self._handlers:
                 try:
                     hnd(arg, **kwargs)
                 except Exception:
                     self.logger.exception('Exception while firing %s', self)
 
+    def _compile(self):
+        handlers = self._handlers
+        if handlers and len(handlers) == 1:
+            self._handler = handlers[0]
+        else:
+            self._handler = None
+
 
 class OneTime(Future, AbstractEvent):
     '''An :class:`AbstractEvent` which can be fired once only.
@@ -216,9 +248,9 @@ class EventHandler(AsyncObject):
             can also be a list/tuple of callables.
         :return: nothing.
         '''
-        if name not in self._events:
-            self._events[name] = Event()
-        event = self._events[name]
+        event = self._events.get(name)
+        if event is None:
+            self._events[name] = event = Event(loop=self._loop, name=name)
         event.bind(callback)
 
     def remove_callback(self, name, callback):
@@ -255,8 +287,8 @@ class EventHandler(AsyncObject):
         else:
             raise TypeError('fire_event expected at most 1 argument got %s' %
                             len(args))
-        event = self.event(name)
-        if event:
+        event = self._events.get(name)
+        if event is not None:
             try:
                 event.fire(arg, **kwargs)
             except InvalidStateError:
@@ -265,6 +297,13 @@ class EventHandler(AsyncObject):
         else:
             self.logger.warning('Unknown event "%s" for %s', name, self)
 
+    def events_fired(self):
+        '''Dictionary of :ref:`many times events <many-times-event>` names
+        and the number of times they have fired.
+        '''
+        return dict(((name, event._fired) for name, event in
+                     self._events.items() if isinstance(event, Event)))
+
     def copy_many_times_events(self, other):
         '''Copy :ref:`many times events <many-times-event>` from  ``other``.
 
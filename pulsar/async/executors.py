@@ -0,0 +1,231 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+from pulsar.utils.config import (Setting, validate_pos_int, validate_dict,
+                                 validate_string)
+from pulsar.utils.exceptions import ExecutorFull, ImproperlyConfigured
+
+from .access import create_future
+
+
+REJECT_POLICIES = ('wait', 'raise', 'caller')
+EXECUTOR_KINDS = ('thread', 'process')
+
+
+class ProcessWorkers(Setting):
+    name = "process_workers"
+    section = "Worker Processes"
+    flags = ["--process-workers"]
+    validator = validate_pos_int
+    type = int
+    default = 0
+    desc = """\
+        Number of processes of the ``cpu`` executor of an actor.
+
+        Zero (the default) uses the number of CPUs of the machine. The
+        pool is only created when the ``cpu`` executor is first used.
+        """
+
+
+class ExecutorQueue(Setting):
+    name = "executor_queue"
+    section = "Worker Processes"
+    flags = ["--executor-queue"]
+    validator = validate_pos_int
+    type = int
+    default = 0
+    desc = """\
+        Maximum number of calls submitted to an actor executor and
+        not yet completed.
+
+        When the limit is reached, new calls are handled according to the
+        :ref:`executor reject <setting-executor_reject>` policy.
+        Zero (the default) does not limit the queue.
+        """
+
+
+class ExecutorReject(Setting):
+    name = "executor_reject"
+    section = "Worker Processes"
+    flags = ["--executor-reject"]
+    choices = REJECT_POLICIES
+    validator = validate_string
+    default = 'wait'
+    desc = """\
+        What to do with calls submitted to a full executor queue.
+
+        ``wait`` until a call completes, ``raise`` :class:`.ExecutorFull`
+        or run the call in the ``caller`` thread, blocking the event loop.
+        """
+
+
+class ExecutorsSetting(Setting):
+    name = "executors"
+    section = "Worker Processes"
+    validator = validate_dict
+    default = {}
+    desc = """\
+        Named executors of actors, available via :meth:`.Actor.executor`.
+
+        A dictionary mapping names to dictionaries with the ``kind``
+        (``thread`` or ``process``) and optional ``workers``, ``queue``
+        and ``reject`` entries. The ``io`` and ``cpu`` executors are
+        always available: by default ``io`` is the event loop thread
+        pool of :ref:`thread workers <setting-thread_workers>` and
+        ``cpu`` a process pool of
+        :ref:`process workers <setting-process_workers>`.
+        """
+
+
+class ActorExecutor:
+    '''A thread or process pool executor with a bounded submission queue.
+
+    Calls are submitted with the :meth:`run` coroutine. At most
+    :attr:`max_queue` calls can be pending (queued or running) at any
+    time, when the queue is full the :attr:`reject` policy applies.
+
+    .. attribute:: latency
+
+        :class:`.Histogram` of the seconds between the submission and
+        the completion of calls.
+    '''
+    def __init__(self, name, loop, executor=None, kind='thread',
+                 workers=None, max_queue=0, reject='wait', latency=None):
+        if reject not in REJECT_POLICIES:
+            raise ImproperlyConfigured('Executor reject policy must be one '
+                                       'of %s' % ', '.join(REJECT_POLICIES))
+        self.name = name
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self.reject = reject
+        self.latency = latency
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.closed = False
+        self._loop = loop
+        self._executor = executor
+        self._waiters = deque()
+
+    def __repr__(self):
+        return '%s executor %s' % (self.kind, self.name)
+    __str__ = __repr__
+
+    @property
+    def full(self):
+        return bool(self.max_queue and self.pending >= self.max_queue)
+
+    async def run(self, func, *args, **kwargs):
+        '''Run ``func`` in the executor and return its result
+        '''
+        if self.closed:
+            raise RuntimeError('%s is shut down' % self)
+        if self.full:
+            if self.reject == 'raise':
+                self.rejected += 1
+                raise ExecutorFull('%s is full' % self)
+            elif self.reject == 'caller':
+                self.rejected += 1
+                return self._timed(func, args, kwargs)
+            while self.full:
+                await self._wait()
+        self.pending += 1
+        start = self._loop.time()
+        try:
+            return await self._loop.run_in_executor(
+                self._executor, partial(func, *args, **kwargs))
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            if self.latency is not None:
+                self.latency.add(self._loop.time() - start)
+            self._wakeup()
+
+    def shutdown(self, *args, **kwargs):
+        '''Shutdown the pool, when not the event loop default executor.
+
+        Calls submitted after shutdown raise :class:`RuntimeError`.
+        '''
+        self.closed = True
+        while self._waiters:
+            self._waiters.popleft().cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def info(self):
+        info = {'kind': self.kind,
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'reject': self.reject,
+                'pending': self.pending,
+                'waiting': len(self._waiters),
+                'completed': self.completed,
+                'rejected': self.rejected}
+        if self.latency is not None:
+            info['latency'] = self.latency.info()
+        return info
+
+    def _timed(self, func, args, kwargs):
+        start = self._loop.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.completed += 1
+            if self.latency is not None:
+                self.latency.add(self._loop.time() - start)
+
+    async def _wait(self):
+        waiter = create_future(self._loop)
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except Exception:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            else:
+                # woken up while cancelled, pass the slot on
+                self._wakeup()
+            raise
+
+    def _wakeup(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+
+def actor_executor(actor, name):
+    '''Create the :class:`ActorExecutor` ``name`` for ``actor``
+    '''
+    cfg = actor.cfg
+    params = dict(cfg.executors.get(name) or ())
+    kind = params.pop('kind', 'process' if name == 'cpu' else 'thread')
+    if kind not in EXECUTOR_KINDS:
+        raise ImproperlyConfigured('Executor kind must be one of %s' %
+                                   ', '.join(EXECUTOR_KINDS))
+    workers = params.pop('workers', None)
+    max_queue = params.pop('queue', cfg.executor_queue)
+    reject = params.pop('reject', cfg.executor_reject)
+    if params:
+        raise ImproperlyConfigured('Unknown options for executor %s: %s' %
+                                   (name, ', '.join(params)))
+    executor = None
+    if kind == 'process':
+        workers = workers or cfg.process_workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(workers)
+    elif name == 'io' and not workers:
+        # the event loop default executor
+        workers = cfg.thread_workers
+    else:
+        executor = ThreadPoolExecutor(workers or cfg.thread_workers)
+    latency = actor.metrics.histogram(
+        'pulsar_executor_seconds',
+        'Seconds between submission and completion of executor calls')
+    return ActorExecutor(name, actor._loop, executor, kind=kind,
+                         workers=workers, max_queue=max_queue,
+                         reject=reject, latency=latency.get(executor=name))
@@ -0,0 +1,144 @@
+import os
+import sys
+import asyncio
+import threading
+
+from pulsar.utils.config import Global, validate_pos_float
+from pulsar.utils.structures import Histogram
+
+
+ASYNCIO_PATH = os.path.dirname(asyncio.__file__)
+
+
+class LoopMonitorSetting(Global):
+    name = "loop_monitor"
+    flags = ["--loop-monitor"]
+    validator = validate_pos_float
+    type = float
+    default = 0
+    desc = """\
+        Interval in seconds for sampling the event loop lag of actors.
+
+        When positive, each actor measures how late its event loop runs a
+        callback scheduled every ``loop_monitor`` seconds and records
+        where the loop was blocked for longer than
+        :ref:`slow callback <setting-slow_callback>`. Percentiles are
+        available in the ``loop`` entry of the actor info. Zero (the
+        default) disables the monitor.
+        """
+
+
+class SlowCallbackSetting(Global):
+    name = "slow_callback"
+    flags = ["--slow-callback"]
+    validator = validate_pos_float
+    type = float
+    default = 0.1
+    desc = """\
+        Seconds after which a blocked event loop is reported by the
+        :ref:`loop monitor <setting-loop_monitor>`.
+        """
+
+
+class LoopMonitor:
+    '''Measure the scheduling lag of an event loop and find the code
+    blocking it.
+
+    A callback scheduled every :attr:`interval` seconds records by how
+    much it was late in the :attr:`lag` histogram. A daemon thread checks
+    that the callback keeps running: when the loop is blocked for more
+    than :attr:`threshold` seconds, it takes the source location of the
+    callback running in the loop thread, the outermost frame below the
+    asyncio frames running it. Both are cheap enough to keep running in
+    production.
+
+    :param lag: optional :class:`.Histogram` where to record the lag,
+        for example one obtained from the actor :class:`.Metrics`.
+
+    .. attribute:: slow_callbacks
+
+        Dictionary mapping source locations to the number of times and
+        the maximum number of seconds the loop was blocked there.
+    '''
+    _handle = None
+    _thread = None
+
+    def __init__(self, loop, interval, threshold=0.1, lag=None):
+        self._loop = loop
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = lag if lag is not None else Histogram()
+        self.slow_callbacks = {}
+        self._blocked = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        '''Start monitoring, must be called from the event loop thread'''
+        if self._handle is None:
+            self._tid = threading.get_ident()
+            self._schedule()
+            self._thread = threading.Thread(target=self._watch, daemon=True,
+                                            name='loop-monitor')
+            self._thread.start()
+        return self
+
+    def stop(self, *args, **kw):
+        '''Stop monitoring'''
+        self._stopped.set()
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+
+    def info(self):
+        slow = [{'location': location, 'count': count, 'max': max_time}
+                for location, (count, max_time)
+                in self.slow_callbacks.items()]
+        slow.sort(key=lambda s: s['max'], reverse=True)
+        return {'interval': self.interval,
+                'lag': self.lag.info(),
+                'slow_callbacks': slow}
+
+    # INTERNALS
+    def _schedule(self):
+        self._expected = self._loop.time() + self.interval
+        self._handle = self._loop.call_at(self._expected, self._sample)
+
+    def _sample(self):
+        lag = max(self._loop.time() - self._expected, 0)
+        self.lag.add(lag)
+        blocked, self._blocked = self._blocked, None
+        if lag > self.threshold:
+            location = blocked or 'unknown'
+            count, max_time = self.slow_callbacks.get(location, (0, 0))
+            self.slow_callbacks[location] = (count + 1, max(max_time, lag))
+        self._schedule()
+
+    def _watch(self):
+        # runs in the monitor thread
+        expected = None
+        while not self._stopped.wait(self.threshold):
+            if self._loop.is_closed():
+                break
+            if self._blocked is None and expected == self._expected:
+                late = self._loop.time() - expected
+                if late > self.threshold:
+                    self._blocked = self._location()
+            expected = self._expected
+
+    def _location(self):
+        frame = sys._current_frames().get(self._tid)
+        if frame is not None:
+            # walk up to the callback or coroutine run by asyncio, the
+            # innermost frame is often a library call or time.sleep
+            innermost = callback = frame
+            while frame is not None:
+                if frame.f_code.co_filename.startswith(ASYNCIO_PATH):
+                    break
+                callback = frame
+                frame = frame.f_back
+            else:
+                # no asyncio frames, for example with uvloop
+                callback = innermost
+            code = callback.f_code
+            return '%s:%d in %s' % (code.co_filename, callback.f_lineno,
+                                    code.co_name)
@@ -25,10 +25,26 @@ The implementation details are outlined below:
   as a proxy server by routing the message to the targeted actor.
 * Communication is bidirectional and there is **only one connection** between
   the arbiter and any given actor.
-* Messages are encoded and decoded using the unmasked websocket protocol
-  implemented in :func:`.frame_parser`.
+* Connections use TCP on the loopback interface or unix domain sockets,
+  depending on the :ref:`mailbox transport <setting-mailbox_transport>`.
+* Messages are framed using the unmasked websocket protocol
+  implemented in :func:`.frame_parser`. The body of each frame is encoded
+  by the :ref:`mailbox codec <setting-mailbox_codec>`.
+* All messages written to a connection during one event loop iteration are
+  coalesced into a single transport write.
+* The number of requests waiting for a response on a connection is bounded
+  by the :ref:`mailbox window <setting-mailbox_window>`, further requests
+  wait for capacity. Supervision commands (:data:`PRIORITY_COMMANDS`)
+  bypass the window and are written ahead of other messages.
+* Incoming messages are dispatched as soon as they are decoded. Commands
+  returning a plain value, such as ``ping`` and ``notify``, are answered
+  without creating a :class:`~asyncio.Task`.
 * If, for some reasons, the connection between an actor and the arbiter
   get broken, the actor will eventually stop running and garbaged collected.
+* When the :ref:`direct mailbox <setting-direct_mailbox>` is enabled, each
+  actor serves its own :class:`.DirectMailbox` and messages between two
+  actors travel on a direct connection rather than being routed by the
+  arbiter. The arbiter is only asked once for the address of the target.
 
 
 Implementation
@@ -49,25 +65,52 @@ Client
   :members:
   :member-order: bysource
 
+Direct Mailbox
+~~~~~~~~~~~~~~~~
+
+.. autoclass:: DirectMailbox
+  :members:
+  :member-order: bysource
+
+Codecs
+~~~~~~~~~~~~
+
+.. autoclass:: PickleCodec
+  :members:
+  :member-order: bysource
+
+.. autoclass:: BinaryCodec
+  :members:
+  :member-order: bysource
+
 '''
+import os
 import socket
 import pickle
-from collections import namedtuple
+import tempfile
+from struct import Struct
+from collections import namedtuple, OrderedDict, deque
 
-from pulsar import ProtocolError, CommandError
+from pulsar import ProtocolError, CommandError, HAS_C_EXTENSIONS
+from pulsar.utils.config import Global, validate_bool, validate_pos_int
 from pulsar.utils.internet import nice_address
 from pulsar.utils.websocket import frame_parser
 from pulsar.utils.string import gen_unique_id
 
 from .access import get_actor, isawaitable, create_future, ensure_future
 from .futures import task
-from .proxy import actor_identity, get_proxy, get_command, ActorProxy
-from .protocols import Protocol
+from .proxy import (actor_identity, get_proxy, get_command, ActorProxy,
+                    global_commands_table)
+from .protocols import Protocol, TcpServer
 from .clients import AbstractClient
 
 
 CommandRequest = namedtuple('CommandRequest', 'actor caller connection')
 
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+# Supervision commands which bypass the flow control of a mailbox
+PRIORITY_COMMANDS = frozenset(('notify', 'stop', 'kill_actor'))
+
 
 def create_aid():
     return gen_unique_id()[:8]
@@ -144,38 +187,321 @@ class Message:
         return cls(data)
 
 
+class PickleCodec:
+    """Encode and decode mailbox messages with :mod:`pickle`.
+    """
+    def encode(self, data):
+        return pickle.dumps(data, protocol=PICKLE_PROTOCOL)
+
+    def decode(self, body):
+        return pickle.loads(body)
+
+
+class BinaryCodec(PickleCodec):
+    """Compact binary encoding of mailbox messages.
+
+    The envelopes of command and callback messages are encoded as null
+    separated strings. Command arguments are pickled only when present
+    and callback results are pickled only when they are not ``None``,
+    booleans, numbers, strings or bytes.
+    Any other message falls back to :class:`PickleCodec`.
+    """
+    PICKLE = 0
+    COMMAND = 1
+    CALLBACK = 2
+    COMMAND_KEYS = frozenset(('command', 'sender', 'target', 'args',
+                              'kwargs', 'ack'))
+    CALLBACK_KEYS = frozenset(('command', 'result', 'ack'))
+    int64 = Struct('!q')
+    double = Struct('!d')
+
+    def encode(self, data):
+        try:
+            if data.get('command') == 'callback':
+                body = self._encode_callback(data)
+            else:
+                body = self._encode_command(data)
+        except (TypeError, KeyError, UnicodeError):
+            body = None
+        if body is None:
+            body = b'\x00' + super().encode(data)
+        return body
+
+    def decode(self, body):
+        kind = body[0]
+        if kind == self.COMMAND:
+            return self._decode_command(body)
+        elif kind == self.CALLBACK:
+            return self._decode_callback(body)
+        elif kind == self.PICKLE:
+            return super().decode(body[1:])
+        raise ProtocolError('Unknown mailbox message type %s' % kind)
+
+    # INTERNALS
+    def _encode_command(self, data):
+        if not self.COMMAND_KEYS.issuperset(data):
+            return
+        values = (data['command'], data['sender'], data['target'],
+                  data.get('ack') or '')
+        for value in values:
+            if type(value) is not str or '\0' in value:
+                return
+        body = ('\x01%s\0%s\0%s\0%s\0' % values).encode('utf-8')
+        args, kwargs = data['args'], data['kwargs']
+        if args or kwargs:
+            body += pickle.dumps((args, kwargs), protocol=PICKLE_PROTOCOL)
+        return body
+
+    def _decode_command(self, body):
+        command, sender, target, ack, payload = body[1:].split(b'\0', 4)
+        data = {'command': command.decode('utf-8'),
+                'sender': sender.decode('utf-8'),
+                'target': target.decode('utf-8')}
+        if ack:
+            data['ack'] = ack.decode('utf-8')
+        if payload:
+            data['args'], data['kwargs'] = pickle.loads(payload)
+        else:
+            data['args'], data['kwargs'] = (), {}
+        return data
+
+    def _encode_callback(self, data):
+        if not self.CALLBACK_KEYS.issuperset(data):
+            return
+        ack, result = data['ack'], data.get('result')
+        if type(ack) is not str or '\0' in ack:
+            return
+        kind = type(result)
+        if kind is str:
+            return ('\x02%s\0s%s' % (ack, result)).encode('utf-8')
+        head = ('\x02%s\0' % ack).encode('utf-8')
+        if result is None:
+            return head + b'N'
+        elif result is True:
+            return head + b'T'
+        elif result is False:
+            return head + b'F'
+        elif kind is bytes:
+            return head + b'b' + result
+        elif kind is float:
+            return head + b'd' + self.double.pack(result)
+        elif kind is int and -2**63 <= result < 2**63:
+            return head + b'i' + self.int64.pack(result)
+        else:
+            return head + b'p' + pickle.dumps(result,
+                                              protocol=PICKLE_PROTOCOL)
+
+    def _decode_callback(self, body):
+        ack, value = body[1:].split(b'\0', 1)
+        tag, value = value[:1], value[1:]
+        if tag == b's':
+            result = value.decode('utf-8')
+        elif tag == b'N':
+            result = None
+        elif tag == b'T':
+            result = True
+        elif tag == b'F':
+            result = False
+        elif tag == b'b':
+            result = value
+        elif tag == b'd':
+            result = self.double.unpack(value)[0]
+        elif tag == b'i':
+            result = self.int64.unpack(value)[0]
+        elif tag == b'p':
+            result = pickle.loads(value)
+        else:
+            raise ProtocolError('Unknown mailbox result type %s' % tag)
+        return {'command': 'callback', 'result': result,
+                'ack': ack.decode('utf-8')}
+
+
+MAILBOX_CODECS = OrderedDict((('pickle', PickleCodec),
+                              ('binary', BinaryCodec)))
+
+
+class MailboxCodecSetting(Global):
+    name = "mailbox_codec"
+    flags = ["--mailbox-codec"]
+    choices = tuple(MAILBOX_CODECS)
+    default = tuple(MAILBOX_CODECS)[0]
+    desc = """\
+        Codec for encoding messages between actors.
+
+        ``pickle`` (the default) is the fastest to encode and decode.
+        ``binary`` encodes the envelopes of commands and callbacks in a
+        compact format, three to four times smaller than ``pickle``, and
+        falls back to ``pickle`` for anything else.
+        """
+
+
+class DirectMailboxSetting(Global):
+    name = "direct_mailbox"
+    flags = ["--direct-mailbox"]
+    validator = validate_bool
+    action = "store_true"
+    default = False
+    desc = """\
+        Send messages between actors via direct connections.
+
+        Each actor serves its own mailbox and messages to other actors
+        bypass the arbiter, which is only used to discover the address
+        of the target the first time a message is sent to it.
+        """
+
+
+class MailboxTransportSetting(Global):
+    name = "mailbox_transport"
+    flags = ["--mailbox-transport"]
+    choices = ('tcp', 'unix')
+    default = 'tcp'
+    desc = """\
+        Transport for connections between actors.
+
+        ``tcp`` (the default) uses the loopback interface.
+        ``unix`` uses unix domain sockets in the temporary directory and
+        avoids the TCP stack. It is only available on platforms
+        supporting unix sockets, elsewhere ``tcp`` is used.
+        """
+
+
+class MailboxWindowSetting(Global):
+    name = "mailbox_window"
+    flags = ["--mailbox-window"]
+    validator = validate_pos_int
+    type = int
+    default = 512
+    desc = """\
+        Maximum number of requests waiting for a response on a mailbox
+        connection.
+
+        Once the window is full, new requests wait for a response to
+        arrive before being sent. Supervision commands are never delayed.
+        Set to 0 for no limit.
+        """
+
+
+def mailbox_codec(cfg=None):
+    """Return a new mailbox codec instance for the config ``cfg``
+    """
+    name = cfg.mailbox_codec if cfg else None
+    return MAILBOX_CODECS.get(name or MailboxCodecSetting.default)()
+
+
+def mailbox_server_address(actor):
+    """Return the address of a mailbox server for ``actor``
+    """
+    if (actor.cfg.mailbox_transport == 'unix' and
+            hasattr(socket, 'AF_UNIX')):
+        name = 'pulsar-%s-%s.sock' % (os.getpid(), actor.aid)
+        return os.path.join(tempfile.gettempdir(), name)
+    return ('127.0.0.1', 0)
+
+
 class MailboxProtocol(Protocol):
     '''The :class:`.Protocol` for internal message passing between actors.
 
-    Encoding and decoding uses the unmasked websocket protocol.
+    Framing uses the unmasked websocket protocol while message bodies are
+    encoded by the :attr:`codec`.
+
+    Requests are subject to flow control: at most :attr:`window` requests
+    wait for a response at any time, others are queued in order of
+    arrival.
     '''
+    _outbox = None
+    # number of priority frames at the head of the outbox
+    _priority = 0
+    # number of queued requests allowed to be sent
+    _released = 0
+    # identity of the last sender, with the number of actors removed at
+    # the time, and its proxy
+    _sender = None
+    _caller = None
+
     def __init__(self, **kw):
         super().__init__(**kw)
         self._pending_responses = {}
-        self._parser = frame_parser(kind=2, pyparser=True)
+        self._waiting = deque()
+        self._parser = frame_parser(kind=2, pyparser=not HAS_C_EXTENSIONS)
         actor = get_actor()
+        self.codec = mailbox_codec(actor.cfg)
+        self.window = actor.cfg.mailbox_window
         if actor.is_arbiter():
             self.bind_event('connection_lost', self._connection_lost)
 
     def request(self, command, sender, target, args, kwargs):
         '''Used by the server to send messages to the client.'''
         req = Message.command(command, sender, target, args, kwargs)
-        self._start(req)
-        return req.waiter
+        return self._send(req)
+
+    def info(self):
+        '''Flow control information for this connection'''
+        return {'window': self.window,
+                'in_flight': len(self._pending_responses),
+                'queued': len(self._waiting),
+                'outbox': len(self._outbox or ())}
 
     def data_received(self, data):
         # Feed data into the parser
         msg = self._parser.decode(data)
         while msg:
             try:
-                message = pickle.loads(msg.body)
+                message = self.codec.decode(msg.body)
             except Exception as e:
                 raise ProtocolError('Could not decode message body: %s' % e)
-            ensure_future(self._on_message(message), loop=self._loop)
+            self._on_message(message)
             msg = self._parser.decode()
 
+    def close(self):
+        self._flush()
+        return super().close()
+
     ########################################################################
     #    INTERNALS
+    def _send(self, req):
+        # Send a request and return the waiter for its response
+        window = self.window
+        if window and req.data['command'] not in PRIORITY_COMMANDS and (
+                self._waiting or
+                len(self._pending_responses) + self._released >= window):
+            waiter = create_future(self._loop)
+            self._waiting.append(waiter)
+            return ensure_future(self._send_later(req, waiter),
+                                 loop=self._loop)
+        self._start(req)
+        return req.waiter
+
+    async def _send_later(self, req, waiter):
+        try:
+            await waiter
+        finally:
+            if (waiter.done() and not waiter.cancelled() and
+                    waiter.exception() is None):
+                self._released -= 1
+        self._start(req)
+        return await req.waiter
+
+    def _release(self):
+        # A response has arrived, wake up the next queued request
+        waiting = self._waiting
+        while waiting and (len(self._pending_responses) + self._released <
+                           self.window):
+            waiter = waiting.popleft()
+            if not waiter.done():
+                self._released += 1
+                waiter.set_result(None)
+
+    def _fail_pending(self, exc):
+        pending = self._pending_responses
+        while pending:
+            _, waiter = pending.popitem()
+            if not waiter.done():
+                waiter.set_exception(exc)
+        while self._waiting:
+            waiter = self._waiting.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc)
+
     def _start(self, req):
         if req.waiter and 'ack' in req.data:
             self._pending_responses[req.data['ack']] = req.waiter
@@ -192,58 +518,104 @@ class MailboxProtocol(Protocol):
             if actor.is_running():
                 actor.logger.warning('Connection lost with actor')
 
-    async def _on_message(self, message):
-        actor = get_actor()
+    def _on_message(self, message):
         command = message.get('command')
         ack = message.get('ack')
         if command == 'callback':
-            if not ack:
-                raise ProtocolError('A callback without id')
-            try:
-                pending = self._pending_responses.pop(ack)
-            except KeyError:
-                raise KeyError('Callback %s not in pending callbacks' % ack)
+            pending = self._pending_responses.pop(ack, None)
+            if pending is None:
+                self.logger.warning('Callback %s not in pending callbacks',
+                                    ack)
+                return
             pending.set_result(message.get('result'))
+            if self._waiting:
+                self._release()
         else:
             try:
-                target = actor.get_actor(message['target'])
-                if target is None:
-                    raise CommandError('cannot execute "%s", unknown actor '
-                                       '"%s"' % (command, message['target']))
-                # Get the caller proxy without throwing
-                caller = get_proxy(actor.get_actor(message['sender']),
-                                   safe=True)
-                if isinstance(target, ActorProxy):
-                    # route the message to the actor proxy
-                    if caller is None:
-                        raise CommandError(
-                            "'%s' got message from unknown '%s'"
-                            % (actor, message['sender']))
-                    result = await actor.send(target, command,
-                                              *message['args'],
-                                              **message['kwargs'])
-                else:
-                    result = await command_in_context(command, caller, target,
-                                                      message['args'],
-                                                      message['kwargs'],
-                                                      self)
+                result = self._dispatch(command, message)
             except CommandError as exc:
                 self.logger.warning('Command error: %s' % exc)
                 result = None
-            except Exception as exc:
+            except Exception:
                 self.logger.exception('Unhandled exception')
                 result = None
-            if ack:
+            if isawaitable(result):
+                ensure_future(self._reply(result, ack), loop=self._loop)
+            elif ack:
                 self._start(Message.callback(result, ack))
 
+    def _dispatch(self, command, message):
+        # Execute a command or route it to the target actor. Return the
+        # result or an awaitable
+        actor = get_actor()
+        target = actor.get_actor(message['target'])
+        if target is None:
+            raise CommandError('cannot execute "%s", unknown actor '
+                               '"%s"' % (command, message['target']))
+        caller = self._get_caller(actor, message['sender'])
+        if isinstance(target, ActorProxy):
+            # route the message to the actor proxy
+            if caller is None:
+                raise CommandError("'%s' got message from unknown '%s'"
+                                   % (actor, message['sender']))
+            return actor.send(target, command, *message['args'],
+                              **message['kwargs'])
+        cmnd = global_commands_table.get(command)
+        if not cmnd:
+            raise CommandError('unknown %s' % command)
+        request = CommandRequest(target, caller, self)
+        return cmnd(request, message['args'], message['kwargs'])
+
+    def _get_caller(self, actor, sender):
+        # Get the caller proxy without throwing. Messages on a connection
+        # usually come from the same actor, keep its proxy until an actor
+        # is removed
+        key = (sender, actor.removed_actors)
+        if key == self._sender:
+            return self._caller
+        caller = get_proxy(actor.get_actor(sender), safe=True)
+        if caller is not None:
+            self._sender, self._caller = key, caller
+        return caller
+
+    async def _reply(self, result, ack):
+        try:
+            result = await result
+        except CommandError as exc:
+            self.logger.warning('Command error: %s' % exc)
+            result = None
+        except Exception:
+            self.logger.exception('Unhandled exception')
+            result = None
+        if ack:
+            self._start(Message.callback(result, ack))
+
     def _write(self, req):
-        obj = pickle.dumps(req.data, protocol=2)
+        if not self._transport:
+            raise ConnectionResetError('No Transport')
+        obj = self.codec.encode(req.data)
         data = self._parser.encode(obj, opcode=2)
+        if self._outbox is None:
+            # coalesce all frames written during this loop iteration
+            self._outbox = []
+            self._loop.call_soon(self._flush)
+        if req.data['command'] in PRIORITY_COMMANDS:
+            self._outbox.insert(self._priority, data)
+            self._priority += 1
+        else:
+            self._outbox.append(data)
+
+    def _flush(self):
+        outbox, self._outbox = self._outbox, None
+        self._priority = 0
+        if not outbox:
+            return
         try:
-            self._transport.write(data)
+            self._transport.write(b''.join(outbox))
         except (socket.error, RuntimeError):
             actor = get_actor()
-            if actor.is_running() and not actor.is_arbiter():
+            if (actor.is_running() and not actor.is_arbiter() and
+                    getattr(actor.mailbox, '_connection', None) is self):
                 actor.logger.warning('Lost connection with arbiter')
                 actor._loop.stop()
 
@@ -272,9 +644,14 @@ class MailboxClient(AbstractClient):
             self._connection = await self.connect()
             self._connection.bind_event('connection_lost', self._lost)
         req = Message.command(command, sender, target, args, kwargs)
-        self._connection._start(req)
-        response = await req.waiter
-        return response
+        return await self._connection._send(req)
+
+    def info(self):
+        '''Flow control information for the connection with the arbiter
+        '''
+        if self._connection:
+            return self._connection.info()
+        return {}
 
     def close(self):
         if self._connection:
@@ -287,3 +664,97 @@ class MailboxClient(AbstractClient):
         # When the connection is lost, stop the event loop
         if self._loop.is_running():
             self._loop.stop()
+
+
+class DirectMailboxClient(MailboxClient):
+    """A :class:`.MailboxClient` connected to the :class:`.DirectMailbox`
+    of another actor.
+    """
+    def __init__(self, address, actor, loop, mailbox):
+        super().__init__(address, actor, loop)
+        self.mailbox = mailbox
+
+    def _lost(self, connection, exc=None):
+        # The remote actor has gone, fail pending requests and
+        # discover the address again on the next request
+        self.mailbox.discard(self)
+        connection._fail_pending(CommandError('Connection lost with %s' %
+                                              nice_address(self.address)))
+
+
+class DirectMailbox:
+    """Serve the mailbox of an actor and keep direct connections
+    with the mailbox of other actors.
+
+    Used when the :ref:`direct mailbox <setting-direct_mailbox>` is
+    enabled. The address of a target actor is obtained from the
+    arbiter and cached once known. Targets without a direct mailbox,
+    such as the arbiter and monitors, are reached via the
+    :attr:`.Actor.mailbox`.
+    """
+    def __init__(self, actor, loop):
+        self.actor = actor
+        self.server = TcpServer(MailboxProtocol, loop,
+                                mailbox_server_address(actor),
+                                name='direct-mailbox')
+        self.clients = {}
+        self._loop = loop
+
+    def __repr__(self):
+        return 'Direct mailbox %s' % nice_address(self.address)
+
+    @property
+    def address(self):
+        return self.server.address
+
+    def start_serving(self):
+        return self.server.start_serving()
+
+    @task
+    async def request(self, command, sender, target, args, kwargs):
+        aid = actor_identity(target)
+        client = self.clients.get(aid)
+        if client is None and not self._via_arbiter(aid):
+            address = await self.actor.mailbox.request(
+                'mailbox_address', sender, 'arbiter', (aid,), {})
+            # only cache clients, the address of actors not yet known
+            # by the arbiter is requested again on the next message
+            if address:
+                if not isinstance(address, str):
+                    address = tuple(address)
+                # the address may have been obtained by a concurrent request
+                client = self.clients.get(aid)
+                if client is None:
+                    client = DirectMailboxClient(address, sender,
+                                                 self._loop, self)
+                    self.clients[aid] = client
+        if client is None:
+            return await self.actor.mailbox.request(command, sender, target,
+                                                    args, kwargs)
+        try:
+            return await client.request(command, sender, target, args,
+                                        kwargs)
+        except ConnectionError:
+            self.discard(client)
+            raise
+
+    def discard(self, client):
+        for aid, c in tuple(self.clients.items()):
+            if c is client:
+                self.clients.pop(aid)
+
+    def _via_arbiter(self, aid):
+        # the arbiter and monitors never serve a direct mailbox
+        monitor = self.actor.monitor
+        return aid == 'arbiter' or (monitor is not None and
+                                    aid == monitor.aid)
+
+    def close(self):
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for client in clients:
+            client.close()
+        if self._loop.is_running():
+            return ensure_future(self.server.close(), loop=self._loop)
+        else:
+            self._loop.run_until_complete(self.server.close())
@@ -1,4 +1,5 @@
 from .access import create_future
+from .consts import IDLE_TIMEOUT_RESOLUTION
 
 
 class FlowControl:
@@ -68,11 +69,98 @@ class FlowControl:
             self._write_waiter = waiter
 
 
+class IdleTimeouts:
+    """A hashed timing wheel closing idle :class:`.Timeout` protocols.
+
+    Protocols are hashed into buckets ``resolution`` seconds wide according
+    to the time at which they become idle. Activity on a protocol only
+    updates its ``_last_activity`` timestamp, no loop timer is created or
+    cancelled. A single periodic sweep closes idle protocols in the expired
+    buckets and re-hashes the ones which have been active in the meantime.
+    """
+    def __init__(self, loop, resolution=IDLE_TIMEOUT_RESOLUTION):
+        self._loop = loop
+        self._resolution = resolution
+        self._buckets = {}
+        self._slots = {}
+        self._sweeper = None
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, protocol):
+        return protocol in self._slots
+
+    @property
+    def resolution(self):
+        return self._resolution
+
+    def add(self, protocol):
+        """Add ``protocol`` to the wheel (or re-hash it if already there)
+        """
+        self._add(protocol, protocol._last_activity + protocol._timeout)
+
+    def discard(self, protocol):
+        """Remove ``protocol`` from the wheel
+        """
+        slot = self._slots.pop(protocol, None)
+        if slot is not None:
+            bucket = self._buckets[slot]
+            bucket.discard(protocol)
+            if not bucket:
+                self._buckets.pop(slot)
+
+    def close(self):
+        """Remove all protocols and stop sweeping
+        """
+        if self._sweeper:
+            self._sweeper.cancel()
+            self._sweeper = None
+        self._buckets.clear()
+        self._slots.clear()
+
+    # INTERNALS
+    def _add(self, protocol, deadline):
+        self.discard(protocol)
+        # round up so that a bucket is never swept before its deadlines
+        slot = int(deadline / self._resolution) + 1
+        bucket = self._buckets.get(slot)
+        if bucket is None:
+            self._buckets[slot] = bucket = set()
+        bucket.add(protocol)
+        self._slots[protocol] = slot
+        if self._sweeper is None:
+            self._sweeper = self._loop.call_later(self._resolution,
+                                                  self._sweep)
+
+    def _sweep(self):
+        self._sweeper = None
+        now = self._loop.time()
+        current = int(now / self._resolution)
+        for slot in [s for s in self._buckets if s <= current]:
+            for protocol in self._buckets.pop(slot):
+                self._slots.pop(protocol, None)
+                if not protocol._timeout or protocol.closed:
+                    continue
+                deadline = protocol._last_activity + protocol._timeout
+                if deadline <= now:
+                    protocol._timed_out()
+                else:
+                    self._add(protocol, deadline)
+        if self._buckets and self._sweeper is None:
+            self._sweeper = self._loop.call_later(self._resolution,
+                                                  self._sweep)
+
+
 class Timeout:
     '''Adds a timeout for idle connections to protocols
+
+    The protocol records the time of its last read or write and delegates
+    the closing of idle connections to the :class:`IdleTimeouts` wheel of
+    its producer.
     '''
     _timeout = None
-    _timeout_handler = None
+    _last_activity = 0
 
     @property
     def timeout(self):
@@ -85,10 +173,8 @@ class Timeout:
         if self._timeout is None:
             self.bind_event('connection_made', self._add_timeout)
             self.bind_event('connection_lost', self._cancel_timeout)
-            self.bind_event('before_write', self._cancel_timeout)
-            self.bind_event('after_write', self._add_timeout)
-            self.bind_event('data_received', self._cancel_timeout)
-            self.bind_event('data_processed', self._add_timeout)
+            self.bind_event('data_received', self._touch)
+            self.bind_event('after_write', self._touch)
         self._timeout = timeout or 0
         self._add_timeout(None)
 
@@ -97,14 +183,18 @@ class Timeout:
         self.close()
         self.logger.debug('Closed idle %s.', self)
 
+    def _touch(self, _, exc=None, **kw):
+        self._last_activity = self._loop.time()
+
     def _add_timeout(self, _, exc=None, **kw):
-        if not self.closed:
-            self._cancel_timeout(_, exc=exc)
+        if not self.closed and self._producer:
+            self._last_activity = self._loop.time()
             if self._timeout and not exc:
-                self._timeout_handler = self._loop.call_later(self._timeout,
-                                                              self._timed_out)
+                self._producer.idle_timeouts.add(self)
+            else:
+                self._cancel_timeout(_, exc=exc)
 
     def _cancel_timeout(self, _, exc=None, **kw):
-        if self._timeout_handler:
-            self._timeout_handler.cancel()
-            self._timeout_handler = None
+        producer = self._producer
+        if producer and producer._idle_timeouts is not None:
+            producer._idle_timeouts.discard(self)
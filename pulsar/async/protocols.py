@@ -1,10 +1,11 @@
+import os
 import asyncio
 
 from pulsar.utils.internet import nice_address, format_address
 
 from .futures import task, Future, ensure_future
 from .events import EventHandler, AbortEvent
-from .mixins import FlowControl, Timeout
+from .mixins import FlowControl, Timeout, IdleTimeouts
 
 
 __all__ = ['ProtocolConsumer',
@@ -63,6 +64,9 @@ class ProtocolConsumer(EventHandler):
     """
     _connection = None
     _data_received_count = 0
+    trace = None
+    """The :class:`.RequestTrace` of this consumer, when the
+    :ref:`requests are traced <setting-trace_requests>`."""
     ONE_TIME_EVENTS = ('pre_request', 'post_request')
     MANY_TIMES_EVENTS = ('data_received', 'data_processed')
 
@@ -193,6 +197,8 @@ class ProtocolConsumer(EventHandler):
         """Fire the ``post_request`` event if it wasn't already fired.
         """
         if not self.done():
+            if self.trace is not None:
+                self.trace.finish()
             return self.fire_event('post_request', *arg, **kw)
 
     def done(self):
@@ -205,6 +211,8 @@ class ProtocolConsumer(EventHandler):
         """
         c = self._connection
         if c:
+            if self.trace is not None:
+                self.trace.mark('first_write')
             return c.write(data)
         else:
             raise RuntimeError('No connection')
@@ -226,11 +234,14 @@ class ProtocolConsumer(EventHandler):
         # the high level data_received method which must be implemented
         # by subclasses
         if not hasattr(self, '_request'):
+            if self.trace is not None:
+                self.trace.mark('first_byte')
             self.start()
         self._data_received_count += 1
-        self.fire_event('data_received', data=data)
+        events = self._events
+        events['data_received'].fire(self, data=data)
         result = self.data_received(data)
-        self.fire_event('data_processed', data=data)
+        events['data_processed'].fire(self, data=data)
         return result
 
     def _finished(self, _, exc=None):
@@ -400,8 +411,21 @@ class PulsarProtocol(EventHandler, FlowControl):
 
 class Protocol(PulsarProtocol, asyncio.Protocol):
     """An :class:`asyncio.Protocol` with :ref:`events <event-handling>`
+
+    .. attribute:: cork
+
+        When ``True`` the data passed to :meth:`write` during an iteration
+        of the event loop is gathered and written to the transport in one
+        call by :meth:`uncork`. This reduces the number of system calls
+        when many small chunks are written, for example when replying to
+        pipelined requests.
     """
     _data_received_count = 0
+    _corked = None
+
+    def __init__(self, *args, cork=False, **kw):
+        super().__init__(*args, **kw)
+        self.cork = cork
 
     def write(self, data):
         """Write ``data`` into the wire.
@@ -411,22 +435,74 @@ class Protocol(PulsarProtocol, asyncio.Protocol):
         """
         t = self._transport
         if t:
-            if self._paused:
-                # # Uses private variable once again!
-                # This occurs when the protocol is paused from writing
-                # but another data ready callback is fired in the same
-                # event-loop frame
-                self.logger.debug('protocol cannot write, add data to the '
-                                  'transport buffer')
-                t._buffer.extend(data)
+            if self.cork and not t.is_closing():
+                corked = self._corked
+                if corked is None:
+                    self._corked = corked = []
+                    self._loop.call_soon(self.uncork)
+                # copy mutable buffers, they may change before uncork
+                corked.append(data if isinstance(data, bytes) else
+                              bytes(data))
             else:
-                self.fire_event('before_write')
-                t.write(data)
-                self.fire_event('after_write')
+                self._transport_write(data)
             return self._write_waiter
         else:
             raise ConnectionResetError('No Transport')
 
+    def uncork(self):
+        """Write the data gathered while :attr:`cork` is ``True``.
+
+        Called at the next iteration of the event loop after the first
+        :meth:`write`, it can be called explicitly to flush earlier.
+        """
+        corked, self._corked = self._corked, None
+        t = self._transport
+        if corked and t and not t.is_closing():
+            self._transport_write(corked, True)
+
+    def close(self):
+        self.uncork()
+        return super().close()
+
+    async def flush(self):
+        """Write the corked data and wait until the transport write buffer
+        is empty.
+
+        Used before writing to the transport socket directly, for example
+        with :func:`os.sendfile`.
+        """
+        self.uncork()
+        t = self._transport
+        if t and t.get_write_buffer_size():
+            # pause writing until the buffer is fully drained
+            t.set_write_buffer_limits(0)
+            try:
+                if self._paused and self._write_waiter is None:
+                    self._make_write_waiter(self)
+                if self._write_waiter is not None:
+                    await self._write_waiter
+            finally:
+                self._set_flow_limits(self)
+
+    def _transport_write(self, data, lines=False):
+        t = self._transport
+        if self._paused:
+            # # Uses private variable once again!
+            # This occurs when the protocol is paused from writing
+            # but another data ready callback is fired in the same
+            # event-loop frame
+            self.logger.debug('protocol cannot write, add data to the '
+                              'transport buffer')
+            t._buffer.extend(b''.join(data) if lines else data)
+        else:
+            events = self._events
+            events['before_write'].fire(self)
+            if lines:
+                t.writelines(data)
+            else:
+                t.write(data)
+            events['after_write'].fire(self)
+
 
 class DatagramProtocol(PulsarProtocol, asyncio.DatagramProtocol):
     """An ``asyncio.DatagramProtocol`` with events`
@@ -481,14 +557,18 @@ class Connection(Protocol, Timeout):
         :attr:`~Protocol.timeout` is a positive number (of seconds).
         """
         self._data_received_count = self._data_received_count + 1
-        self.fire_event('data_received', data=data)
+        events = self._events
+        events['data_received'].fire(self, data=data)
         toprocess = data
         while toprocess:
             consumer = self.current_consumer()
             toprocess = consumer._data_received(toprocess)
             if isinstance(toprocess, Future):
                 break
-        self.fire_event('data_processed', data=data)
+        if self._corked:
+            # replies to all the requests in data go out together
+            self.uncork()
+        events['data_processed'].fire(self, data=data)
 
     def upgrade(self, consumer_factory):
         """Upgrade the :func:`_consumer_factory` callable.
@@ -518,6 +598,7 @@ class Connection(Protocol, Timeout):
         c['request_processed'] = self._processed
         c['data_processed_count'] = self._data_received_count
         c['timeout'] = self.timeout
+        c['events'] = self.events_fired()
         return info
 
     def _build_consumer(self, _, exc=None):
@@ -526,6 +607,8 @@ class Connection(Protocol, Timeout):
             assert self._current_consumer is None, 'Consumer is not None'
             self._current_consumer = consumer
             consumer._connection = self
+            if self._producer.tracer is not None:
+                consumer.trace = self._producer.tracer.trace(consumer)
             consumer.connection_made(self)
 
     def _connection_lost(self, _, exc=None):
@@ -552,6 +635,9 @@ class Producer(EventHandler):
 
         protocol_factory(session, producer, **params)
     """
+    tracer = None
+    """Optional :class:`.Tracer` of the consumers of this producer."""
+    _idle_timeouts = None
 
     def __init__(self, loop=None, protocol_factory=None, name=None,
                  max_requests=None, logger=None):
@@ -575,6 +661,16 @@ class Producer(EventHandler):
         """
         return self._requests_processed
 
+    @property
+    def idle_timeouts(self):
+        """The :class:`.IdleTimeouts` wheel closing idle connections.
+
+        Shared by all the protocols created by this :class:`Producer`.
+        """
+        if self._idle_timeouts is None:
+            self._idle_timeouts = IdleTimeouts(self._loop)
+        return self._idle_timeouts
+
     def create_protocol(self, **kw):
         """Create a new protocol via the :meth:`protocol_factory`
 
@@ -610,21 +706,44 @@ class TcpServer(Producer):
         A :class:`.Server` managed by this Tcp wrapper.
 
         Available once the :meth:`start_serving` method has returned.
+
+    When ``address`` is a string, the server listens on a unix domain
+    socket at that path, which is removed when the server closes.
+    When ``reuse_port`` is ``True`` a TCP ``address`` is bound with the
+    ``SO_REUSEPORT`` option, so that several processes can listen on it.
+    When ``cork`` is ``True`` the :attr:`~.Protocol.cork` attribute of
+    the connections is set.
+
+    .. attribute:: drain_timeout
+
+        Seconds :meth:`close` waits for the requests in progress to
+        finish before closing their connections. Idle connections are
+        closed at once. Zero (the default) closes all connections at once.
+
+    When a ``tracer`` is given, the lifecycle of the consumers of the
+    connections is recorded by the :class:`.Tracer`.
     """
     ONE_TIME_EVENTS = ('start', 'stop')
     MANY_TIMES_EVENTS = ('connection_made', 'pre_request', 'post_request',
                          'connection_lost')
     _server = None
     _started = None
+    _unix_path = None
 
     def __init__(self, protocol_factory, loop, address=None,
                  name=None, sockets=None, max_requests=None,
-                 keep_alive=None, logger=None):
+                 keep_alive=None, logger=None, reuse_port=False,
+                 cork=False, drain_timeout=0, tracer=None):
         super().__init__(loop, protocol_factory, name=name,
                          max_requests=max_requests, logger=logger)
-        self._params = {'address': address, 'sockets': sockets}
+        self._params = {'address': address, 'sockets': sockets,
+                        'reuse_port': reuse_port}
         self._keep_alive = max(keep_alive or 0, 0)
+        self._cork = cork
+        self._drain_timeout = drain_timeout or 0
+        self.tracer = tracer
         self._concurrent_connections = set()
+        self._connection_events = {}
 
     def __repr__(self):
         address = self.address
@@ -634,6 +753,10 @@ class TcpServer(Producer):
             return self.__class__.__name__
     __str_ = __repr__
 
+    @property
+    def drain_timeout(self):
+        return self._drain_timeout
+
     @property
     def address(self):
         """Socket address of this server.
@@ -664,6 +787,7 @@ class TcpServer(Producer):
         if hasattr(self, '_params'):
             address = self._params['address']
             sockets = self._params['sockets']
+            reuse_port = self._params['reuse_port']
             del self._params
             create_server = self._loop.create_server
             if sockets:
@@ -683,7 +807,13 @@ class TcpServer(Producer):
                                                  host=address[0],
                                                  port=address[1],
                                                  backlog=backlog,
-                                                 ssl=sslcontext)
+                                                 ssl=sslcontext,
+                                                 reuse_port=reuse_port)
+                elif isinstance(address, str):
+                    server = await self._loop.create_unix_server(
+                        self.create_protocol, path=address, backlog=backlog,
+                        ssl=sslcontext)
+                    self._unix_path = address
                 else:
                     raise NotImplementedError
             self._server = server
@@ -700,9 +830,17 @@ class TcpServer(Producer):
         if self._server:
             self._server.close()
             self._server = None
+            if self._unix_path:
+                try:
+                    os.unlink(self._unix_path)
+                except FileNotFoundError:
+                    pass
+                self._unix_path = None
             coro = self._close_connections()
             if coro:
                 await coro
+            if self._idle_timeouts is not None:
+                self._idle_timeouts.close()
             self.fire_event('stop')
 
     def info(self):
@@ -720,12 +858,14 @@ class TcpServer(Producer):
                 sockets.append({
                     'address': format_address(sock.getsockname())})
         return {'server': server,
-                'clients': clients}
+                'clients': clients,
+                'events': dict(self._connection_events)}
 
     def create_protocol(self):
         """Override :meth:`Producer.create_protocol`.
         """
-        protocol = super().create_protocol(timeout=self._keep_alive)
+        protocol = super().create_protocol(timeout=self._keep_alive,
+                                           cork=self._cork)
         protocol.bind_event('connection_made', self._connection_made)
         protocol.bind_event('connection_lost', self._connection_lost)
         protocol.copy_many_times_events(self)
@@ -740,17 +880,28 @@ class TcpServer(Producer):
     def _connection_made(self, connection, exc=None):
         if not exc:
             self._concurrent_connections.add(connection)
+            if self.tracer is not None:
+                self.tracer.connection_made(connection)
 
     def _connection_lost(self, connection, exc=None):
         self._concurrent_connections.discard(connection)
+        # aggregate the events fired by closed connections
+        events = self._connection_events
+        for name, fired in connection.events_fired().items():
+            events[name] = events.get(name, 0) + fired
 
     def _close_connections(self, connection=None, timeout=5):
         """Close ``connection`` if specified, otherwise close all connections.
 
+        When closing all connections, connections with a request in
+        progress are closed once the request is done or after
+        :attr:`drain_timeout` seconds.
+
         Return a list of :class:`.Future` called back once the connection/s
         are closed.
         """
         all = []
+        draining = []
         if connection:
             all.append(connection.event('connection_lost'))
             connection.close()
@@ -759,11 +910,35 @@ class TcpServer(Producer):
             self._concurrent_connections = set()
             for connection in connections:
                 all.append(connection.event('connection_lost'))
-                connection.close()
-        if all:
+                consumer = getattr(connection, '_current_consumer', None)
+                if (self._drain_timeout and consumer is not None and
+                        hasattr(consumer, '_request') and
+                        not consumer.done()):
+                    draining.append(connection)
+                    consumer.on_finished.add_done_callback(
+                        lambda _, c=connection: c.close())
+                else:
+                    connection.close()
+        if draining:
+            return self._drain(draining, all, timeout)
+        elif all:
             self.logger.info('%s closing %d connections', self, len(all))
             return asyncio.wait(all, timeout=timeout, loop=self._loop)
 
+    async def _drain(self, draining, closed, timeout):
+        self.logger.info('%s closing %d connections, waiting for %d '
+                         'requests in progress', self, len(closed),
+                         len(draining))
+        await asyncio.wait(closed, timeout=self._drain_timeout,
+                           loop=self._loop)
+        draining = [c for c in draining if not c.closed]
+        if draining:
+            self.logger.warning('%s closing %d connections with requests '
+                                'in progress', self, len(draining))
+            for connection in draining:
+                connection.close()
+            await asyncio.wait(closed, timeout=timeout, loop=self._loop)
+
 
 class DatagramServer(Producer):
     """An :class:`.Producer` for serving UDP sockets.
@@ -217,4 +217,5 @@ class ActorProxyMonitor(ActorProxy):
             return False
         else:
             dt = default_timer() - self.stopping_start
-            return dt if dt >= ACTOR_ACTION_TIMEOUT else False
+            timeout = ACTOR_ACTION_TIMEOUT + self.cfg.drain_timeout
+            return dt if dt >= timeout else False
@@ -0,0 +1,141 @@
+import os
+from collections import deque
+from itertools import count
+
+from pulsar.utils.config import Global, validate_pos_int
+
+
+class TraceRequestsSetting(Global):
+    name = "trace_requests"
+    flags = ["--trace-requests"]
+    validator = validate_pos_int
+    type = int
+    default = 0
+    desc = """\
+        Number of most recent requests traced by each actor.
+
+        When positive, servers record when each request reaches the
+        stages of its lifecycle: connection made, first byte received,
+        headers parsed, application start and end, first byte written
+        and finished. Traces are obtained with the
+        :ref:`trace command <actor_trace_command>` in the Chrome
+        trace-event format. Zero (the default) disables tracing.
+        """
+
+
+# (span name, start marks, end mark), a span starts at the first
+# available start mark
+SPANS = (('request', ('connection_made', 'first_byte'), 'finished'),
+         ('receive', ('first_byte',), 'headers'),
+         ('app', ('app_start',), 'app_end'),
+         ('respond', ('first_write',), 'finished'))
+
+
+class RequestTrace:
+    '''The timestamps of the lifecycle stages of a
+    :class:`.ProtocolConsumer`.
+
+    .. attribute:: id
+
+        Unique request id, the process id and a counter.
+
+    .. attribute:: marks
+
+        Dictionary mapping stage names to the event loop time the
+        consumer first reached them.
+    '''
+    __slots__ = ('tracer', 'id', 'name', 'session', 'marks')
+
+    def __init__(self, tracer, id, name, session):
+        self.tracer = tracer
+        self.id = id
+        self.name = name
+        self.session = session
+        self.marks = {}
+
+    def __repr__(self):
+        return '%s %s' % (self.name, self.id)
+    __str__ = __repr__
+
+    def mark(self, name, when=None):
+        '''Record the time of stage ``name``, if not already recorded
+        '''
+        if name not in self.marks:
+            self.marks[name] = when or self.tracer._loop.time()
+
+    def finish(self):
+        # consumers of connections closed while idle are not requests
+        if 'first_byte' in self.marks:
+            self.mark('finished')
+            self.tracer.traces.append(self)
+
+    def trace_events(self, pid):
+        '''The Chrome trace events of this request
+        '''
+        marks = self.marks
+        events = []
+        for name, starts, end in SPANS:
+            start = next((marks[m] for m in starts if m in marks), None)
+            end = marks.get(end)
+            if start is None or end is None:
+                continue
+            event = {'name': name,
+                     'cat': self.name,
+                     'ph': 'X',
+                     'ts': _micro(start),
+                     'dur': _micro(end - start),
+                     'pid': pid,
+                     'tid': self.session,
+                     'args': {'request_id': self.id}}
+            if name == 'request':
+                event['args'].update(((mark, _micro(t - start))
+                                      for mark, t in marks.items()))
+            events.append(event)
+        return events
+
+
+class Tracer:
+    '''Keep the :class:`RequestTrace` of the last :attr:`size` requests
+    finished by the servers of an actor.
+
+    .. attribute:: traces
+
+        A :class:`~collections.deque` of finished :class:`RequestTrace`.
+    '''
+    def __init__(self, loop, size):
+        self.size = size
+        self.pid = os.getpid()
+        self.traces = deque(maxlen=size)
+        self._loop = loop
+        self._ids = count(1)
+
+    def connection_made(self, connection):
+        connection._trace_made = self._loop.time()
+
+    def trace(self, consumer):
+        '''Create the :class:`RequestTrace` of ``consumer``
+        '''
+        connection = consumer.connection
+        trace = RequestTrace(self, '%d-%d' % (self.pid, next(self._ids)),
+                             consumer.__class__.__name__, connection.session)
+        made = getattr(connection, '_trace_made', None)
+        if made and not connection.requests_processed:
+            trace.mark('connection_made', made)
+        return trace
+
+    def chrome_trace(self):
+        '''The finished requests in the Chrome trace-event format.
+
+        The dictionary can be saved as JSON and loaded in
+        ``chrome://tracing``. Each request is a ``request`` span, with
+        ``receive``, ``app`` and ``respond`` spans when available, on
+        the thread of its connection session.
+        '''
+        events = []
+        for trace in self.traces:
+            events.extend(trace.trace_events(self.pid))
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def _micro(seconds):
+    return int(seconds*1000000)
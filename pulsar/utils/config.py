@@ -1028,13 +1028,125 @@ class Workers(Setting):
         """
 
 
+class MinWorkers(Setting):
+    name = "min_workers"
+    section = "Worker Processes"
+    flags = ["--min-workers"]
+    validator = validate_pos_int
+    type = int
+    default = 0
+    desc = """\
+        The minimum number of workers when autoscaling.
+
+        If zero (the default) the :ref:`workers <setting-workers>` value
+        is used.
+        """
+
+
+class MaxWorkers(Setting):
+    name = "max_workers"
+    section = "Worker Processes"
+    flags = ["--max-workers"]
+    validator = validate_pos_int
+    type = int
+    default = 0
+    desc = """\
+        The maximum number of workers when autoscaling.
+
+        Autoscaling is enabled when this value is greater than the
+        minimum number of workers. Workers are added, one at a time, when
+        the average worker is busier than the
+        :ref:`autoscale clients <setting-autoscale_clients>`,
+        :ref:`autoscale requests <setting-autoscale_requests>` or
+        :ref:`autoscale lag <setting-autoscale_lag>` targets and removed
+        when the remaining workers would be less than half as busy.
+        """
+
+
+class AutoscaleClients(Setting):
+    name = "autoscale_clients"
+    section = "Worker Processes"
+    flags = ["--autoscale-clients"]
+    validator = validate_pos_int
+    type = int
+    default = 100
+    desc = """\
+        Target number of connected clients per worker when autoscaling.
+        """
+
+
+class AutoscaleRequests(Setting):
+    name = "autoscale_requests"
+    section = "Worker Processes"
+    flags = ["--autoscale-requests"]
+    validator = validate_pos_float
+    type = float
+    default = 0
+    desc = """\
+        Target number of requests per second per worker when autoscaling.
+
+        Zero (the default) does not scale on the request rate.
+        """
+
+
+class AutoscaleLag(Setting):
+    name = "autoscale_lag"
+    section = "Worker Processes"
+    flags = ["--autoscale-lag"]
+    validator = validate_pos_float
+    type = float
+    default = 0.1
+    desc = """\
+        Target mean event loop lag in seconds of workers when autoscaling.
+
+        Only available when the :ref:`loop monitor <setting-loop_monitor>`
+        is enabled. Zero does not scale on the loop lag.
+        """
+
+
+class AutoscaleCooldown(Setting):
+    name = "autoscale_cooldown"
+    section = "Worker Processes"
+    flags = ["--autoscale-cooldown"]
+    validator = validate_pos_float
+    type = float
+    default = 30
+    desc = """\
+        Minimum number of seconds between two changes in the number of
+        workers when autoscaling.
+        """
+
+
 class Concurrency(Setting):
     name = "concurrency"
     section = "Worker Processes"
-    choices = ('process', 'thread', 'subprocess')
+    choices = ('process', 'thread', 'subprocess', 'forkserver')
     flags = ["--concurrency"]
     default = "process"
-    desc = """The type of concurrency to use."""
+    desc = """\
+        The type of concurrency to use.
+
+        ``forkserver`` forks workers from a template process which
+        imports the :ref:`preload <setting-preload>` modules once.
+        """
+
+
+class Preload(Setting):
+    name = "preload"
+    section = "Worker Processes"
+    flags = ["--preload"]
+    nargs = '+'
+    validator = validate_list
+    default = []
+    desc = """\
+        Modules imported by the template process of the ``forkserver``
+        :ref:`concurrency <setting-concurrency>`.
+
+        The template process is started the first time a worker is spawned
+        and always imports the ``__main__`` module and pulsar. Workers
+        forked from it share the memory of the loaded modules, which makes
+        spawning and :ref:`recycling <setting-max_requests>` workers cheap.
+        """
 
 
 class MaxRequests(Setting):
@@ -1068,6 +1180,25 @@ class Timeout(Setting):
         killed and restarted."""
 
 
+class DrainTimeout(Setting):
+    name = "drain_timeout"
+    section = "Worker Processes"
+    flags = ["--drain-timeout"]
+    validator = validate_pos_float
+    type = float
+    default = 0
+    desc = """\
+        Seconds a stopping worker waits for the requests in progress
+        to finish.
+
+        A stopping worker stops accepting connections and closes idle
+        ones. With a positive value, connections with a request in
+        progress are closed once the request is done, or after this many
+        seconds. Set it to make :ref:`rolling restarts <restart_command>`
+        complete in-flight requests.
+        """
+
+
 class ThreadWorkers(Setting):
     name = "thread_workers"
     section = "Worker Processes"
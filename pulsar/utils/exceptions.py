@@ -14,6 +14,7 @@ __all__ = ['PulsarException',
            'ProtocolError',
            'EventAlreadyRegistered',
            'InvalidOperation',
+           'ExecutorFull',
            'HaltServer',
            'LockError',
            #
@@ -90,6 +91,12 @@ class InvalidOperation(PulsarException):
     pass
 
 
+class ExecutorFull(PulsarException):
+    '''A :class:`PulsarException` raised when submitting a call to a full
+    actor executor with the ``raise`` reject policy.'''
+    pass
+
+
 class HaltServer(BaseException):
     ''':class:`BaseException` raised to stop a running server.
 
@@ -0,0 +1,216 @@
+'''Counters, gauges and histograms updated locally by an actor.
+
+Each :class:`.Actor` has a :class:`Metrics` registry in its
+:attr:`~.Actor.metrics` attribute. The registry is a plain dictionary of
+numbers updated without any I/O; workers ship a :meth:`Metrics.dump` to
+the arbiter with the periodic ``notify`` command and the arbiter merges
+them into a single view with :func:`merge`. :func:`exposition` renders
+the merged view in the prometheus text exposition format::
+
+    requests = actor.metrics.counter('http_requests_total',
+                                     'Number of HTTP requests')
+    requests.inc(method='GET')
+
+Metrics
+~~~~~~~~~~~~~~~
+.. autoclass:: Metrics
+   :members:
+   :member-order: bysource
+'''
+from .structures import Histogram
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Metric:
+    '''Base class for a named metric with optional labels'''
+    type = None
+
+    def __init__(self, name, doc=''):
+        self.name = name
+        self.doc = doc
+        self.values = {}
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, self.name)
+    __str__ = __repr__
+
+    def get(self, **labels):
+        '''The value for ``labels``'''
+        return self.values.get(_key(labels), 0)
+
+    def samples(self):
+        return [(dict(key), value) for key, value in self.values.items()]
+
+
+class Counter(Metric):
+    '''A value which only goes up'''
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = _key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        '''Set the total of a count kept elsewhere'''
+        self.values[_key(labels)] = value
+
+
+class Gauge(Metric):
+    '''A value which can go up and down'''
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        self.values[_key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = _key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class HistogramMetric(Metric):
+    '''Distribution of observed values in a :class:`.Histogram`'''
+    type = 'histogram'
+
+    def __init__(self, name, doc='', bounds=None):
+        super().__init__(name, doc)
+        self.bounds = bounds
+
+    def get(self, **labels):
+        '''The :class:`.Histogram` for ``labels``, created if needed'''
+        key = _key(labels)
+        histogram = self.values.get(key)
+        if histogram is None:
+            histogram = Histogram(self.bounds)
+            self.values[key] = histogram
+        return histogram
+
+    def observe(self, value, **labels):
+        self.get(**labels).add(value)
+
+    def samples(self):
+        return [(dict(key), {'bounds': h.bounds,
+                             'counts': list(h.counts),
+                             'sum': h.sum,
+                             'count': h.count})
+                for key, h in self.values.items()]
+
+
+class Metrics:
+    '''A registry of :class:`Metric` by name.
+
+    Asking twice for a metric with the same name returns the same
+    instance; asking for a different type raises :class:`ValueError`.
+    '''
+    def __init__(self):
+        self._metrics = {}
+
+    def __len__(self):
+        return len(self._metrics)
+
+    def __iter__(self):
+        return iter(self._metrics.values())
+
+    def counter(self, name, doc=''):
+        '''Get or create a :class:`Counter`'''
+        return self._get(Counter, name, doc)
+
+    def gauge(self, name, doc=''):
+        '''Get or create a :class:`Gauge`'''
+        return self._get(Gauge, name, doc)
+
+    def histogram(self, name, doc='', bounds=None):
+        '''Get or create a :class:`HistogramMetric`'''
+        return self._get(HistogramMetric, name, doc, bounds)
+
+    def dump(self):
+        '''Dictionary of metrics which can be sent with the mailbox'''
+        return dict(((m.name, {'type': m.type,
+                               'help': m.doc,
+                               'samples': m.samples()}) for m in self))
+
+    def _get(self, Type, name, doc, *args):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = Type(name, doc, *args)
+            self._metrics[name] = metric
+        elif type(metric) is not Type:
+            raise ValueError('Metric %s is a %s' % (name, metric.type))
+        return metric
+
+
+def merge(dumps):
+    '''Merge an iterable over ``(labels, dump)`` pairs into one dump.
+
+    ``labels`` is a dictionary added to the labels of all samples in
+    ``dump``, usually the actor name and id. Metrics with the same name
+    but a different type than the first seen are ignored.
+    '''
+    merged = {}
+    for extra, dump in dumps:
+        for name, metric in dump.items():
+            target = merged.get(name)
+            if target is None:
+                target = dict(metric, samples=[])
+                merged[name] = target
+            elif target['type'] != metric['type']:
+                continue
+            target['samples'].extend((dict(labels, **extra), value)
+                                     for labels, value in metric['samples'])
+    return merged
+
+
+def exposition(dump):
+    '''Render a metrics ``dump`` in the prometheus text format'''
+    lines = []
+    for name in sorted(dump):
+        metric = dump[name]
+        if metric['help']:
+            lines.append('# HELP %s %s' % (name, _escape_help(metric['help'])))
+        lines.append('# TYPE %s %s' % (name, metric['type']))
+        for labels, value in metric['samples']:
+            if metric['type'] == 'histogram':
+                total = 0
+                bounds = tuple(value['bounds']) + (float('inf'),)
+                for bound, count in zip(bounds, value['counts']):
+                    total += count
+                    le = dict(labels, le=_number(bound))
+                    lines.append(_sample(name + '_bucket', le, total))
+                lines.append(_sample(name + '_sum', labels, value['sum']))
+                lines.append(_sample(name + '_count', labels, value['count']))
+            else:
+                lines.append(_sample(name, labels, value))
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def _sample(name, labels, value):
+    if labels:
+        name = '%s{%s}' % (name, ','.join(
+            '%s="%s"' % (k, _escape_label(v))
+            for k, v in sorted(labels.items())))
+    return '%s %s' % (name, _number(value))
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    elif value == float('-inf'):
+        return '-Inf'
+    return repr(value)
+
+
+def _escape_help(text):
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def _escape_label(value):
+    return _escape_help(str(value)).replace('"', r'\"')
@@ -45,11 +45,21 @@ Zset
 .. autoclass:: Zset
    :members:
    :member-order: bysource
+
+
+.. module:: pulsar.utils.structures.histogram
+
+Histogram
+~~~~~~~~~~~~~~~
+.. autoclass:: Histogram
+   :members:
+   :member-order: bysource
 '''
 from collections import *       # noqa
 
 from .skiplist import Skiplist  # noqa
 from .zset import Zset          # noqa
+from .histogram import Histogram    # noqa
 from .misc import (MultiValueDict, AttributeDictionary, FrozenDict,  # noqa
                    Dict, Deque, merge_prefix, recursive_update,  # noqa
                    mapping_iterator, inverse_mapping, aslist)    # noqa
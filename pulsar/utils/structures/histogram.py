@@ -0,0 +1,80 @@
+from bisect import bisect_left
+
+
+def exponential_bounds(start=0.0001, factor=2, number=21):
+    '''Upper bounds of ``number`` buckets growing by ``factor``'''
+    return tuple(start*factor**n for n in range(number))
+
+
+DEFAULT_BOUNDS = exponential_bounds()
+
+
+class Histogram:
+    '''Distribution of values in buckets with fixed upper bounds.
+
+    Adding a value is O(log n) in the number of buckets and memory
+    does not grow with the number of values, which makes it suitable for
+    long running measurements such as latencies.
+    The default bounds go from 0.1 millisecond to about 100 seconds.
+    '''
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, bounds=None):
+        self.bounds = tuple(bounds or DEFAULT_BOUNDS)
+        self.clear()
+
+    def __repr__(self):
+        return '%s(%d)' % (self.__class__.__name__, self.count)
+    __str__ = __repr__
+
+    def clear(self):
+        # last bucket for values above the highest bound
+        self.counts = [0]*(len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def add(self, value):
+        '''Add a ``value`` to the histogram'''
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        '''Estimate of the ``q`` quantile, ``0 <= q <= 1``.
+
+        Values are interpolated linearly within a bucket.
+        '''
+        if not self.count:
+            return 0
+        rank = q*self.count
+        seen = 0
+        lower = 0
+        for upper, count in zip(self.bounds + (self.max,), self.counts):
+            if count and seen + count >= rank:
+                upper = min(upper, self.max)
+                return lower + (upper - lower)*(rank - seen)/count
+            seen += count
+            lower = upper
+        return self.max
+
+    def cumulative(self):
+        '''List of ``(bound, count)`` pairs with the number of values
+        less or equal to each bound, the last bound is infinity'''
+        total = 0
+        result = []
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def info(self):
+        '''Dictionary with count, mean, max and p50, p90, p99 quantiles'''
+        return {'count': self.count,
+                'mean': self.sum/self.count if self.count else 0,
+                'max': self.max,
+                'p50': self.quantile(0.5),
+                'p90': self.quantile(0.9),
+                'p99': self.quantile(0.99)}
@@ -1,5 +1,30 @@
+import os
+
+from examples.echo.manage import EchoServerProtocol
 
 
 def dummy(environ, start_response):
     start_response('200 OK', [])
     yield [b'dummy']
+
+
+class SlowPidProtocol(EchoServerProtocol):
+    '''Reply with the process id of the worker after the number of
+    seconds received
+    '''
+    def data_received(self, data):
+        delay = float(data[:-len(self.separator)])
+        self._loop.call_later(delay, self._reply)
+
+    def _reply(self):
+        self.transport.write(str(os.getpid()).encode() + self.separator)
+        self.finished()
+
+
+def worker_aids(arbiter, name):
+    return list(arbiter.get_actor(name).managed_actors)
+
+
+def hello(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [environ.get('pulsar.request_id', '').encode()]
@@ -0,0 +1,65 @@
+'''Rolling restart of the workers of a socket server'''
+import unittest
+import asyncio
+
+from pulsar import send
+from pulsar.apps.socket import SocketServer
+from pulsar.apps.test import dont_run_with_thread
+
+from examples.echo.manage import Echo
+
+from tests.apps import SlowPidProtocol, worker_aids
+
+
+@dont_run_with_thread
+class TestRestart(unittest.TestCase):
+    workers = 2
+
+    @classmethod
+    async def setUpClass(cls):
+        s = SocketServer(SlowPidProtocol, name='rollingrestart',
+                         bind='127.0.0.1:0', workers=cls.workers,
+                         drain_timeout=5)
+        cls.server_cfg = await send('arbiter', 'run', s)
+
+    @classmethod
+    def tearDownClass(cls):
+        return send('arbiter', 'kill_actor', cls.server_cfg.name)
+
+    async def request(self, delay):
+        # a new connection, idle connections of stopping workers are closed
+        client = Echo(self.server_cfg.addresses[0], pool_size=1)
+        try:
+            return await client(str(delay).encode())
+        finally:
+            await client.pool.close()
+
+    async def aids(self):
+        return set(await send('arbiter', 'run', worker_aids,
+                              self.server_cfg.name))
+
+    async def test_restart(self):
+        name = self.server_cfg.name
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        old = await self.aids()
+        while len(old) < self.workers and loop.time() - start < 10:
+            await asyncio.sleep(0.2)
+            old = await self.aids()
+        self.assertEqual(len(old), self.workers)
+        # a request in progress while restarting
+        request = asyncio.ensure_future(self.request(3))
+        await asyncio.sleep(0.2)
+        result = await send('arbiter', 'restart', name)
+        self.assertEqual(result, {name: self.workers})
+        requests = []
+        aids = old
+        while aids & old and loop.time() - start < 30:
+            requests.append(await self.request(0.1))
+            aids = await self.aids()
+        self.assertFalse(aids & old)
+        self.assertEqual(len(aids), self.workers)
+        self.assertTrue(int(await request))
+        self.assertTrue(requests)
+        for pid in requests:
+            self.assertTrue(int(pid))
@@ -1,8 +1,10 @@
 import signal
 from time import time
+from hashlib import md5
 
 import pulsar
 from pulsar import send, spawn, get_application
+from pulsar.async.channel import Channel
 
 
 def add(actor, a, b):
@@ -52,6 +54,26 @@ async def spawn_actor_from_actor(actor, name):
     return actor2.aid
 
 
+async def ping_direct(actor, aid):
+    pong = await send(aid, 'ping')
+    assert pong == 'pong', 'no pong from actor'
+    assert await send(aid, 'echo', 'Hello!') == 'Hello!'
+    clients = actor.direct_mailbox.clients
+    # the monitor has no direct mailbox, notifications go via the arbiter
+    assert actor.monitor.aid not in clients
+    return clients[aid].address
+
+
+async def consume_channel(actor, name, number):
+    channel = Channel.attach(name)
+    digests = []
+    for _ in range(number):
+        data = await channel.get()
+        digests.append(md5(data).hexdigest())
+    channel.close()
+    return digests
+
+
 def cause_timeout(actor):
     if actor.next_periodic_task:
         actor.next_periodic_task.cancel()
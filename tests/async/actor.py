@@ -3,7 +3,7 @@ from pulsar.apps.test import ActorTestMixin
 from pulsar import send, async_while
 
 from tests.async import (add, get_test, spawn_actor_from_actor, close_mailbox,
-                         wait_for_stop, check_environ)
+                         wait_for_stop, check_environ, ping_direct)
 
 
 class ActorTest(ActorTestMixin):
@@ -26,7 +26,22 @@ class ActorTest(ActorTestMixin):
         self.assertTrue('actor' in info)
         ainfo = info['actor']
         self.assertEqual(ainfo['is_process'],
-                         self.concurrency in ('process', 'subprocess'))
+                         self.concurrency in ('process', 'subprocess',
+                                              'forkserver'))
+        mailbox = info['mailbox']
+        self.assertEqual(mailbox['window'], proxy.cfg.mailbox_window)
+        self.assertEqual(mailbox['queued'], 0)
+
+    async def test_direct_mailbox(self):
+        proxy1 = await self.spawn_actor(
+            name='direct-1-%s' % self.concurrency, direct_mailbox=True)
+        proxy2 = await self.spawn_actor(
+            name='direct-2-%s' % self.concurrency, direct_mailbox=True)
+        info = await send(proxy2, 'info')
+        address = info['actor']['mailbox']
+        self.assertTrue(address)
+        direct = await send(proxy1, 'run', ping_direct, proxy2.aid)
+        self.assertEqual(tuple(direct), tuple(address))
 
     async def test_simple_spawn(self):
         '''Test start and stop for a standard actor on the arbiter domain.'''
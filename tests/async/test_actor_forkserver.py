@@ -0,0 +1,12 @@
+import unittest
+
+from pulsar.apps.test import dont_run_with_thread, skipUnless
+from pulsar.utils.system import platform
+
+from tests.async.actor import ActorTest
+
+
+@dont_run_with_thread
+@skipUnless(platform.type != 'win', 'Requires posix OS')
+class TestActorForkServer(ActorTest, unittest.TestCase):
+    concurrency = 'forkserver'
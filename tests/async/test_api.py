@@ -1,6 +1,9 @@
 import unittest
+import asyncio
 
 import pulsar
+from pulsar.async.access import (EVENT_LOOPS, event_loop_factory,
+                                 validate_event_loop, default_loop)
 
 
 class TestApi(unittest.TestCase):
@@ -18,3 +21,17 @@ class TestApi(unittest.TestCase):
         return self.wait.assertRaises(pulsar.CommandNotFound,
                                       pulsar.send, 'arbiter',
                                       'sjdcbhjscbhjdbjsj', 'bla')
+
+    def test_event_loop_factory(self):
+        self.assertEqual(event_loop_factory('asyncio'), EVENT_LOOPS['asyncio'])
+        self.assertEqual(event_loop_factory('asyncio.SelectorEventLoop'),
+                         asyncio.SelectorEventLoop)
+        default = EVENT_LOOPS[default_loop]
+        self.assertEqual(event_loop_factory('notaloop'), default)
+        self.assertEqual(event_loop_factory('bla.notaloop'), default)
+        self.assertEqual(validate_event_loop(' uv '), 'uvloop')
+
+    def test_event_loop_setting(self):
+        cfg = pulsar.Config()
+        cfg.set('event_loop', 'uv')
+        self.assertEqual(cfg.event_loop, 'uvloop')
@@ -36,6 +36,21 @@ class TestArbiterProcess(ActorTestMixin, unittest.TestCase):
             mailbox = monitor.mailbox
             self.assertFalse(hasattr(mailbox, 'request'))
 
+    async def test_metrics(self):
+        arbiter = pulsar.get_actor()
+        counter = arbiter.metrics.counter('test_arbiter_total')
+        counter.inc()
+        metrics = await send('arbiter', 'metrics')
+        self.assertEqual(metrics['test_arbiter_total']['samples'],
+                         [({'actor': 'arbiter', 'aid': 'arbiter'}, 1)])
+        labels = {'actor': 'arbiter', 'aid': 'arbiter'}
+        actors = dict((tuple(sorted(k.items())), v) for k, v in
+                      metrics['pulsar_actors']['samples'])
+        self.assertEqual(actors[tuple(sorted(labels.items()))],
+                         len(arbiter.managed_actors))
+        self.assertEqual(metrics['pulsar_actor_uptime_seconds']['type'],
+                         'gauge')
+
     def test_registered(self):
         '''Test the arbiter in its process domain'''
         arbiter = pulsar.get_actor()
@@ -0,0 +1,131 @@
+import logging
+import unittest
+
+from pulsar import Config, get_event_loop
+from pulsar.async.autoscale import Autoscaler
+from pulsar.async.concurrency import MonitorConcurrency
+
+
+class Monitor:
+
+    def __init__(self, **params):
+        self.cfg = Config(**params)
+        self._loop = get_event_loop()
+        self.logger = logging.getLogger('pulsar.test.autoscale')
+
+
+class Worker:
+
+    def __init__(self, clients, requests=0, lag=None, notified=None,
+                 aid='worker'):
+        self.aid = aid
+        stats = {'connected_clients': clients,
+                 'requests_processed': requests}
+        self.info = {'wsgiserver': {'clients': stats}}
+        if lag:
+            self.info['loop'] = {'lag': {'count': lag[0], 'mean': lag[1]}}
+        if notified:
+            self.info['last_notified'] = notified
+
+
+def workers(*clients):
+    return [Worker(c, aid='w%d' % i) for i, c in enumerate(clients)]
+
+
+class TestAutoscaler(unittest.TestCase):
+
+    def monitor(self, **params):
+        params.setdefault('workers', 2)
+        params.setdefault('max_workers', 4)
+        params.setdefault('autoscale_clients', 10)
+        params.setdefault('autoscale_cooldown', 0)
+        return Monitor(**params)
+
+    def test_bounds(self):
+        monitor = self.monitor(min_workers=3, max_workers=2)
+        scaler = Autoscaler(monitor)
+        self.assertEqual(scaler.bounds(monitor.cfg), (3, 3))
+        self.assertEqual(scaler(monitor, []), 3)
+        monitor = self.monitor()
+        scaler = Autoscaler(monitor)
+        self.assertEqual(scaler.bounds(monitor.cfg), (2, 4))
+
+    def test_worker_load(self):
+        monitor = self.monitor()
+        scaler = Autoscaler(monitor)
+        self.assertEqual(scaler.worker_load(Worker(5).info, monitor.cfg),
+                         0.5)
+        self.assertEqual(scaler.worker_load({'actor': {}}, monitor.cfg), 0)
+
+    def test_request_rate(self):
+        monitor = self.monitor(autoscale_requests=100)
+        cfg = monitor.cfg
+        scaler = Autoscaler(monitor)
+        load = scaler.worker_load
+        self.assertEqual(load(Worker(0, 1000, notified=10).info, cfg, 'a'),
+                         0)
+        # 400 requests in 2 seconds
+        self.assertEqual(load(Worker(0, 1400, notified=12).info, cfg, 'a'),
+                         2)
+        # same notification, same rate
+        self.assertEqual(load(Worker(0, 1400, notified=12).info, cfg, 'a'),
+                         2)
+        self.assertEqual(load(Worker(0, 1450, notified=13).info, cfg, 'a'),
+                         0.5)
+        # busiest signal
+        self.assertEqual(load(Worker(8, 1500, notified=14).info, cfg, 'a'),
+                         0.8)
+        self.assertEqual(scaler(monitor, [Worker(0, 2500, notified=15,
+                                                 aid='a')]), 3)
+        self.assertEqual(scaler(monitor, []), 3)
+        self.assertEqual(scaler._samples, {})
+
+    def test_loop_lag(self):
+        monitor = self.monitor(autoscale_lag=0.1)
+        cfg = monitor.cfg
+        scaler = Autoscaler(monitor)
+        load = scaler.worker_load
+        info = Worker(0, lag=(100, 0.01), notified=10).info
+        self.assertEqual(load(info, cfg, 'a'), 0)
+        # ten samples of 0.2 seconds since the last notification
+        info = Worker(0, lag=(110, 3/110), notified=11).info
+        self.assertAlmostEqual(load(info, cfg, 'a'), 2)
+        monitor = self.monitor(autoscale_lag=0)
+        info = Worker(0, lag=(120, 0.1), notified=12).info
+        self.assertEqual(load(info, monitor.cfg, 'a'), 0)
+
+    def test_scale_up_and_down(self):
+        monitor = self.monitor()
+        scaler = Autoscaler(monitor)
+        self.assertEqual(scaler(monitor, workers(10, 10)), 2)
+        self.assertEqual(scaler(monitor, workers(15, 10)), 3)
+        self.assertEqual(scaler(monitor, workers(15, 15, 15)), 4)
+        self.assertEqual(scaler(monitor, workers(15, 15, 15, 15)), 4)
+        # hysteresis
+        self.assertEqual(scaler(monitor, workers(5, 5, 5, 5)), 4)
+        self.assertEqual(scaler(monitor, workers(3, 3, 3, 3)), 3)
+        # not all workers have reported
+        self.assertEqual(scaler(monitor, workers(0, 0)), 3)
+        self.assertEqual(scaler(monitor, workers(0, 0, 0)), 2)
+        self.assertEqual(scaler(monitor, workers(0, 0)), 2)
+        info = scaler.info(monitor.cfg)
+        self.assertEqual(info, {'min_workers': 2, 'max_workers': 4,
+                                'workers': 2, 'load': 0})
+
+    def test_cooldown(self):
+        monitor = self.monitor(autoscale_cooldown=60)
+        scaler = Autoscaler(monitor)
+        self.assertEqual(scaler(monitor, workers(50, 50)), 2)
+        scaler._changed -= 60
+        self.assertEqual(scaler(monitor, workers(50, 50)), 3)
+        self.assertEqual(scaler(monitor, workers(50, 50, 50)), 3)
+
+    def test_num_workers(self):
+        impl = MonitorConcurrency()
+        impl.managed_actors = {}
+        monitor = self.monitor(max_workers=0)
+        self.assertEqual(impl.num_workers(monitor), 2)
+        self.assertEqual(impl.autoscaler, None)
+        monitor = self.monitor()
+        self.assertEqual(impl.num_workers(monitor), 2)
+        self.assertIsInstance(impl.autoscaler, Autoscaler)
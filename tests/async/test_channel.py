@@ -0,0 +1,133 @@
+import os
+import asyncio
+import unittest
+from hashlib import md5
+from types import SimpleNamespace
+
+from pulsar import send
+from pulsar.apps.test import ActorTestMixin, dont_run_with_thread
+from pulsar.async.channel import (Channel, HEADER_SIZE, PRODUCER, CONSUMER,
+                                  channel_doorbell, _get_aid)
+
+from tests.async import consume_channel
+
+
+class TestChannel(unittest.TestCase):
+
+    def test_create_attach(self):
+        producer = Channel.create(size=1024)
+        self.assertEqual(producer.size, 1024)
+        self.assertEqual(len(producer), 0)
+        self.assertEqual(os.path.getsize(producer.name),
+                         HEADER_SIZE + 1024)
+        consumer = Channel.attach(producer.name)
+        self.assertFalse(os.path.exists(producer.name))
+        self.assertEqual(consumer.size, 1024)
+        producer.close()
+        consumer.close()
+
+    def test_long_actor_ids(self):
+        loop = asyncio.get_event_loop()
+        monitor = SimpleNamespace(aid='a-monitor-with-a-long-name',
+                                  _loop=loop)
+        worker = SimpleNamespace(aid='abcd1234', _loop=loop)
+        producer = Channel.create(size=1024, actor=monitor)
+        consumer = Channel.attach(producer.name, actor=worker)
+        self.assertEqual(_get_aid(producer._buffer, PRODUCER),
+                         'a-monitor-with-a-long-name')
+        self.assertEqual(_get_aid(producer._buffer, CONSUMER), 'abcd1234')
+        producer.close()
+        consumer.close()
+        monitor.aid = 'm'*300
+        with self.assertRaises(ValueError):
+            Channel.create(size=1024, actor=monitor)
+
+    def test_close_not_attached(self):
+        producer = Channel.create(size=1024)
+        self.assertTrue(os.path.exists(producer.name))
+        producer.close()
+        self.assertFalse(os.path.exists(producer.name))
+        producer.close()
+
+    async def test_put_get(self):
+        producer = Channel.create(size=1024)
+        consumer = Channel.attach(producer.name)
+        await producer.put(b'hello')
+        await producer.put(bytearray(b'world'))
+        self.assertEqual(len(consumer), 18)
+        self.assertEqual(await consumer.get(), b'hello')
+        self.assertEqual(await consumer.get(), b'world')
+        self.assertEqual(len(consumer), 0)
+        producer.close()
+        consumer.close()
+
+    async def test_wrap_around(self):
+        producer = Channel.create(size=100)
+        consumer = Channel.attach(producer.name)
+        for i in range(20):
+            payload = bytes([i]) * 30
+            await producer.put(payload)
+            self.assertEqual(await consumer.get(), payload)
+        producer.close()
+        consumer.close()
+
+    async def test_wait(self):
+        producer = Channel.create(size=100)
+        consumer = Channel.attach(producer.name)
+        getter = asyncio.ensure_future(consumer.get())
+        await asyncio.sleep(0)
+        self.assertFalse(getter.done())
+        await producer.put(b'x' * 60)
+        self.assertEqual(await getter, b'x' * 60)
+        # the ring is full, the producer waits for the consumer
+        await producer.put(b'y' * 60)
+        putter = asyncio.ensure_future(producer.put(b'z' * 60))
+        await asyncio.sleep(0)
+        self.assertFalse(putter.done())
+        self.assertEqual(await consumer.get(), b'y' * 60)
+        await putter
+        self.assertEqual(await consumer.get(), b'z' * 60)
+        producer.close()
+        consumer.close()
+
+    async def test_doorbell_empty(self):
+        producer = Channel.create(size=100)
+        consumer = Channel.attach(producer.name)
+        getter = asyncio.ensure_future(consumer.get())
+        await asyncio.sleep(0)
+        waiter = consumer._waiter
+        self.assertEqual(len(consumer), 0)
+        channel_doorbell(None, (consumer.name, 'consumer'), {})
+        self.assertTrue(waiter.done())
+        getter.cancel()
+        producer.close()
+        consumer.close()
+
+    async def test_errors(self):
+        producer = Channel.create(size=100)
+        with self.assertRaises(ValueError):
+            await producer.put(b'x' * 97)
+        consumer = Channel.attach(producer.name)
+        with self.assertRaises(AssertionError):
+            await consumer.put(b'x')
+        with self.assertRaises(AssertionError):
+            await producer.get()
+        producer.close()
+        consumer.close()
+
+
+@dont_run_with_thread
+class TestChannelActors(ActorTestMixin, unittest.TestCase):
+    concurrency = 'process'
+
+    async def test_bulk(self):
+        proxy = await self.spawn_actor(name='channel-consumer')
+        producer = Channel.create(size=2**21)
+        payloads = [os.urandom(2**20) for _ in range(8)]
+        result = send(proxy, 'run', consume_channel, producer.name,
+                      len(payloads))
+        for payload in payloads:
+            await producer.put(payload)
+        digests = await result
+        self.assertEqual(digests, [md5(p).hexdigest() for p in payloads])
+        producer.close()
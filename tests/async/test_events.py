@@ -50,3 +50,46 @@ class TestFailure(unittest.TestCase):
         self.assertEqual(h.remove_callback('many', cbk), 1)
         self.assertEqual(h.remove_callback('many', cbk), 0)
         self.assertEqual(h.event('many').handlers, [])
+
+    def test_single_handler(self):
+        h = Handler(many_times_events=('many',))
+        event = h.event('many')
+        self.assertEqual(event._handler, None)
+        results = []
+
+        def cbk1(arg, **kw):
+            results.append((1, arg, kw))
+
+        def cbk2(arg, **kw):
+            results.append((2, arg, kw))
+
+        h.bind_event('many', cbk1)
+        self.assertEqual(event._handler, cbk1)
+        h.fire_event('many', data=3)
+        self.assertEqual(results, [(1, h, {'data': 3})])
+        h.bind_event('many', cbk2)
+        self.assertEqual(event._handler, None)
+        h.fire_event('many', 4)
+        self.assertEqual(results[1:], [(1, 4, {}), (2, 4, {})])
+        self.assertEqual(h.remove_callback('many', cbk1), 1)
+        self.assertEqual(event._handler, cbk2)
+        event.clear()
+        self.assertEqual(event._handler, None)
+        h.fire_event('many')
+        self.assertEqual(len(results), 3)
+
+    def test_single_handler_error(self):
+        h = Handler(many_times_events=('many',))
+        h.bind_event('many', lambda arg, **kw: arg + 'a')
+        h.fire_event('many', 1)
+        self.assertEqual(h.fired_event('many'), 1)
+
+    def test_events_fired(self):
+        h = Handler(one_time_events=('start',), many_times_events=('many',))
+        self.assertEqual(h.events_fired(), {'many': 0})
+        for _ in range(3):
+            h.fire_event('many')
+        h.bind_event('other', lambda arg, **kw: None)
+        h.fire_event('other')
+        self.assertEqual(h.events_fired(), {'many': 3, 'other': 1})
+        self.assertEqual(h.event('many').fired(), 3)
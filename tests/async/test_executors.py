@@ -0,0 +1,91 @@
+import unittest
+import asyncio
+import threading
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from pulsar import (get_actor, get_event_loop, ExecutorFull,
+                    ImproperlyConfigured)
+from pulsar.async.executors import ActorExecutor
+
+
+def blocking(event, value):
+    event.wait(5)
+    return value
+
+
+class TestActorExecutor(unittest.TestCase):
+
+    async def test_run(self):
+        executor = ActorExecutor('test', get_event_loop())
+        result = await executor.run(sum, [1, 2, 3])
+        self.assertEqual(result, 6)
+        self.assertEqual(executor.pending, 0)
+        self.assertEqual(executor.completed, 1)
+
+    async def test_wait(self):
+        executor = ActorExecutor('test', get_event_loop(), max_queue=1)
+        event = threading.Event()
+        first = asyncio.ensure_future(executor.run(blocking, event, 1))
+        second = asyncio.ensure_future(executor.run(blocking, event, 2))
+        await asyncio.sleep(0.05)
+        self.assertEqual(executor.pending, 1)
+        self.assertEqual(executor.info()['waiting'], 1)
+        event.set()
+        self.assertEqual(await asyncio.gather(first, second), [1, 2])
+        self.assertEqual(executor.pending, 0)
+        self.assertEqual(executor.info()['waiting'], 0)
+        self.assertEqual(executor.rejected, 0)
+
+    async def test_raise(self):
+        executor = ActorExecutor('test', get_event_loop(), max_queue=1,
+                                 reject='raise')
+        event = threading.Event()
+        first = asyncio.ensure_future(executor.run(blocking, event, 1))
+        await asyncio.sleep(0.05)
+        with self.assertRaises(ExecutorFull):
+            await executor.run(blocking, event, 2)
+        event.set()
+        self.assertEqual(await first, 1)
+        self.assertEqual(executor.rejected, 1)
+
+    async def test_caller(self):
+        executor = ActorExecutor('test', get_event_loop(), max_queue=1,
+                                 reject='caller')
+        event = threading.Event()
+        first = asyncio.ensure_future(executor.run(blocking, event, 1))
+        await asyncio.sleep(0.05)
+        self.assertEqual(await executor.run(threading.get_ident),
+                         threading.get_ident())
+        event.set()
+        self.assertEqual(await first, 1)
+        self.assertEqual(executor.rejected, 1)
+        self.assertEqual(executor.completed, 2)
+
+    async def test_shutdown(self):
+        executor = ActorExecutor('test', get_event_loop(),
+                                 executor=ThreadPoolExecutor(1))
+        self.assertEqual(await executor.run(sum, [1, 2]), 3)
+        executor.shutdown()
+        with self.assertRaises(RuntimeError):
+            await executor.run(sum, [1, 2])
+        self.assertEqual(executor.completed, 1)
+
+    def test_bad_policy(self):
+        self.assertRaises(ImproperlyConfigured, ActorExecutor, 'test',
+                          get_event_loop(), reject='foo')
+
+    async def test_actor_executors(self):
+        actor = get_actor()
+        io = actor.executor('io')
+        self.assertIs(actor.executor(), io)
+        self.assertEqual(io.kind, 'thread')
+        self.assertEqual(await io.run(sum, [1, 2]), 3)
+        cpu = actor.executor('cpu')
+        self.assertEqual(cpu.kind, 'process')
+        pid = await cpu.run(os.getpid)
+        self.assertNotEqual(pid, os.getpid())
+        info = actor.info()['executors']
+        self.assertTrue(info['io']['completed'] >= 1)
+        self.assertEqual(info['cpu']['completed'], 1)
+        self.assertEqual(info['cpu']['latency']['count'], 1)
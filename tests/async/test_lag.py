@@ -0,0 +1,72 @@
+import time
+import asyncio
+import unittest
+
+from pulsar import get_event_loop
+from pulsar.apps.test import sequential
+from pulsar.async.lag import LoopMonitor
+
+
+def block(seconds):
+    time.sleep(seconds)
+
+
+def slow_callback(seconds):
+    block(seconds)
+
+
+async def slow_coroutine(seconds):
+    block(seconds)
+
+
+@sequential
+class TestLoopMonitor(unittest.TestCase):
+
+    async def test_lag(self):
+        monitor = LoopMonitor(get_event_loop(), 0.01, 0.05).start()
+        await asyncio.sleep(0.1)
+        monitor.stop()
+        self.assertTrue(monitor.lag.count >= 3)
+        self.assertFalse(monitor.slow_callbacks)
+        info = monitor.info()
+        self.assertEqual(info['interval'], 0.01)
+        self.assertEqual(info['lag']['count'], monitor.lag.count)
+        self.assertEqual(info['slow_callbacks'], [])
+
+    async def test_slow_callback(self):
+        loop = get_event_loop()
+        monitor = LoopMonitor(loop, 0.01, 0.05).start()
+        await asyncio.sleep(0.02)
+        loop.call_soon(block, 0.3)
+        await asyncio.sleep(0.05)
+        monitor.stop()
+        self.assertEqual(len(monitor.slow_callbacks), 1)
+        slow = monitor.info()['slow_callbacks'][0]
+        self.assertTrue(slow['location'].endswith('in block'))
+        self.assertEqual(slow['count'], 1)
+        self.assertTrue(slow['max'] > 0.2)
+        self.assertTrue(monitor.lag.max > 0.2)
+
+    async def test_callback_location(self):
+        loop = get_event_loop()
+        monitor = LoopMonitor(loop, 0.01, 0.05).start()
+        await asyncio.sleep(0.02)
+        loop.call_soon(slow_callback, 0.3)
+        await asyncio.sleep(0.05)
+        asyncio.ensure_future(slow_coroutine(0.3))
+        await asyncio.sleep(0.05)
+        monitor.stop()
+        locations = [s['location'] for s in monitor.info()['slow_callbacks']]
+        self.assertEqual(len(locations), 2)
+        self.assertTrue(any(loc.endswith('in slow_callback')
+                            for loc in locations))
+        self.assertTrue(any(loc.endswith('in slow_coroutine')
+                            for loc in locations))
+
+    async def test_stop(self):
+        monitor = LoopMonitor(get_event_loop(), 0.01).start()
+        self.assertEqual(monitor.start(), monitor)
+        monitor.stop()
+        self.assertEqual(monitor._handle, None)
+        monitor._thread.join(1)
+        self.assertFalse(monitor._thread.is_alive())
@@ -0,0 +1,256 @@
+import os
+import socket
+import asyncio
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from pulsar import ProtocolError, get_actor, TcpServer
+from pulsar.async.mailbox import (BinaryCodec, PickleCodec, Message,
+                                  MailboxProtocol, MailboxClient,
+                                  DirectMailbox, mailbox_codec)
+from pulsar.async.concurrency import Concurrency
+from pulsar.async.proxy import ActorProxy
+
+
+class Client(MailboxClient):
+
+    def _lost(self, _, exc=None):
+        pass
+
+
+def command(name, **kw):
+    data = {'command': name,
+            'sender': 'abcd1234',
+            'target': 'arbiter',
+            'args': (),
+            'kwargs': {},
+            'ack': 'efgh5678'}
+    data.update(kw)
+    return data
+
+
+class CodecTests:
+
+    def roundtrip(self, data):
+        codec = self.codec()
+        body = codec.encode(data)
+        self.assertIsInstance(body, bytes)
+        result = codec.decode(body)
+        self.assertEqual(result, data)
+        return body
+
+    def test_command(self):
+        self.roundtrip(command('ping'))
+        self.roundtrip(command('notify', args=({'actor': {'age': 3}},)))
+        self.roundtrip(command('config', args=('get', 'workers')))
+        self.roundtrip(command('run', kwargs={'bla': 4}))
+
+    def test_command_no_ack(self):
+        data = command('stop')
+        data.pop('ack')
+        self.roundtrip(data)
+
+    def test_callback(self):
+        for result in (None, True, False, 'pong', 'ü', b'\x00\x01', 3.5,
+                       -3, 2**70, [1, 'a'], {'a': (1, 2)}):
+            self.roundtrip(Message.callback(result, 'efgh5678').data)
+
+    def test_fallback(self):
+        self.roundtrip(command('ping', target=None))
+        self.roundtrip(command('ping', sender='a\0b'))
+        self.roundtrip(command('ping', extra=True))
+        self.roundtrip({'command': 'callback', 'ack': 'a', 'foo': 'b'})
+
+
+class TestBinaryCodec(CodecTests, unittest.TestCase):
+    codec = BinaryCodec
+
+    def test_compact(self):
+        for data in (command('ping'), Message.callback('pong', 'abc').data):
+            body = self.roundtrip(data)
+            self.assertLess(len(body), len(PickleCodec().encode(data)))
+        body = self.roundtrip(command('ping', target=None))
+        self.assertEqual(body[0], BinaryCodec.PICKLE)
+
+    def test_unknown(self):
+        codec = self.codec()
+        self.assertRaises(ProtocolError, codec.decode, b'\x09foo')
+        self.assertRaises(ProtocolError, codec.decode, b'\x02ack\x00x')
+
+
+class TestPickleCodec(CodecTests, unittest.TestCase):
+    codec = PickleCodec
+
+    def test_default(self):
+        self.assertIsInstance(mailbox_codec(), PickleCodec)
+        self.assertIsInstance(mailbox_codec(self.cfg), PickleCodec)
+
+
+class TestTransports(unittest.TestCase):
+
+    async def ping(self, address):
+        actor = get_actor()
+        server = TcpServer(MailboxProtocol, actor._loop, address,
+                           name='test-mailbox')
+        await server.start_serving()
+        client = Client(server.address, actor, actor._loop)
+        try:
+            pong = await client.request('ping', actor, actor, (), {})
+        finally:
+            client.close()
+            await server.close()
+        self.assertEqual(pong, 'pong')
+        return server
+
+    async def test_tcp(self):
+        await self.ping(('127.0.0.1', 0))
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Requires unix sockets')
+    async def test_unix(self):
+        path = os.path.join(tempfile.gettempdir(),
+                            'pulsar-test-%s.sock' % os.getpid())
+        server = await self.ping(path)
+        self.assertEqual(server._unix_path, None)
+        self.assertFalse(os.path.exists(path))
+
+
+class TestFlowControl(unittest.TestCase):
+
+    async def connect(self):
+        actor = get_actor()
+        server = TcpServer(MailboxProtocol, actor._loop, ('127.0.0.1', 0),
+                           name='test-mailbox')
+        await server.start_serving()
+        self.addCleanup(server.close)
+        client = Client(server.address, actor, actor._loop)
+        self.addCleanup(client.close)
+        self.assertEqual(client.info(), {})
+        await client.request('ping', actor, actor, (), {})
+        return actor, client._connection
+
+    async def test_window(self):
+        actor, conn = await self.connect()
+        conn.window = 2
+        requests = [conn._send(Message.command('echo', actor, actor, (i,), {}))
+                    for i in range(5)]
+        info = conn.info()
+        self.assertEqual(info['window'], 2)
+        self.assertEqual(info['in_flight'], 2)
+        self.assertEqual(info['queued'], 3)
+        self.assertEqual(info['outbox'], 2)
+        result = await asyncio.gather(*requests)
+        self.assertEqual(result, [0, 1, 2, 3, 4])
+        info = conn.info()
+        self.assertEqual(info['in_flight'], 0)
+        self.assertEqual(info['queued'], 0)
+        self.assertEqual(conn._released, 0)
+
+    async def test_priority(self):
+        actor, conn = await self.connect()
+        conn.window = 1
+        requests = [conn._send(Message.command('echo', actor, actor, (i,), {}))
+                    for i in range(3)]
+        notify = conn._send(Message.command('notify', actor, actor, ({},),
+                                            {}))
+        info = conn.info()
+        self.assertEqual(info['in_flight'], 2)
+        self.assertEqual(info['queued'], 2)
+        # notify is written ahead of the echo request
+        frame = conn._parser.decode(conn._outbox[0])
+        self.assertEqual(conn.codec.decode(frame.body)['command'], 'notify')
+        self.assertTrue(await notify)
+        result = await asyncio.gather(*requests)
+        self.assertEqual(result, [0, 1, 2])
+
+    async def test_unbounded(self):
+        actor, conn = await self.connect()
+        conn.window = 0
+        requests = [conn._send(Message.command('echo', actor, actor, (i,), {}))
+                    for i in range(5)]
+        self.assertEqual(conn.info()['in_flight'], 5)
+        result = await asyncio.gather(*requests)
+        self.assertEqual(result, [0, 1, 2, 3, 4])
+
+    async def test_fail_pending(self):
+        actor, conn = await self.connect()
+        conn.window = 1
+        requests = [conn._send(Message.command('echo', actor, actor, (i,), {}))
+                    for i in range(2)]
+        await asyncio.sleep(0)
+        conn._fail_pending(ValueError('lost'))
+        for request in requests:
+            with self.assertRaises(ValueError):
+                await request
+
+
+class TestCaller(unittest.TestCase):
+
+    async def test_removed_actor(self):
+        protocol = MailboxProtocol(loop=asyncio.get_event_loop())
+        worker = SimpleNamespace(aid='abcd1234', name='worker', cfg=None)
+        actors = {'abcd1234': ActorProxy(worker)}
+        arbiter = SimpleNamespace(removed_actors=0, get_actor=actors.get)
+        caller = protocol._get_caller(arbiter, 'abcd1234')
+        self.assertEqual(caller.aid, 'abcd1234')
+        actors.clear()
+        self.assertIs(protocol._get_caller(arbiter, 'abcd1234'), caller)
+        # the actor is removed, the cached proxy is no longer used
+        arbiter.removed_actors += 1
+        self.assertEqual(protocol._get_caller(arbiter, 'abcd1234'), None)
+
+
+class ArbiterMailbox:
+
+    def __init__(self):
+        self.requests = []
+
+    async def request(self, command, sender, target, args, kwargs):
+        self.requests.append((command, target))
+
+
+class TestDirectMailbox(unittest.TestCase):
+
+    def mailbox(self):
+        actor = SimpleNamespace(aid='abcd1234', mailbox=ArbiterMailbox(),
+                                monitor=SimpleNamespace(aid='monitor1'),
+                                cfg=SimpleNamespace(mailbox_transport='tcp'))
+        return DirectMailbox(actor, asyncio.get_event_loop())
+
+    async def test_unknown_address(self):
+        mailbox = self.mailbox()
+        requests = mailbox.actor.mailbox.requests
+        await mailbox.request('ping', mailbox.actor, 'efgh5678', (), {})
+        self.assertEqual(mailbox.clients, {})
+        await mailbox.request('ping', mailbox.actor, 'efgh5678', (), {})
+        self.assertEqual(requests, [('mailbox_address', 'arbiter'),
+                                    ('ping', 'efgh5678')] * 2)
+
+    async def test_arbiter_and_monitor(self):
+        mailbox = self.mailbox()
+        requests = mailbox.actor.mailbox.requests
+        await mailbox.request('notify', mailbox.actor, 'monitor1', (), {})
+        await mailbox.request('notify', mailbox.actor, 'arbiter', (), {})
+        self.assertEqual(requests, [('notify', 'monitor1'),
+                                    ('notify', 'arbiter')])
+        self.assertEqual(mailbox.clients, {})
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Requires unix sockets')
+    async def test_serve_error(self):
+        concurrency = Concurrency()
+        concurrency.cfg = SimpleNamespace(direct_mailbox=True)
+        concurrency.hand_shake = mock.Mock()
+        # the socket path is in a directory which does not exist
+        actor = SimpleNamespace(aid='missing/abcd1234', logger=mock.Mock(),
+                                monitor=SimpleNamespace(address=None),
+                                cfg=SimpleNamespace(mailbox_transport='unix'))
+        concurrency.create_mailbox(actor, asyncio.get_event_loop())
+        self.assertIsInstance(actor.direct_mailbox, DirectMailbox)
+        for _ in range(100):
+            if concurrency.hand_shake.called:
+                break
+            await asyncio.sleep(0.01)
+        concurrency.hand_shake.assert_called_once_with(actor)
+        self.assertEqual(actor.direct_mailbox, None)
+        self.assertTrue(actor.logger.error.called)
@@ -0,0 +1,159 @@
+import unittest
+import asyncio
+
+from pulsar import Pool, get_event_loop
+
+
+class Connection:
+    closed = False
+
+    def __init__(self):
+        self.transport = self
+
+    def is_closing(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        closed = get_event_loop().create_future()
+        closed.set_result(None)
+        return closed
+
+
+class TestPool(unittest.TestCase):
+
+    def pool(self, **kw):
+        self.created = []
+
+        async def creator():
+            connection = Connection()
+            self.created.append(connection)
+            return connection
+
+        return Pool(creator, loop=get_event_loop(), **kw)
+
+    async def test_connect(self):
+        pool = self.pool(pool_size=2)
+        conn = await pool.connect()
+        self.assertEqual(pool.in_use, 1)
+        self.assertEqual(pool.available, 0)
+        conn.close()
+        self.assertEqual(pool.in_use, 0)
+        self.assertEqual(pool.available, 1)
+        conn = await pool.connect()
+        self.assertEqual(len(self.created), 1)
+        conn.close()
+        self.assertEqual(pool.checkout_time.count, 2)
+        self.assertEqual(pool.wait_time.count, 2)
+        await pool.close()
+        self.assertTrue(self.created[0].closed)
+
+    async def test_fifo_waiters(self):
+        pool = self.pool(pool_size=1)
+        conn = await pool.connect()
+        order = []
+
+        async def wait(n):
+            c = await pool.connect()
+            order.append(n)
+            c.close()
+
+        waiters = [asyncio.ensure_future(wait(n)) for n in range(4)]
+        await asyncio.sleep(0.01)
+        self.assertEqual(pool.waiting, 4)
+        conn.close()
+        await asyncio.gather(*waiters)
+        self.assertEqual(order, [0, 1, 2, 3])
+        self.assertEqual(pool.waiting, 0)
+        self.assertEqual(len(self.created), 1)
+        await pool.close()
+
+    async def test_discard_wakes_waiter(self):
+        pool = self.pool(pool_size=1)
+        conn = await pool.connect()
+        waiter = asyncio.ensure_future(pool.connect())
+        await asyncio.sleep(0.01)
+        conn.detach()
+        conn = await waiter
+        self.assertEqual(len(self.created), 2)
+        self.assertEqual(conn.connection, self.created[1])
+        conn.close()
+        await pool.close()
+
+    async def test_timeout(self):
+        pool = self.pool(pool_size=1, timeout=0.05)
+        conn = await pool.connect()
+        with self.assertRaises(asyncio.TimeoutError):
+            await pool.connect()
+        self.assertEqual(pool.waiting, 0)
+        conn.close()
+        await pool.close()
+
+    async def test_idle_timeout(self):
+        pool = self.pool(pool_size=2, idle_timeout=0.05)
+        c1 = await pool.connect()
+        c2 = await pool.connect()
+        c1.close()
+        c2.close()
+        self.assertEqual(pool.available, 2)
+        await asyncio.sleep(0.1)
+        pool._maintain()
+        self.assertEqual(pool.available, 0)
+        self.assertTrue(self.created[0].closed)
+        self.assertTrue(self.created[1].closed)
+        await pool.close()
+
+    async def test_max_lifetime(self):
+        pool = self.pool(pool_size=2, max_lifetime=0.05)
+        conn = await pool.connect()
+        await asyncio.sleep(0.1)
+        conn.close()
+        self.assertTrue(self.created[0].closed)
+        self.assertEqual(pool.available, 0)
+        conn = await pool.connect()
+        self.assertEqual(conn.connection, self.created[1])
+        conn.close()
+        await pool.close()
+
+    async def test_min_size(self):
+        pool = self.pool(pool_size=4, min_size=2, idle_timeout=0.05)
+        await asyncio.sleep(0.01)
+        self.assertEqual(pool.available, 2)
+        await asyncio.sleep(0.1)
+        pool._maintain()
+        self.assertEqual(pool.available, 2)
+        self.assertEqual(len(self.created), 2)
+        await pool.close()
+
+    async def test_close_during_prewarm(self):
+        connected = get_event_loop().create_future()
+        created = []
+
+        async def creator():
+            await connected
+            connection = Connection()
+            created.append(connection)
+            return connection
+
+        pool = Pool(creator, loop=get_event_loop(), min_size=1)
+        await asyncio.sleep(0.01)
+        self.assertEqual(pool.info()['connecting'], 1)
+        await pool.close()
+        connected.set_result(None)
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(created), 1)
+        self.assertTrue(created[0].closed)
+        self.assertEqual(pool.available, 0)
+
+    async def test_info(self):
+        pool = self.pool(pool_size=3)
+        conn = await pool.connect()
+        info = pool.info()
+        self.assertEqual(info['pool_size'], 3)
+        self.assertEqual(info['in_use'], 1)
+        self.assertEqual(info['available'], 0)
+        self.assertEqual(info['waiting'], 0)
+        self.assertEqual(info['wait_time']['count'], 1)
+        self.assertEqual(info['checkout_time']['count'], 0)
+        conn.close()
+        await pool.close()
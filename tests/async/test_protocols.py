@@ -0,0 +1,115 @@
+import unittest
+import asyncio
+from functools import partial
+
+from pulsar import (Protocol, Connection, ProtocolConsumer, TcpServer,
+                    get_event_loop)
+
+
+class Transport:
+    closing = False
+
+    def __init__(self):
+        self.calls = []
+
+    def get_extra_info(self, name, default=None):
+        return default
+
+    def set_write_buffer_limits(self, low=None, high=None):
+        pass
+
+    def is_closing(self):
+        return self.closing
+
+    def write(self, data):
+        self.calls.append([data])
+
+    def writelines(self, data):
+        self.calls.append(list(data))
+
+    def can_write_eof(self):
+        return False
+
+    def close(self):
+        self.closing = True
+
+    def abort(self):
+        self.closing = True
+
+
+class SlowConsumer(ProtocolConsumer):
+    '''Reply with the data received after the number of seconds received
+    '''
+    def data_received(self, data):
+        self._loop.call_later(float(data), self._reply, data)
+
+    def _reply(self, data):
+        self.connection.write(data)
+        self.finished()
+
+
+class TestDrain(unittest.TestCase):
+
+    async def request(self, drain_timeout, delay):
+        # close the server while a request is in progress
+        loop = get_event_loop()
+        server = TcpServer(partial(Connection, SlowConsumer), loop,
+                           ('127.0.0.1', 0), drain_timeout=drain_timeout)
+        await server.start_serving()
+        stopped = server.event('stop')
+        reader, writer = await asyncio.open_connection(*server.address)
+        self.addCleanup(writer.close)
+        writer.write(str(delay).encode())
+        await asyncio.sleep(0.1)
+        self.assertEqual(len(server._concurrent_connections), 1)
+        await asyncio.wait_for(server.close(), 5)
+        self.assertTrue(stopped.fired())
+        return await reader.read()
+
+    async def test_drain(self):
+        data = await self.request(2, 0.3)
+        self.assertEqual(data, b'0.3')
+
+    async def test_drain_timeout(self):
+        loop = get_event_loop()
+        start = loop.time()
+        data = await self.request(0.3, 3)
+        self.assertEqual(data, b'')
+        self.assertLess(loop.time() - start, 2)
+
+
+class TestCork(unittest.TestCase):
+
+    def protocol(self, cork):
+        protocol = Protocol(get_event_loop(), cork=cork)
+        protocol.connection_made(Transport())
+        return protocol
+
+    async def test_no_cork(self):
+        protocol = self.protocol(False)
+        protocol.write(b'a')
+        protocol.write(b'b')
+        self.assertEqual(protocol.transport.calls, [[b'a'], [b'b']])
+
+    async def test_cork(self):
+        protocol = self.protocol(True)
+        buffer = bytearray(b'b')
+        protocol.write(b'a')
+        protocol.write(buffer)
+        buffer.extend(b'c')
+        self.assertEqual(protocol.transport.calls, [])
+        await asyncio.sleep(0)
+        self.assertEqual(protocol.transport.calls, [[b'a', b'b']])
+        protocol.write(b'c')
+        protocol.uncork()
+        self.assertEqual(protocol.transport.calls[-1], [b'c'])
+        await asyncio.sleep(0)
+        self.assertEqual(len(protocol.transport.calls), 2)
+
+    async def test_close_flushes(self):
+        protocol = self.protocol(True)
+        protocol.write(b'a')
+        protocol.close()
+        self.assertEqual(protocol.transport.calls, [[b'a']])
+        protocol.write(b'b')
+        self.assertEqual(protocol.transport.calls, [[b'a'], [b'b']])
@@ -0,0 +1,80 @@
+import unittest
+import asyncio
+
+from pulsar import get_event_loop
+from pulsar.async.mixins import IdleTimeouts
+
+
+class IdleProtocol:
+    closed = False
+
+    def __init__(self, loop, timeout):
+        self._loop = loop
+        self._timeout = timeout
+        self._last_activity = loop.time()
+        self.timed_out = 0
+
+    def touch(self):
+        self._last_activity = self._loop.time()
+
+    def _timed_out(self):
+        self.timed_out += 1
+        self.closed = True
+
+
+class TestIdleTimeouts(unittest.TestCase):
+
+    def wheel(self):
+        return IdleTimeouts(get_event_loop(), resolution=0.05)
+
+    def test_add_discard(self):
+        wheel = self.wheel()
+        p = IdleProtocol(wheel._loop, 1)
+        wheel.add(p)
+        self.assertEqual(len(wheel), 1)
+        self.assertTrue(p in wheel)
+        wheel.add(p)
+        self.assertEqual(len(wheel), 1)
+        wheel.discard(p)
+        self.assertEqual(len(wheel), 0)
+        self.assertFalse(wheel._buckets)
+        wheel.discard(p)
+        wheel.close()
+        self.assertEqual(wheel._sweeper, None)
+
+    async def test_idle(self):
+        wheel = self.wheel()
+        p1 = IdleProtocol(wheel._loop, 0.1)
+        p2 = IdleProtocol(wheel._loop, 10)
+        wheel.add(p1)
+        wheel.add(p2)
+        await asyncio.sleep(0.3)
+        self.assertEqual(p1.timed_out, 1)
+        self.assertEqual(p2.timed_out, 0)
+        self.assertFalse(p1 in wheel)
+        self.assertTrue(p2 in wheel)
+        wheel.close()
+        self.assertEqual(len(wheel), 0)
+
+    async def test_touch(self):
+        wheel = self.wheel()
+        p = IdleProtocol(wheel._loop, 0.15)
+        wheel.add(p)
+        for _ in range(6):
+            await asyncio.sleep(0.05)
+            p.touch()
+        self.assertEqual(p.timed_out, 0)
+        self.assertTrue(p in wheel)
+        await asyncio.sleep(0.4)
+        self.assertEqual(p.timed_out, 1)
+        self.assertEqual(len(wheel), 0)
+        self.assertEqual(wheel._sweeper, None)
+
+    async def test_closed_protocol(self):
+        wheel = self.wheel()
+        p = IdleProtocol(wheel._loop, 0.05)
+        wheel.add(p)
+        p.closed = True
+        await asyncio.sleep(0.2)
+        self.assertEqual(p.timed_out, 0)
+        self.assertEqual(len(wheel), 0)
@@ -0,0 +1,105 @@
+import unittest
+import asyncio
+import json
+
+from pulsar import send, get_event_loop
+from pulsar.async.tracing import Tracer
+from pulsar.apps.wsgi import WSGIServer
+from pulsar.apps.http import HttpClient
+
+from tests.apps import hello
+
+
+class Connection:
+    session = 3
+    requests_processed = 0
+
+
+class Consumer:
+
+    def __init__(self):
+        self.connection = Connection()
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_trace(self):
+        loop = get_event_loop()
+        tracer = Tracer(loop, 2)
+        consumer = Consumer()
+        tracer.connection_made(consumer.connection)
+        trace = tracer.trace(consumer)
+        self.assertEqual(trace.name, 'Consumer')
+        self.assertTrue(trace.id.endswith('-1'))
+        self.assertIn('connection_made', trace.marks)
+        for name in ('first_byte', 'headers', 'app_start', 'app_end',
+                     'first_write'):
+            trace.mark(name)
+        first_byte = trace.marks['first_byte']
+        trace.mark('first_byte')
+        self.assertEqual(trace.marks['first_byte'], first_byte)
+        trace.finish()
+        self.assertEqual(list(tracer.traces), [trace])
+        events = tracer.chrome_trace()['traceEvents']
+        self.assertEqual([e['name'] for e in events],
+                         ['request', 'receive', 'app', 'respond'])
+        for event in events:
+            self.assertEqual(event['ph'], 'X')
+            self.assertEqual(event['tid'], 3)
+            self.assertEqual(event['args']['request_id'], trace.id)
+        self.assertEqual(events[0]['args']['connection_made'], 0)
+
+    def test_idle_consumer(self):
+        tracer = Tracer(get_event_loop(), 2)
+        consumer = Consumer()
+        consumer.connection.requests_processed = 1
+        tracer.connection_made(consumer.connection)
+        trace = tracer.trace(consumer)
+        self.assertEqual(trace.marks, {})
+        trace.finish()
+        self.assertFalse(tracer.traces)
+
+    def test_size(self):
+        tracer = Tracer(get_event_loop(), 2)
+        for _ in range(3):
+            trace = tracer.trace(Consumer())
+            trace.mark('first_byte')
+            trace.finish()
+        self.assertEqual(len(tracer.traces), 2)
+        self.assertEqual(len(tracer.chrome_trace()['traceEvents']), 2)
+
+
+class TestWsgiTracing(unittest.TestCase):
+
+    @classmethod
+    async def setUpClass(cls):
+        s = WSGIServer(callable=hello, name='tracing', bind='127.0.0.1:0',
+                       workers=0, trace_requests=10)
+        cls.server_cfg = await send('arbiter', 'run', s)
+        cls.uri = 'http://%s:%s/' % cls.server_cfg.addresses[0]
+        cls.client = HttpClient()
+
+    @classmethod
+    def tearDownClass(cls):
+        return send('arbiter', 'kill_actor', cls.server_cfg.name)
+
+    async def test_trace(self):
+        response = await self.client.get(self.uri)
+        self.assertEqual(response.status_code, 200)
+        request_id = response.text()
+        self.assertTrue(request_id)
+        trace = None
+        for _ in range(10):
+            trace = await send(self.server_cfg.name, 'trace')
+            events = [e for e in trace['traceEvents']
+                      if e['args']['request_id'] == request_id]
+            if events:
+                break
+            await asyncio.sleep(0.1)
+        self.assertEqual([e['name'] for e in events],
+                         ['request', 'receive', 'app', 'respond'])
+        request = events[0]
+        for mark in ('connection_made', 'first_byte', 'headers',
+                     'app_start', 'app_end', 'first_write', 'finished'):
+            self.assertIn(mark, request['args'])
+        self.assertTrue(json.dumps(trace))
@@ -0,0 +1,14 @@
+import os
+
+from examples.echo.manage import EchoServerProtocol
+
+
+class PidServerProtocol(EchoServerProtocol):
+    '''Reply with the process id of the worker'''
+    def response(self, data, rest):
+        self.transport.write(str(os.getpid()).encode() + self.separator)
+        return data[:-len(self.separator)]
+
+
+def monitor_servers(arbiter, name):
+    return list(arbiter.get_actor(name).servers)
@@ -0,0 +1,53 @@
+import unittest
+
+from pulsar import send
+from pulsar.apps.http import HttpClient
+from pulsar.apps.test import dont_run_with_thread
+from pulsar.async.access import EVENT_LOOPS
+
+from examples.echo.manage import server as echo_server, Echo
+from examples.helloworld.manage import server as hello_server
+
+
+class EventLoopBench:
+    """Echo and helloworld examples served by a worker running
+    :attr:`event_loop`
+
+    A test class is created for each of the available :data:`.EVENT_LOOPS`
+    """
+    __benchmark__ = True
+    __number__ = 1000
+    event_loop = None
+
+    @classmethod
+    async def setUpClass(cls):
+        name = cls.__name__.lower()
+        s = echo_server(name='%s_echo' % name, bind='127.0.0.1:0',
+                        workers=1, event_loop=cls.event_loop)
+        cls.echo_cfg = await send('arbiter', 'run', s)
+        s = hello_server(name='%s_hello' % name, bind='127.0.0.1:0',
+                         workers=1, event_loop=cls.event_loop)
+        cls.hello_cfg = await send('arbiter', 'run', s)
+        cls.echo = Echo(cls.echo_cfg.addresses[0])
+        cls.uri = 'http://{0}:{1}'.format(*cls.hello_cfg.addresses[0])
+        cls.client = HttpClient()
+
+    @classmethod
+    async def tearDownClass(cls):
+        await send('arbiter', 'kill_actor', cls.echo_cfg.name)
+        await send('arbiter', 'kill_actor', cls.hello_cfg.name)
+
+    async def test_echo(self):
+        result = await self.echo(b'Hello!')
+        self.assertEqual(result, b'Hello!')
+
+    async def test_helloworld(self):
+        response = await self.client.get(self.uri)
+        self.assertEqual(response.status_code, 200)
+
+
+for event_loop in EVENT_LOOPS:
+    name = 'Test%sLoop' % event_loop.capitalize()
+    globals()[name] = dont_run_with_thread(
+        type(name, (EventLoopBench, unittest.TestCase),
+             {'event_loop': event_loop}))
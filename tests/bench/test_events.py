@@ -0,0 +1,35 @@
+import unittest
+
+from pulsar import EventHandler, get_event_loop
+
+
+def callback(arg, **kw):
+    pass
+
+
+class Handler(EventHandler):
+    MANY_TIMES_EVENTS = ('unbound', 'single', 'many')
+
+    def __init__(self):
+        super().__init__(get_event_loop())
+        self.bind_event('single', callback)
+        self.bind_event('many', callback)
+        self.bind_event('many', lambda arg, **kw: None)
+
+
+class TestFireEvent(unittest.TestCase):
+    __benchmark__ = True
+    __number__ = 10000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.handler = Handler()
+
+    def test_unbound(self):
+        self.handler.fire_event('unbound', data=None)
+
+    def test_single(self):
+        self.handler.fire_event('single', data=None)
+
+    def test_many(self):
+        self.handler.fire_event('many', data=None)
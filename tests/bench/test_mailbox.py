@@ -0,0 +1,55 @@
+import os
+import socket
+import tempfile
+import unittest
+
+from pulsar import get_actor, TcpServer
+from pulsar.async.mailbox import MailboxProtocol, MailboxClient
+
+
+class Client(MailboxClient):
+
+    def _lost(self, _, exc=None):
+        pass
+
+
+class MailboxTransport:
+    """Round-trip latency of a ping command over a mailbox connection
+    """
+    __benchmark__ = True
+    __number__ = 1000
+
+    @classmethod
+    async def setUpClass(cls):
+        cls.actor = get_actor()
+        loop = cls.actor._loop
+        cls.server = TcpServer(MailboxProtocol, loop, cls.address(),
+                               name='bench-mailbox')
+        await cls.server.start_serving()
+        cls.client = Client(cls.server.address, cls.actor, loop)
+
+    @classmethod
+    async def tearDownClass(cls):
+        cls.client.close()
+        await cls.server.close()
+
+    async def test_ping(self):
+        pong = await self.client.request('ping', self.actor, self.actor,
+                                         (), {})
+        self.assertEqual(pong, 'pong')
+
+
+class TestTcpTransport(MailboxTransport, unittest.TestCase):
+
+    @classmethod
+    def address(cls):
+        return ('127.0.0.1', 0)
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Requires unix sockets')
+class TestUnixTransport(MailboxTransport, unittest.TestCase):
+
+    @classmethod
+    def address(cls):
+        return os.path.join(tempfile.gettempdir(),
+                            'pulsar-bench-%s.sock' % os.getpid())
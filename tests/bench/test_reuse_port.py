@@ -0,0 +1,69 @@
+import socket
+import unittest
+from asyncio import sleep
+from collections import Counter
+
+from pulsar import send, get_actor, get_event_loop
+from pulsar.apps.socket import SocketServer
+from pulsar.apps.test import dont_run_with_thread
+
+from examples.echo.manage import Echo
+
+from tests.bench import PidServerProtocol, monitor_servers
+
+
+class ConnectionDistribution:
+    """Distribution of new connections across the workers of a socket server
+
+    Each test run opens a new connection. The number of connections
+    served by each process is logged when the class tears down. With a
+    shared socket the monitor accepts connections too.
+    """
+    __benchmark__ = True
+    __number__ = 1000
+    workers = 4
+
+    @classmethod
+    async def setUpClass(cls):
+        s = SocketServer(PidServerProtocol, name=cls.__name__.lower(),
+                         bind='127.0.0.1:0', workers=cls.workers,
+                         reuse_port=cls.reuse_port)
+        cls.server_cfg = await send('arbiter', 'run', s)
+        cls.address = cls.server_cfg.addresses[0]
+        cls.pids = Counter()
+        if cls.reuse_port:
+            # wait for the monitor to hand the address over to the workers
+            loop = get_event_loop()
+            start = loop.time()
+            servers = True
+            while servers and loop.time() - start < 20:
+                await sleep(0.5)
+                servers = await send('arbiter', 'run', monitor_servers,
+                                     cls.server_cfg.name)
+
+    @classmethod
+    async def tearDownClass(cls):
+        counts = sorted(cls.pids.values(), reverse=True)
+        get_actor().logger.info('%s: %d workers, connections per worker %s',
+                                cls.__name__, len(counts), counts)
+        await send('arbiter', 'kill_actor', cls.server_cfg.name)
+
+    async def test_connection(self):
+        client = Echo(self.address, pool_size=1)
+        try:
+            pid = await client(b'pid')
+        finally:
+            await client.pool.close()
+        self.pids[pid] += 1
+
+
+@dont_run_with_thread
+class TestSharedSocket(ConnectionDistribution, unittest.TestCase):
+    reuse_port = False
+
+
+@dont_run_with_thread
+@unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'),
+                     'Requires SO_REUSEPORT')
+class TestReusePort(ConnectionDistribution, unittest.TestCase):
+    reuse_port = True
@@ -0,0 +1,21 @@
+import unittest
+
+from pulsar.apps.wsgi import Router
+
+
+class TestRouter(unittest.TestCase):
+    __benchmark__ = True
+    __number__ = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.router = Router('/', *[Router('api%d/' % n,
+                                          Router('items'),
+                                          Router('items/<int:id>'))
+                                   for n in range(100)])
+
+    def test_static(self):
+        assert self.router.resolve('api99/items')
+
+    def test_dynamic(self):
+        assert self.router.resolve('api99/items/5')
@@ -0,0 +1,80 @@
+import unittest
+
+from pulsar import get_event_loop
+from pulsar.async.mixins import IdleTimeouts
+
+
+CONNECTIONS = 100
+TIMEOUT = 15
+
+
+class CallLaterProtocol:
+    """Idle timeout via a loop timer re-created at every event
+    """
+    _timeout_handler = None
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._timeout = TIMEOUT
+
+    def touch(self):
+        if self._timeout_handler:
+            self._timeout_handler.cancel()
+        self._timeout_handler = self._loop.call_later(self._timeout,
+                                                      self._timed_out)
+
+    def _timed_out(self):
+        pass
+
+
+class WheelProtocol:
+    """Idle timeout via the :class:`.IdleTimeouts` wheel
+    """
+    closed = False
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._timeout = TIMEOUT
+        self._last_activity = loop.time()
+
+    def touch(self):
+        self._last_activity = self._loop.time()
+
+    def _timed_out(self):
+        pass
+
+
+class TestIdleTimeouts(unittest.TestCase):
+    """Overhead of four events (data_received, data_processed,
+    before_write and after_write) on each of a batch of keep-alive
+    connections.
+    """
+    __benchmark__ = True
+    __number__ = 100
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = get_event_loop()
+        cls.wheel = IdleTimeouts(cls.loop)
+        cls.call_later = [CallLaterProtocol(cls.loop)
+                          for _ in range(CONNECTIONS)]
+        cls.protocols = [WheelProtocol(cls.loop)
+                         for _ in range(CONNECTIONS)]
+        for protocol in cls.protocols:
+            cls.wheel.add(protocol)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.wheel.close()
+        for protocol in cls.call_later:
+            protocol._timeout_handler.cancel()
+
+    def test_call_later(self):
+        for protocol in self.call_later:
+            for _ in range(4):
+                protocol.touch()
+
+    def test_timing_wheel(self):
+        for protocol in self.protocols:
+            for _ in range(4):
+                protocol.touch()
@@ -678,6 +678,33 @@ class TestHttpClient(TestHttpClientBase, unittest.TestCase):
         self.assertEqual(response.status_code, 304)
         self.assertFalse('Content-length' in response.headers)
 
+    async def test_media_range(self):
+        http = self._client
+        response = await http.get(self.httpbin('media/httpbin.css'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['accept-ranges'], 'bytes')
+        content = response.content
+        size = len(content)
+        self.assertEqual(int(response.headers['content-length']), size)
+        #
+        response = await http.get(self.httpbin('media/httpbin.css'),
+                                  headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers['content-range'],
+                         'bytes 10-19/%d' % size)
+        self.assertEqual(response.content, content[10:20])
+        #
+        response = await http.get(self.httpbin('media/httpbin.css'),
+                                  headers={'Range': 'bytes=-5'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, content[-5:])
+        #
+        response = await http.get(self.httpbin('media/httpbin.css'),
+                                  headers={'Range': 'bytes=%d-' % size})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers['content-range'],
+                         'bytes */%d' % size)
+
     async def test_http_get_timeit(self):
         N = 10
         client = self._client
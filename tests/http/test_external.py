@@ -52,7 +52,7 @@ class Test_HttpClient_NoProxy_External(ExternalBase, unittest.TestCase):
     '''
 
 
-@unittest.skipUnless(cfg.http_proxy == '' and cfg.event_loop != 'uv',
+@unittest.skipUnless(cfg.http_proxy == '' and cfg.event_loop != 'uvloop',
                      'Requires no external proxy')
 class Test_HttpClient_Proxy_External(ProxyExternal, unittest.TestCase):
     with_proxy = True
@@ -8,7 +8,7 @@ from tests.http import base, req
 
 if platform.type != 'win':
 
-    @unittest.skipIf(get_actor().cfg.event_loop == 'uv',
+    @unittest.skipIf(get_actor().cfg.event_loop == 'uvloop',
                      "uvloop does not work with udp servers")
     class TestTlsHttpClientWithProxy(req.TestRequest, base.TestHttpClient):
         with_proxy = True
@@ -0,0 +1,50 @@
+import unittest
+
+from pulsar.utils.structures import Histogram
+from pulsar.utils.structures.histogram import exponential_bounds
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_empty(self):
+        h = Histogram()
+        self.assertEqual(h.count, 0)
+        self.assertEqual(h.quantile(0.5), 0)
+        info = h.info()
+        self.assertEqual(info['mean'], 0)
+        self.assertEqual(info['p99'], 0)
+        self.assertEqual(repr(h), 'Histogram(0)')
+
+    def test_bounds(self):
+        self.assertEqual(exponential_bounds(1, 2, 4), (1, 2, 4, 8))
+        h = Histogram((1, 2, 4, 8))
+        for value in (0.5, 1, 1.5, 3, 3, 100):
+            h.add(value)
+        self.assertEqual(h.counts, [2, 1, 2, 0, 1])
+        self.assertEqual(h.count, 6)
+        self.assertEqual(h.max, 100)
+        self.assertEqual(h.cumulative(),
+                         [(1, 2), (2, 3), (4, 5), (8, 5), (float('inf'), 6)])
+        h.clear()
+        self.assertEqual(h.counts, [0, 0, 0, 0, 0])
+        self.assertEqual(h.max, 0)
+
+    def test_quantile(self):
+        h = Histogram((10, 20, 30, 40))
+        for value in range(1, 41):
+            h.add(value)
+        self.assertEqual(h.quantile(0.5), 20)
+        self.assertEqual(h.quantile(0.25), 10)
+        self.assertAlmostEqual(h.quantile(0.99), 39.6)
+        self.assertEqual(h.quantile(1), 40)
+        info = h.info()
+        self.assertEqual(info['count'], 40)
+        self.assertEqual(info['mean'], 20.5)
+        self.assertEqual(info['p50'], 20)
+
+    def test_quantile_max(self):
+        h = Histogram((1, 10))
+        h.add(4)
+        self.assertEqual(h.quantile(1), 4)
+        h.add(1000)
+        self.assertEqual(h.quantile(1), 1000)
@@ -0,0 +1,67 @@
+import unittest
+
+from pulsar.utils.metrics import Metrics, merge, exposition
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_registry(self):
+        metrics = Metrics()
+        self.assertFalse(metrics)
+        counter = metrics.counter('requests_total', 'Requests')
+        self.assertEqual(metrics.counter('requests_total'), counter)
+        self.assertEqual(len(metrics), 1)
+        self.assertRaises(ValueError, metrics.gauge, 'requests_total')
+        self.assertEqual(repr(counter), 'Counter(requests_total)')
+
+    def test_counter_gauge(self):
+        metrics = Metrics()
+        counter = metrics.counter('requests_total')
+        counter.inc()
+        counter.inc(2, method='GET')
+        counter.inc(method='GET')
+        self.assertEqual(counter.get(), 1)
+        self.assertEqual(counter.get(method='GET'), 3)
+        counter.set(10, method='POST')
+        self.assertEqual(counter.get(method='POST'), 10)
+        gauge = metrics.gauge('clients')
+        gauge.set(5)
+        gauge.dec(2)
+        self.assertEqual(gauge.get(), 3)
+        dump = metrics.dump()
+        self.assertEqual(dump['clients'],
+                         {'type': 'gauge', 'help': '', 'samples': [({}, 3)]})
+
+    def test_histogram(self):
+        metrics = Metrics()
+        latency = metrics.histogram('latency_seconds', bounds=(0.1, 1))
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+        self.assertEqual(latency.get().count, 3)
+        samples = metrics.dump()['latency_seconds']['samples']
+        self.assertEqual(samples, [({}, {'bounds': (0.1, 1),
+                                         'counts': [1, 1, 1],
+                                         'sum': 5.55,
+                                         'count': 3})])
+
+    def test_exposition(self):
+        metrics = Metrics()
+        metrics.counter('requests_total', 'Number\nof requests').inc(
+            path='/"a"')
+        metrics.histogram('latency_seconds', bounds=(1,)).observe(0.5)
+        dump = merge([({'actor': 'worker', 'aid': 'abc'}, metrics.dump()),
+                      ({'actor': 'other', 'aid': 'efg'},
+                       {'requests_total': {'type': 'gauge', 'help': '',
+                                           'samples': [({}, 1)]}})])
+        text = exposition(dump)
+        self.assertEqual(text.split('\n'), [
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{actor="worker",aid="abc",le="1"} 1',
+            'latency_seconds_bucket{actor="worker",aid="abc",le="+Inf"} 1',
+            'latency_seconds_sum{actor="worker",aid="abc"} 0.5',
+            'latency_seconds_count{actor="worker",aid="abc"} 1',
+            '# HELP requests_total Number\\nof requests',
+            '# TYPE requests_total counter',
+            'requests_total{actor="worker",aid="abc",path="/\\"a\\""} 1',
+            ''])
@@ -1,10 +1,14 @@
 '''Tests the wsgi middleware in pulsar.apps.wsgi'''
+import os
+import gzip
+import tempfile
 import unittest
+from unittest import mock
 
 import pulsar
 from pulsar import Http404
 from pulsar.apps.wsgi import (Router, RouterParam, route, test_wsgi_environ,
-                              MediaRouter)
+                              MediaRouter, StaticCache)
 
 from examples.httpbin.manage import HttpBin
 
@@ -254,3 +258,153 @@ class TestRouter(unittest.TestCase):
         self.assertEqual(router(test_wsgi_environ('/foo')), None)
         self.assertEqual(router(test_wsgi_environ('/foo/bla')), None)
         self.assertRaises(Http404, router, test_wsgi_environ('/foo/bla.png'))
+
+    def test_resolve_order(self):
+        router = Router('/', Router('<name>'), Router('bla'),
+                        Router('foo/', Router('<int:id>')))
+        handler, urlargs = router.resolve('bla')
+        self.assertEqual(handler.rule, '<name>')
+        self.assertEqual(urlargs, {'name': 'bla'})
+        router.remove_child(router.routes[0])
+        handler, urlargs = router.resolve('bla')
+        self.assertEqual(handler.rule, 'bla')
+        handler, urlargs = router.resolve('foo/5')
+        self.assertEqual(handler.rule, 'foo/<int:id>')
+        self.assertEqual(urlargs, {'id': 5})
+        self.assertEqual(router.resolve('foo/bla'), None)
+        self.assertEqual(router.resolve('pippo'), None)
+
+    def test_resolve_cache(self):
+        router = Router('/', Router('bla'), Router('<name>'))
+        handler, urlargs = router.resolve('bla')
+        self.assertEqual(router._tree.cache, {'bla': handler})
+        urlargs['foo'] = 1
+        self.assertEqual(router.resolve('bla'), (handler, {}))
+        router.resolve('foo')
+        self.assertEqual(len(router._tree.cache), 1)
+        child = Router('new')
+        handler.add_child(child)
+        self.assertEqual(router._tree, None)
+        self.assertEqual(router.resolve('bla/new'), (child, {}))
+        router.remove_child(handler)
+        self.assertEqual(router.resolve('bla'), (router.routes[0],
+                                                 {'name': 'bla'}))
+
+
+class TestStaticCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_get(self):
+        cache = StaticCache(check_interval=60)
+        path = self.write('site.css', b'body {}')
+        entry = cache.get(path)
+        self.assertEqual(entry.content, b'body {}')
+        self.assertEqual(entry.content_type, 'text/css')
+        self.assertEqual(entry.variants, {})
+        self.assertEqual(cache.size, 7)
+        self.write('site.css', b'body {color: red}')
+        self.assertIs(cache.get(path), entry)
+        self.assertEqual(cache.get(self.dir.name), None)
+        self.assertEqual(cache.get(path + 'x'), None)
+        self.assertEqual(len(cache), 1)
+
+    def test_invalidate(self):
+        cache = StaticCache(check_interval=0)
+        path = self.write('site.css', b'body {}')
+        entry = cache.get(path)
+        self.assertIs(cache.get(path), entry)
+        self.write('site.css', b'body {color: red}')
+        entry = cache.get(path)
+        self.assertEqual(entry.content, b'body {color: red}')
+        self.assertEqual(cache.size, 17)
+        os.remove(path)
+        self.assertEqual(cache.get(path), None)
+        self.assertEqual(cache.size, 0)
+
+    def test_evict(self):
+        cache = StaticCache(max_size=20, max_file_size=10, compress=False)
+        a = self.write('a.js', b'a'*8)
+        b = self.write('b.js', b'b'*8)
+        c = self.write('c.js', b'c'*8)
+        self.assertEqual(cache.get(self.write('d.js', b'd'*11)), None)
+        cache.get(a)
+        cache.get(b)
+        cache.get(a)
+        cache.get(c)
+        self.assertEqual(list(cache._files), [a, c])
+        self.assertEqual(cache.size, 16)
+
+    def test_media_router(self):
+        content = b'body {color: red}\n'*100
+        self.write('site.css', content)
+        router = MediaRouter('/media', self.dir.name,
+                             static_cache=StaticCache())
+        response = router(test_wsgi_environ('/media/site.css'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['content-type'], 'text/css')
+        self.assertEqual(response.headers['vary'], 'Accept-Encoding')
+        self.assertEqual(b''.join(response.content), content)
+        response = router(test_wsgi_environ(
+            '/media/site.css', headers=[('accept-encoding', 'gzip')]))
+        self.assertEqual(response.headers['content-encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.content)),
+                         content)
+        response = router(test_wsgi_environ(
+            '/media/site.css', headers=[('range', 'bytes=0-3')]))
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers['content-range'],
+                         'bytes 0-3/%d' % len(content))
+        self.assertEqual(b''.join(response.content), b'body')
+
+    def test_media_router_default_suffix(self):
+        self.write('foo', b'foo')
+        self.write('foo.html', b'<p>foo</p>')
+        cache = StaticCache()
+        router = MediaRouter('/media', self.dir.name, default_suffix='html',
+                             static_cache=cache)
+        for _ in range(2):
+            response = router(test_wsgi_environ('/media/foo'))
+            self.assertEqual(b''.join(response.content), b'<p>foo</p>')
+        self.assertEqual(list(cache._files),
+                         [os.path.join(self.dir.name, 'foo.html')])
+
+    def test_media_router_warm_hit(self):
+        os.mkdir(os.path.join(self.dir.name, 'docs'))
+        self.write('docs/index.html', b'<p>docs</p>')
+        self.write('foo.html', b'<p>foo</p>')
+        self.write('site.css', b'body {}')
+        cache = StaticCache(check_interval=60)
+        router = MediaRouter('/media', self.dir.name, default_suffix='html',
+                             static_cache=cache)
+        urls = {'/media/docs/': b'<p>docs</p>',
+                '/media/foo': b'<p>foo</p>',
+                '/media/site.css': b'body {}'}
+        for url, content in urls.items():
+            response = router(test_wsgi_environ(url))
+            self.assertEqual(b''.join(response.content), content)
+        with mock.patch('os.stat') as stat, \
+                mock.patch('os.path.isfile') as isfile, \
+                mock.patch('os.path.isdir') as isdir:
+            for url, content in urls.items():
+                response = router(test_wsgi_environ(url))
+                self.assertEqual(b''.join(response.content), content)
+        self.assertFalse(stat.called)
+        self.assertFalse(isfile.called)
+        self.assertFalse(isdir.called)
+        # the redirect is not cached
+        response = router(test_wsgi_environ('/media/docs'))
+        self.assertEqual(response.status_code, 302)
+        # removing a file from the cache removes its urls
+        cache.remove(os.path.join(self.dir.name, 'foo.html'))
+        self.assertEqual(len(cache._aliases), 2)
+        cache.clear()
+        self.assertEqual(cache._aliases, {})
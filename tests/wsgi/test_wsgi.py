@@ -1,15 +1,25 @@
 '''Tests the wsgi middleware in pulsar.apps.wsgi'''
+import io
 import time
+import socket
+import tempfile
 import pickle
 import unittest
 from unittest import mock
 from datetime import datetime, timedelta
+from asyncio import sleep
+from functools import partial
 from urllib.parse import urlparse
 
 import pulsar
+from pulsar import Connection, TcpServer, get_event_loop
 from pulsar.apps import wsgi
 from pulsar.apps import http
 from pulsar.apps.wsgi.utils import cookie_date
+from pulsar.apps.wsgi.server import (date_header, response_prefix,
+                                     environ_key, HAS_SENDFILE)
+from pulsar.apps.wsgi.wrappers import FileWrapper
+from pulsar.apps.test.wsgi import HttpTestClient
 
 
 class WsgiRequestTests(unittest.TestCase):
@@ -235,3 +245,131 @@ class WsgiRequestTests(unittest.TestCase):
         response = request.redirect('/foo2', permanent=True)
         self.assertEqual(response.status_code, 301)
         self.assertEqual(response['location'], '/foo2')
+
+
+def server_header_app(environ, start_response):
+    start_response('200 OK', [('Server', 'custom'),
+                              ('Content-Length', '0')])
+    return []
+
+
+class HttpServerResponseTests(unittest.TestCase):
+
+    def test_byte_range(self):
+        byte_range = wsgi.routers.byte_range
+        self.assertEqual(byte_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(byte_range('bytes=500-', 1000), (500, 999))
+        self.assertEqual(byte_range('bytes=900-2000', 1000), (900, 999))
+        self.assertEqual(byte_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(byte_range('bytes=-2000', 1000), (0, 999))
+        self.assertEqual(byte_range('bytes=1000-', 1000), ())
+        self.assertEqual(byte_range('bytes=-0', 1000), ())
+        self.assertEqual(byte_range('bytes=5-2', 1000), None)
+        self.assertEqual(byte_range('bytes=0-1,5-6', 1000), None)
+        self.assertEqual(byte_range('items=0-1', 1000), None)
+        self.assertEqual(byte_range('bytes=a-', 1000), None)
+        self.assertEqual(byte_range('bytes=5', 1000), None)
+
+    def test_file_wrapper_range(self):
+        file = io.BytesIO(bytes(range(100)))
+        wrapper = FileWrapper(file, offset=10, count=5)
+        chunks = [f.result() for f in wrapper]
+        self.assertEqual(b''.join(chunks), bytes(range(10, 15)))
+
+    def test_date_header(self):
+        now = time.time()
+        with mock.patch('time.time', return_value=now):
+            header = date_header()
+            self.assertTrue(header.startswith(b'Date: '))
+            self.assertTrue(header.endswith(b' GMT\r\n'))
+            self.assertIs(date_header(), header)
+        with mock.patch('time.time', return_value=now + 1):
+            self.assertNotEqual(date_header(), header)
+
+    def test_environ_headers(self):
+        self.assertEqual(environ_key('X-Request-Id'),
+                         ('x-request-id', 'HTTP_X_REQUEST_ID'))
+        environ = wsgi.test_wsgi_environ(
+            headers=[('X-Request-Id', '5'),
+                     ('Content-Type', 'text/plain'),
+                     ('X-Forwarded-Proto', 'https')])
+        self.assertEqual(environ['HTTP_X_REQUEST_ID'], '5')
+        self.assertEqual(environ['CONTENT_TYPE'], 'text/plain')
+        self.assertFalse('HTTP_CONTENT_TYPE' in environ)
+        self.assertEqual(environ['HTTP_X_FORWARDED_PROTO'], 'https')
+        self.assertEqual(environ['wsgi.url_scheme'], 'https')
+        self.assertEqual(environ['HTTPS'], 'on')
+        self.assertTrue(environ['SERVER_NAME'])
+
+    def test_response_prefix(self):
+        prefix = response_prefix((1, 1), '200 OK', 'pulsar')
+        self.assertEqual(prefix, b'HTTP/1.1 200 OK\r\nServer: pulsar\r\n')
+        self.assertIs(response_prefix((1, 1), '200 OK', 'pulsar'), prefix)
+
+    async def stalled_sendfile(self, keep_alive):
+        # serve a large file to a client which never reads it
+        size = 8*1024*1024
+        file = tempfile.TemporaryFile()
+        self.addCleanup(file.close)
+        file.write(b'x'*size)
+        file.flush()
+        responses = []
+
+        def app(environ, start_response):
+            start_response('200 OK', [('Content-Length', str(size))])
+            return FileWrapper(file)
+
+        def consumer_factory(**kw):
+            responses.append(wsgi.HttpServerResponse(app, cfg, **kw))
+            return responses[-1]
+
+        cfg = pulsar.Config(apps=['socket'], keep_alive=keep_alive)
+        server = TcpServer(partial(Connection, consumer_factory),
+                           get_event_loop(), ('127.0.0.1', 0),
+                           name='test-sendfile')
+        await server.start_serving()
+        self.addCleanup(server.close)
+        sock = socket.socket()
+        self.addCleanup(sock.close)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.connect(server.address)
+        sock.sendall(b'GET / HTTP/1.1\r\nHost: test\r\n\r\n')
+        while not responses or not responses[0].headers_sent:
+            await sleep(0.01)
+        return file, responses[0]
+
+    async def wait_closed(self, file, timeout):
+        loop = get_event_loop()
+        start = loop.time()
+        while not file.closed and loop.time() - start < timeout:
+            await sleep(0.05)
+        self.assertTrue(file.closed)
+
+    @unittest.skipUnless(HAS_SENDFILE, 'Requires sendfile')
+    async def test_sendfile_stalled_client(self):
+        file, response = await self.stalled_sendfile(1)
+        await sleep(0.2)
+        self.assertFalse(file.closed)
+        await self.wait_closed(file, 5)
+        self.assertTrue(response.connection.closed)
+
+    @unittest.skipUnless(HAS_SENDFILE, 'Requires sendfile')
+    async def test_sendfile_connection_lost(self):
+        file, response = await self.stalled_sendfile(60)
+        await sleep(0.2)
+        self.assertFalse(file.closed)
+        response.connection.close()
+        await self.wait_closed(file, 1)
+
+    async def test_server_headers(self):
+        http = HttpTestClient(self, wsgi.WsgiHandler())
+        response = await http.get('http://bla.com/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.headers['server'], pulsar.SERVER_SOFTWARE)
+        self.assertTrue(response.headers['date'])
+        http = HttpTestClient(self, server_header_app)
+        response = await http.get('http://bla.com/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['server'],
+                         '%s, custom' % pulsar.SERVER_SOFTWARE)
+        self.assertTrue(response.headers['date'])